@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+版本查询端到端基准（不需要网络）
+
+在本机启动一个模拟仓库的 HTTP 服务，提供：
+  - Maven Central 搜索接口 /solrsearch/select（core=gav，start/rows 分页）
+  - Nexus 搜索接口 /nexus/service/local/lucene/search（from/count 分页）
+  - 按仓库布局的 /maven2/<groupId>/<artifactId>/maven-metadata.xml（支持 ETag 条件请求）
+
+可配置响应延迟、5xx 失败率、429 比例、组件数和每个组件的版本数（决定响应大小），
+然后让 JDevelopsVersionChecker 只访问这个服务，测量以下场景：
+  - artifact-cold:      单个组件，空缓存
+  - artifact-warm:      单个组件，命中未过期的缓存（不联网）
+  - artifact-revalidate: 单个组件，缓存过期后的条件请求（304）
+  - batch:              批量查询多个组件（并发）
+  - group:              列出 groupId 下的全部组件（Maven Central 搜索接口，分页）
+  - group-nexus:        同上，使用 Nexus 搜索接口
+
+每个场景报告单次查询耗时的 p50/p95/p99（毫秒）、每秒查询数和服务端每秒请求数。
+计时期间查询器的日志输出被丢弃（-v 时保留），报告不会被日志淹没。
+
+--save-baseline 把结果保存为基线，之后用 --baseline 比较：任一场景的 p50/p95 比基线慢超过 --max-regression
+（且绝对差值超过 --slack 毫秒），或失败次数多于基线时，以退出码 1 结束，可直接用于 CI。
+
+用法:
+    python3 bench_queries.py
+    python3 bench_queries.py -n 50 --latency 20 --failure-rate 0.05 --throttle-rate 0.05
+    python3 bench_queries.py --scenario group --artifacts 500 --versions 40 --json
+    python3 bench_queries.py --save-baseline bench-baseline.json
+    python3 bench_queries.py --baseline bench-baseline.json --max-regression 0.2
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GROUP_ID = 'cn.tannn.jdevelops'
+
+
+class FakeRepository:
+    """
+    模拟 Maven Central/Nexus 的本地 HTTP 服务
+
+    服务运行在子进程中，不与被测的查询器争用 GIL；请求计数通过共享内存回传。
+    """
+
+    def __init__(self, artifacts: int = 100, versions: int = 20, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: int = 0, seed: int = 0):
+        """
+        Args:
+            artifacts: groupId 下的组件数
+            versions: 每个组件的版本数
+            latency: 每个响应的固定延迟（秒）
+            jitter: 在延迟上追加的随机延迟上限（秒）
+            failure_rate: 返回 503 的比例
+            throttle_rate: 返回 429 的比例
+            retry_after: 429 响应的 Retry-After（秒）
+            seed: 随机数种子，使失败分布可复现
+        """
+        self.artifact_ids = [f"jdevelops-bench-{index:04d}" for index in range(artifacts)]
+        self.versions = [f"1.{minor}.{patch}" for minor in range(versions // 10 + 1) for patch in range(10)][:versions]
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.base_url = None
+        self._requests = multiprocessing.Value('L', 0)
+        self._process = None
+
+    @property
+    def requests(self) -> int:
+        """上次 reset_counters() 以来收到的请求数"""
+        return self._requests.value
+
+    def repos(self) -> List[Dict]:
+        """指向本服务的仓库配置（格式同 JDevelopsVersionChecker.MAVEN_REPOS）"""
+        return [
+            {'name': 'Fake Metadata', 'base_url': f"{self.base_url}/maven2", 'type': 'maven_metadata'},
+            {'name': 'Fake Central', 'search_api': f"{self.base_url}/solrsearch/select", 'type': 'maven_central'},
+            {'name': 'Fake Nexus', 'search_api': f"{self.base_url}/nexus/service/local/lucene/search",
+             'type': 'nexus'},
+        ]
+
+    def start(self) -> 'FakeRepository':
+        """启动服务子进程，等待其开始监听"""
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=self._serve, args=(child,), name='fake-repository',
+                                                daemon=True)
+        self._process.start()
+        port = parent.recv()
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+
+    def reset_counters(self):
+        with self._requests.get_lock():
+            self._requests.value = 0
+
+    def _serve(self, conn):
+        """子进程入口"""
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._metadata = {}
+        repository = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 响应头和响应体一次写出，避免 Nagle 算法与延迟确认叠加产生约 40ms 的停顿
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, body, headers = repository.handle(self.path, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        conn.send(server.server_address[1])
+        conn.close()
+        server.serve_forever()
+
+    def handle(self, path: str, headers) -> Tuple[int, bytes, Dict[str, str]]:
+        """处理一个请求，返回 (状态码, 响应体, 响应头)"""
+        with self._requests.get_lock():
+            self._requests.value += 1
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if roll < self.throttle_rate:
+            result = (429, b'', {'Retry-After': str(self.retry_after)})
+        elif roll < self.throttle_rate + self.failure_rate:
+            result = (503, b'', {})
+        else:
+            url = urlsplit(path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if url.path == '/solrsearch/select':
+                result = self._solr(query)
+            elif url.path == '/nexus/service/local/lucene/search':
+                result = self._nexus(query)
+            elif url.path.startswith('/maven2/') and url.path.endswith('/maven-metadata.xml'):
+                result = self._maven_metadata(url.path, headers.get('If-None-Match'))
+            else:
+                result = (404, b'', {})
+        return result
+
+    def _matching(self, group_id: Optional[str], artifact_id: Optional[str]) -> List[str]:
+        if group_id != GROUP_ID:
+            return []
+        if artifact_id is not None:
+            return [artifact_id] if artifact_id in self.artifact_ids else []
+        return self.artifact_ids
+
+    def _solr(self, query: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        terms = dict(term.split(':', 1) for term in query.get('q', '').split(' AND ') if ':' in term)
+        # core=gav 每个版本一条记录，按发布时间倒序
+        docs = [
+            {'id': f"{GROUP_ID}:{artifact_id}:{version}", 'g': GROUP_ID, 'a': artifact_id, 'v': version,
+             'p': 'jar', 'timestamp': 1700000000000 + index * 86400000}
+            for artifact_id in self._matching(terms.get('g'), terms.get('a'))
+            for index, version in reversed(list(enumerate(self.versions)))
+        ]
+        start, rows = int(query.get('start', 0)), int(query.get('rows', 10))
+        body = {'responseHeader': {'status': 0},
+                'response': {'numFound': len(docs), 'start': start, 'docs': docs[start:start + rows]}}
+        return 200, json.dumps(body).encode('utf-8'), {'Content-Type': 'application/json'}
+
+    def _nexus(self, query: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        # 每个版本一条记录
+        items = [
+            {'groupId': GROUP_ID, 'artifactId': artifact_id, 'version': version, 'latestRelease': self.versions[-1],
+             'artifactHits': [{'repositoryId': 'releases',
+                               'artifactLinks': [{'extension': 'pom'}, {'extension': 'jar'}]}]}
+            for artifact_id in self._matching(query.get('g'), query.get('a'))
+            for version in self.versions
+        ]
+        start, count = int(query.get('from', 0)), int(query.get('count', 200))
+        body = {'totalCount': len(items), 'from': start, 'count': count,
+                'tooManyResults': False, 'data': items[start:start + count]}
+        return 200, json.dumps(body).encode('utf-8'), {'Content-Type': 'application/json'}
+
+    def _maven_metadata(self, path: str, if_none_match: Optional[str]) -> Tuple[int, bytes, Dict[str, str]]:
+        parts = path[len('/maven2/'):].split('/')
+        group_id, artifact_id = '.'.join(parts[:-2]), parts[-2]
+        if not self._matching(group_id, artifact_id):
+            return 404, b'', {}
+
+        body = self._metadata.get(artifact_id)
+        if body is None:
+            versions = ''.join(f"<version>{version}</version>" for version in self.versions)
+            body = (
+                f'<?xml version="1.0" encoding="UTF-8"?><metadata><groupId>{group_id}</groupId>'
+                f'<artifactId>{artifact_id}</artifactId><versioning><latest>{self.versions[-1]}</latest>'
+                f'<release>{self.versions[-1]}</release><versions>{versions}</versions>'
+                f'<lastUpdated>20240102030405</lastUpdated></versioning></metadata>'
+            ).encode('utf-8')
+            self._metadata[artifact_id] = body
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if if_none_match == etag:
+            return 304, b'', {'ETag': etag}
+        return 200, body, {'ETag': etag, 'Content-Type': 'text/xml'}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """最近秩百分位数"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class Benchmark:
+    """在模拟仓库上驱动 JDevelopsVersionChecker 的各个查询场景"""
+
+    def __init__(self, repository: FakeRepository, workdir: str, batch_size: int, workers: int,
+                 verbose: bool = False):
+        sys.path.insert(0, SCRIPT_DIR)
+        import version_checker
+        # 查询器在第一次联网时才导入 requests，提前导入使 cold 场景只反映空缓存，不含模块加载
+        import requests  # noqa: F401
+
+        self.vc = version_checker
+        self.repository = repository
+        self.workdir = workdir
+        self.batch_size = batch_size
+        self.workers = workers
+        self.verbose = verbose
+        self._caches = 0
+
+    def checker(self, repo_types: Tuple[str, ...] = ('maven_metadata', 'maven_central', 'nexus'),
+                cache: bool = True, refresh: bool = False):
+        """创建只访问模拟仓库的查询器（固定顺序、不探测延迟、每次使用新的缓存文件）"""
+        self._caches += 1
+        checker = self.vc.JDevelopsVersionChecker(
+            cache=self.vc.ResponseCache(os.path.join(self.workdir, f"cache-{self._caches}.json"))
+            if cache else None,
+            refresh=refresh,
+            # 失败后只做短暂退避，使失败率对耗时的影响主要来自重试次数
+            retry_policy=self.vc.RetryPolicy(base_delay=0.01, max_delay=0.1, deadline=None),
+            source='remote',
+        )
+        checker.MAVEN_REPOS = [repo for repo in self.repository.repos() if repo['type'] in repo_types]
+        return checker
+
+    def scenarios(self) -> Dict[str, Callable[[int], Tuple[Callable[[], object], Callable[[], None]]]]:
+        """
+        场景名 -> 准备函数
+
+        准备函数接收迭代序号，返回 (被计时的查询, 清理函数)；准备工作（创建查询器、预热缓存）不计入耗时。
+        """
+        artifact_ids = self.repository.artifact_ids
+
+        def artifact_cold(i: int):
+            checker = self.checker()
+            return lambda: checker.search_artifact(artifact_ids[i % len(artifact_ids)], GROUP_ID), checker.flush
+
+        warm = {}
+
+        def artifact_warm(i: int):
+            if 'checker' not in warm:
+                warm['checker'] = self.checker()
+            checker = warm['checker']
+            artifact_id = artifact_ids[i % len(artifact_ids)]
+            checker.search_artifact(artifact_id, GROUP_ID)
+            return lambda: checker.search_artifact(artifact_id, GROUP_ID), lambda: None
+
+        revalidating = {}
+
+        def artifact_revalidate(i: int):
+            if 'checker' not in revalidating:
+                revalidating['checker'] = self.checker(refresh=True)
+            checker = revalidating['checker']
+            artifact_id = artifact_ids[i % len(artifact_ids)]
+            checker.search_artifact(artifact_id, GROUP_ID)
+            return lambda: checker.search_artifact(artifact_id, GROUP_ID), lambda: None
+
+        def batch(i: int):
+            checker = self.checker()
+            start = (i * self.batch_size) % len(artifact_ids)
+            chosen = (artifact_ids[start:] + artifact_ids[:start])[:self.batch_size]
+            return lambda: checker.search_artifacts(chosen, GROUP_ID, workers=self.workers), checker.flush
+
+        def group(i: int):
+            checker = self.checker(repo_types=('maven_central',))
+            return lambda: checker.search_group(GROUP_ID), checker.flush
+
+        def group_nexus(i: int):
+            checker = self.checker(repo_types=('nexus',))
+            return lambda: checker.search_group(GROUP_ID), checker.flush
+
+        return {
+            'artifact-cold': artifact_cold,
+            'artifact-warm': artifact_warm,
+            'artifact-revalidate': artifact_revalidate,
+            'batch': batch,
+            'group': group,
+            'group-nexus': group_nexus,
+        }
+
+    def run(self, name: str, prepare, runs: int) -> Dict:
+        """执行一个场景 runs 次，返回统计结果"""
+        # 查询器总会输出每次查询成功的来源，非 -v 时丢弃这些日志，只保留报告
+        with contextlib.ExitStack() as stack:
+            if not self.verbose:
+                stack.enter_context(contextlib.redirect_stderr(stack.enter_context(open(os.devnull, 'w'))))
+            return self._run(name, prepare, runs)
+
+    def _run(self, name: str, prepare, runs: int) -> Dict:
+        samples = []
+        failures = 0
+        requests = 0
+        busy = 0.0
+        for i in range(runs):
+            query, cleanup = prepare(i)
+            self.repository.reset_counters()
+            started = time.perf_counter()
+            try:
+                result = query()
+            except Exception:
+                result = None
+            elapsed = time.perf_counter() - started
+            requests += self.repository.requests
+            cleanup()
+            samples.append(elapsed * 1000)
+            busy += elapsed
+            # 批量查询返回 (找到的, 未找到的, 超时的)
+            if not result or (isinstance(result, tuple) and (result[1] or result[2])):
+                failures += 1
+        return {
+            'scenario': name,
+            'runs': runs,
+            'p50_ms': round(percentile(samples, 0.50), 3),
+            'p95_ms': round(percentile(samples, 0.95), 3),
+            'p99_ms': round(percentile(samples, 0.99), 3),
+            'queries_per_sec': round(runs / busy, 1) if busy else None,
+            'requests_per_sec': round(requests / busy, 1) if busy else None,
+            'requests': requests,
+            'failures': failures,
+        }
+
+
+# 基线中记录的参数，参数不同时比较结果没有意义
+BASELINE_CONFIG = ('runs', 'artifacts', 'versions', 'latency', 'jitter', 'failure_rate', 'throttle_rate',
+                   'retry_after', 'batch_size', 'workers', 'seed')
+
+
+def compare_to_baseline(results: List[Dict], baseline: Dict, max_regression: float, slack: float) -> List[str]:
+    """
+    与基线比较，返回退化项的说明
+
+    p50/p95 超过基线的 (1 + max_regression) 倍且绝对差值超过 slack 毫秒，或失败次数多于基线时视为退化；
+    基线中没有的场景不比较。
+    """
+    previous = {result['scenario']: result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get(result['scenario'])
+        if base is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if result[metric] > base[metric] * (1 + max_regression) and result[metric] - base[metric] > slack:
+                regressions.append(f"{result['scenario']} {metric[:3]}: {base[metric]:.1f} → {result[metric]:.1f} ms "
+                                   f"(+{(result[metric] / base[metric] - 1) * 100:.0f}%)")
+        if result['failures'] > base['failures']:
+            regressions.append(f"{result['scenario']} 失败次数: {base['failures']} → {result['failures']}")
+    return regressions
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='版本查询端到端基准（本地模拟仓库，不需要网络）')
+    parser.add_argument('-n', '--runs', type=int, default=30, help='每个场景的运行次数 (默认: 30)')
+    parser.add_argument('--scenario', action='append', help='只运行指定场景（可重复），默认运行全部')
+    parser.add_argument('--artifacts', type=int, default=200, help='groupId 下的组件数 (默认: 200)')
+    parser.add_argument('--versions', type=int, default=20, help='每个组件的版本数，决定响应大小 (默认: 20)')
+    parser.add_argument('--latency', type=float, default=5, help='每个响应的延迟（毫秒，默认: 5）')
+    parser.add_argument('--jitter', type=float, default=0, help='追加的随机延迟上限（毫秒，默认: 0）')
+    parser.add_argument('--failure-rate', type=float, default=0, help='返回 503 的比例 (默认: 0)')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='返回 429 的比例 (默认: 0)')
+    parser.add_argument('--retry-after', type=int, default=0, help='429 响应的 Retry-After 秒数 (默认: 0)')
+    parser.add_argument('--batch-size', type=int, default=50, help='batch 场景每次查询的组件数 (默认: 50)')
+    parser.add_argument('--workers', type=int, default=8, help='batch 场景的并发线程数 (默认: 8)')
+    parser.add_argument('--seed', type=int, default=0, help='失败分布的随机数种子 (默认: 0)')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果（便于 CI 比较）')
+    parser.add_argument('--save-baseline', metavar='PATH', help='把本次结果保存为基线文件')
+    parser.add_argument('--baseline', metavar='PATH', help='与基线文件比较，出现退化时以退出码 1 结束')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='p50/p95 相对基线允许变慢的比例 (默认: 0.25)')
+    parser.add_argument('--slack', type=float, default=2,
+                        help='低于该绝对差值（毫秒）的变慢不算退化，避免亚毫秒场景的噪声 (默认: 2)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='保留查询器的日志输出')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"无法读取基线文件 {args.baseline}: {e}")
+        changed = [name for name in BASELINE_CONFIG if baseline.get('config', {}).get(name) != getattr(args, name)]
+        if changed:
+            print(f"⚠️  参数与基线不同，比较结果仅供参考: {', '.join(changed)}", file=sys.stderr)
+
+    # 只访问本机的模拟仓库：不读取用户的缓存、状态和代理配置
+    for name in ('HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy'):
+        os.environ.pop(name, None)
+
+    repository = FakeRepository(
+        artifacts=args.artifacts, versions=args.versions, latency=args.latency / 1000, jitter=args.jitter / 1000,
+        failure_rate=args.failure_rate, throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+        seed=args.seed
+    ).start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.environ['XDG_CACHE_HOME'] = os.path.join(workdir, 'cache')
+            os.environ['XDG_STATE_HOME'] = os.path.join(workdir, 'state')
+            benchmark = Benchmark(repository, workdir, args.batch_size, args.workers, verbose=args.verbose)
+            scenarios = benchmark.scenarios()
+            unknown = set(args.scenario or []) - set(scenarios)
+            if unknown:
+                parser.error(f"未知场景: {', '.join(sorted(unknown))}（可选: {', '.join(scenarios)}）")
+
+            results = []
+            if not args.json:
+                print(f"{'场景':<20} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'查询/秒':>9} {'请求/秒':>9} {'失败':>5}")
+                print("-" * 78)
+            for name, prepare in scenarios.items():
+                if args.scenario and name not in args.scenario:
+                    continue
+                result = benchmark.run(name, prepare, args.runs)
+                results.append(result)
+                if not args.json:
+                    print(f"{name:<20} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+                          f"{result['queries_per_sec'] or 0:>9.1f} {result['requests_per_sec'] or 0:>9.1f} "
+                          f"{result['failures']:>5}")
+    finally:
+        repository.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'config': {name: getattr(args, name) for name in BASELINE_CONFIG}, 'results': results},
+                      f, indent=2, ensure_ascii=False)
+        print(f"💾 基线已保存到 {args.save_baseline}", file=sys.stderr)
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.max_regression, args.slack)
+        for regression in regressions:
+            print(f"❌ 性能退化: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✅ 与基线 {args.baseline} 相比没有退化", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+query_versions.py 启动耗时基准
+
+分别测量以下场景的进程总耗时（中位数），并用 python -X importtime 检查是否导入了网络模块：
+  - bare:       空解释器（python -c pass），作为基线
+  - help:       --help
+  - bad-args:   参数错误
+  - local:      只查本地 ~/.m2 仓库（--source local）
+  - cache-hit:  命中本地响应缓存
+
+除 bare 外，以上场景都不应导入 requests/urllib3。不需要网络。
+
+用法:
+    python3 bench_startup.py
+    python3 bench_startup.py -n 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERY_SCRIPT = os.path.join(SCRIPT_DIR, 'query_versions.py')
+
+# 这些模块出现在导入列表中说明快速路径失效
+NETWORK_MODULES = ('requests', 'urllib3')
+
+GROUP_ID = 'cn.tannn.jdevelops'
+ARTIFACT_ID = 'jdevelops-apis-result'
+
+
+def prepare_fixtures(workdir: str):
+    """构造一个本地 Maven 仓库和一份已预热的响应缓存"""
+    sys.path.insert(0, SCRIPT_DIR)
+    import version_checker
+
+    # 本地仓库：一个组件、两个版本
+    artifact_dir = os.path.join(workdir, 'm2', *GROUP_ID.split('.'), ARTIFACT_ID)
+    for version in ('1.0.0', '1.0.1'):
+        version_dir = os.path.join(artifact_dir, version)
+        os.makedirs(version_dir)
+        open(os.path.join(version_dir, f"{ARTIFACT_ID}-{version}.pom"), 'w').close()
+
+    # 响应缓存：为第一个 maven-metadata 仓库写入未过期的条目
+    repo = next(r for r in version_checker.JDevelopsVersionChecker.MAVEN_REPOS if r['type'] == 'maven_metadata')
+    url = f"{repo['base_url'].rstrip('/')}/{GROUP_ID.replace('.', '/')}/{ARTIFACT_ID}/maven-metadata.xml"
+    cache = version_checker.ResponseCache(
+        path=os.path.join(workdir, 'cache', 'jdevelops-skill', 'query_versions.json')
+    )
+    cache.put(version_checker.ResponseCache.make_key(url, {}), {
+        'groupId': GROUP_ID,
+        'artifactId': ARTIFACT_ID,
+        'latest': '1.0.1',
+        'release': '1.0.1',
+        'versions': ['1.0.0', '1.0.1'],
+        'timestamp': int(time.time() * 1000)
+    })
+    cache.flush()
+
+
+def scenarios(workdir: str):
+    """(名称, 命令行参数, 是否检查网络模块)"""
+    common = [QUERY_SCRIPT, '--no-daemon']
+    return [
+        ('bare', ['-c', 'pass'], False),
+        ('help', common + ['--help'], True),
+        ('bad-args', common + ['--format', 'nope'], True),
+        ('local', common + ['--source', 'local', '--local-repo', os.path.join(workdir, 'm2'),
+                            '-a', ARTIFACT_ID], True),
+        ('cache-hit', common + ['--source', 'remote', '--static-order', '-a', ARTIFACT_ID], True),
+    ]
+
+
+def measure(argv, env, runs: int) -> float:
+    """多次运行取中位数（毫秒）"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + argv, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def imported_modules(argv, env):
+    """用 -X importtime 获取导入的顶层模块"""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return modules
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='query_versions.py 启动耗时基准')
+    parser.add_argument('-n', '--runs', type=int, default=10, help='每个场景的运行次数 (默认: 10)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ)
+        env['XDG_CACHE_HOME'] = os.path.join(workdir, 'cache')
+        env['XDG_STATE_HOME'] = os.path.join(workdir, 'state')
+        env['XDG_RUNTIME_DIR'] = os.path.join(workdir, 'run')
+        prepare_fixtures(workdir)
+
+        print(f"{'场景':<12} {'耗时(ms)':>10} {'比基线多(ms)':>14}  网络模块")
+        print("-" * 56)
+        baseline = None
+        failed = False
+        for name, argv, check in scenarios(workdir):
+            elapsed = measure(argv, env, args.runs)
+            if baseline is None:
+                baseline = elapsed
+            loaded = sorted(imported_modules(argv, env) & set(NETWORK_MODULES)) if check else []
+            failed = failed or bool(loaded)
+            print(f"{name:<12} {elapsed:>10.1f} {elapsed - baseline:>14.1f}  {', '.join(loaded) or '-'}")
+
+    if failed:
+        print("\n❌ 快速路径导入了网络模块", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+传递依赖图解析
+
+从一组组件出发，按层广度优先读取 POM：每一层需要的 POM 以及它们的父 POM、导入的 BOM
+都并发获取，获取后的 POM 按 GAV（groupId:artifactId:version）只解析一次。
+版本冲突按 Maven 的最近优先规则处理：先遇到的版本被选中并继续展开，其余版本记为冲突。
+
+由 JDevelopsVersionChecker.resolve_graph 调用，输出可渲染为 JSON、DOT 或树形文本。
+"""
+
+import re
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+GAV = Tuple[str, str, str]
+
+# 不会传递给使用方的依赖范围
+NON_TRANSITIVE_SCOPES = frozenset(('test', 'provided', 'system', 'import'))
+
+_PLACEHOLDER = re.compile(r'\$\{([^}]+)\}')
+
+# 属性引用的最大嵌套层数，防止循环引用
+MAX_PROPERTY_DEPTH = 10
+
+
+def gav_id(gav: GAV) -> str:
+    """GAV 的文本形式 groupId:artifactId:version"""
+    return ':'.join(gav)
+
+
+def _local_name(tag: str) -> str:
+    """去掉 XML 命名空间前缀"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child(element, name: str):
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child
+    return None
+
+
+def _text(element, name: str) -> Optional[str]:
+    child = _child(element, name)
+    if child is None or child.text is None:
+        return None
+    return child.text.strip() or None
+
+
+def _parse_dependencies(element) -> List[Dict]:
+    dependencies = []
+    if element is None:
+        return dependencies
+    for dependency in element:
+        if _local_name(dependency.tag) != 'dependency':
+            continue
+        exclusions = _child(dependency, 'exclusions')
+        dependencies.append({
+            'groupId': _text(dependency, 'groupId'),
+            'artifactId': _text(dependency, 'artifactId'),
+            'version': _text(dependency, 'version'),
+            'scope': _text(dependency, 'scope'),
+            'type': _text(dependency, 'type') or 'jar',
+            'optional': (_text(dependency, 'optional') or '').lower() == 'true',
+            'exclusions': [
+                (_text(exclusion, 'groupId'), _text(exclusion, 'artifactId'))
+                for exclusion in (exclusions if exclusions is not None else [])
+                if _local_name(exclusion.tag) == 'exclusion'
+            ],
+        })
+    return dependencies
+
+
+def parse_pom(content: bytes) -> Dict:
+    """
+    解析 POM 文件中与依赖解析有关的部分
+
+    Returns:
+        {'parent', 'groupId', 'artifactId', 'version', 'properties', 'managed', 'dependencies'}
+    """
+    import xml.etree.ElementTree as ET
+
+    root = ET.fromstring(content)
+    parent_element = _child(root, 'parent')
+    parent = None
+    if parent_element is not None:
+        parent = (_text(parent_element, 'groupId'), _text(parent_element, 'artifactId'),
+                  _text(parent_element, 'version'))
+
+    properties_element = _child(root, 'properties')
+    properties = {}
+    if properties_element is not None:
+        properties = {_local_name(p.tag): (p.text or '').strip() for p in properties_element}
+
+    management = _child(root, 'dependencyManagement')
+    return {
+        'parent': parent,
+        'groupId': _text(root, 'groupId') or (parent[0] if parent else None),
+        'artifactId': _text(root, 'artifactId'),
+        'version': _text(root, 'version') or (parent[2] if parent else None),
+        'properties': properties,
+        'managed': _parse_dependencies(_child(management, 'dependencies') if management is not None else None),
+        'dependencies': _parse_dependencies(_child(root, 'dependencies')),
+    }
+
+
+def interpolate(value: Optional[str], properties: Dict[str, str]) -> Optional[str]:
+    """展开 ${property} 引用，无法展开的引用保持原样"""
+    if not value or '$' not in value:
+        return value
+    for _ in range(MAX_PROPERTY_DEPTH):
+        expanded = _PLACEHOLDER.sub(lambda m: properties.get(m.group(1), m.group(0)), value)
+        if expanded == value:
+            break
+        value = expanded
+    return value
+
+
+class DependencyGraphResolver:
+    """
+    传递依赖图解析器
+
+    原始 POM 和合并了父 POM、BOM 之后的有效模型都按 GAV 记忆，同一个 POM 只获取和解析一次。
+    """
+
+    def __init__(self, fetch_pom: Callable[[str, str, str], Optional[bytes]],
+                 expand_groups: Optional[List[str]] = None, max_depth: int = 0, workers: int = 8,
+                 log: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            fetch_pom: 按 (groupId, artifactId, version) 获取 POM 内容的函数，找不到时返回 None，
+                超出时间预算时抛出 TimeoutError
+            expand_groups: 只展开这些 groupId 的依赖，None 表示全部展开
+            max_depth: 最大遍历深度，0 表示不限制
+            workers: 并发获取 POM 的线程数
+            log: 日志函数
+        """
+        self.fetch_pom = fetch_pom
+        self.expand_groups = set(expand_groups) if expand_groups is not None else None
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.log = log or (lambda message: None)
+        # GAV -> 原始 POM（获取或解析失败时为 None）
+        self._raw: Dict[GAV, Optional[Dict]] = {}
+        self._errors: Dict[GAV, str] = {}
+        # 获取超时的 POM（包括父 POM 和 BOM）：依赖它们的节点可能缺少依赖
+        self._timed_out: Set[GAV] = set()
+        # GAV -> 有效模型
+        self._effective: Dict[GAV, Optional[Dict]] = {}
+        self.round_trips = 0
+
+    def _fetch_many(self, gavs: Set[GAV]):
+        """并发获取一批 POM"""
+        gavs = [gav for gav in gavs if gav not in self._raw]
+        if not gavs:
+            return
+        self.round_trips += 1
+        self.log(f"📥 第 {self.round_trips} 轮：并发获取 {len(gavs)} 个 POM")
+
+        def load(gav: GAV):
+            try:
+                content = self.fetch_pom(*gav)
+                if content is None:
+                    return None, '未找到 POM', False
+                return parse_pom(content), None, False
+            except TimeoutError as e:
+                return None, f"获取 POM 超时: {e}", True
+            except Exception as e:
+                return None, str(e), False
+
+        if len(gavs) == 1:
+            results = [load(gavs[0])]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(gavs)), thread_name_prefix='pom') as executor:
+                results = list(executor.map(load, gavs))
+
+        for gav, (raw, error, timed_out) in zip(gavs, results):
+            self._raw[gav] = raw
+            if timed_out:
+                self._timed_out.add(gav)
+            if error:
+                self._errors[gav] = error
+                self.log(f"⚠️  {gav_id(gav)}: {error}")
+
+    def _requirements(self, gav: GAV, visiting: FrozenSet[GAV] = frozenset()) -> Set[GAV]:
+        """计算 gav 的有效模型还缺少哪些 POM（先是父 POM 链，父 POM 齐全后才能确定要导入的 BOM）"""
+        if gav in self._effective:
+            return set()
+        if gav not in self._raw:
+            return {gav}
+        raw = self._raw[gav]
+        if raw is None or gav in visiting:
+            return set()
+        visiting = visiting | {gav}
+        if raw['parent'] and all(raw['parent']):
+            missing = self._requirements(raw['parent'], visiting)
+            if missing:
+                return missing
+        properties = self._properties(gav, visiting)
+        missing = set()
+        for bom in self._imports(raw, properties):
+            missing |= self._requirements(bom, visiting)
+        return missing
+
+    def _properties(self, gav: GAV, visiting: FrozenSet[GAV] = frozenset()) -> Dict[str, str]:
+        """父 POM 链上合并后的属性（子 POM 覆盖父 POM）以及 project.* 内置属性"""
+        raw = self._raw.get(gav)
+        if raw is None:
+            return {}
+        properties = {}
+        parent = raw['parent']
+        if parent and all(parent) and parent not in visiting:
+            properties.update(self._properties(parent, visiting | {gav}))
+        properties.update(raw['properties'])
+        builtins = {
+            'project.groupId': raw['groupId'], 'pom.groupId': raw['groupId'],
+            'project.artifactId': raw['artifactId'], 'pom.artifactId': raw['artifactId'],
+            'project.version': raw['version'], 'pom.version': raw['version'], 'version': raw['version'],
+        }
+        if parent:
+            builtins.update({'project.parent.groupId': parent[0], 'project.parent.version': parent[2],
+                             'parent.version': parent[2]})
+        properties.update({k: v for k, v in builtins.items() if v})
+        return properties
+
+    @staticmethod
+    def _imports(raw: Dict, properties: Dict[str, str]) -> List[GAV]:
+        """dependencyManagement 中以 import 范围导入的 BOM"""
+        imports = []
+        for dependency in raw['managed']:
+            if dependency['scope'] == 'import' and dependency['type'] == 'pom':
+                bom = tuple(interpolate(dependency[k], properties) for k in ('groupId', 'artifactId', 'version'))
+                if all(bom) and not any('$' in part for part in bom):
+                    imports.append(bom)
+        return imports
+
+    def _load(self, gavs: List[GAV]):
+        """获取 gavs 的有效模型所需的全部 POM，每一轮并发获取当前已知缺少的部分"""
+        pending = set(gavs)
+        while pending:
+            self._fetch_many(pending)
+            pending = set()
+            for gav in gavs:
+                pending |= self._requirements(gav)
+
+    def effective_model(self, gav: GAV, visiting: FrozenSet[GAV] = frozenset()) -> Optional[Dict]:
+        """
+        合并父 POM 和导入的 BOM 后的有效模型（需要的 POM 应已通过 _load 获取）
+
+        Returns:
+            {'managed': {(groupId, artifactId): 依赖}, 'dependencies': [已补全版本的依赖]}
+        """
+        if gav in self._effective:
+            return self._effective[gav]
+        raw = self._raw.get(gav)
+        if raw is None or gav in visiting:
+            return None
+        visiting = visiting | {gav}
+
+        properties = self._properties(gav)
+        managed: Dict[Tuple[str, str], Dict] = {}
+        dependencies: Dict[Tuple[str, str], Dict] = {}
+        parent = raw['parent']
+        if parent and all(parent):
+            parent_model = self.effective_model(parent, visiting)
+            if parent_model:
+                managed.update(parent_model['managed'])
+                dependencies.update({(d['groupId'], d['artifactId']): d for d in parent_model['dependencies']})
+
+        def resolved(dependency: Dict) -> Dict:
+            dependency = dict(dependency)
+            for key in ('groupId', 'artifactId', 'version', 'scope'):
+                dependency[key] = interpolate(dependency[key], properties)
+            return dependency
+
+        own_managed = {}
+        for dependency in raw['managed']:
+            dependency = resolved(dependency)
+            if dependency['scope'] != 'import':
+                own_managed[(dependency['groupId'], dependency['artifactId'])] = dependency
+        # 导入的 BOM 优先级低于本 POM 直接声明的条目，多个 BOM 之间先声明者优先
+        for bom in self._imports(raw, properties):
+            bom_model = self.effective_model(bom, visiting)
+            if bom_model:
+                for key, dependency in bom_model['managed'].items():
+                    own_managed.setdefault(key, dependency)
+        managed.update(own_managed)
+
+        for dependency in raw['dependencies']:
+            dependency = resolved(dependency)
+            key = (dependency['groupId'], dependency['artifactId'])
+            management = managed.get(key)
+            if management:
+                if not dependency['version']:
+                    dependency['version'] = management['version']
+                if not dependency['scope']:
+                    dependency['scope'] = management['scope']
+            dependency['scope'] = dependency['scope'] or 'compile'
+            dependencies[key] = dependency
+
+        model = {'managed': managed, 'dependencies': list(dependencies.values())}
+        self._effective[gav] = model
+        return model
+
+    def _should_expand(self, gav: GAV, depth: int) -> bool:
+        if self.max_depth and depth >= self.max_depth:
+            return False
+        return depth == 0 or self.expand_groups is None or gav[0] in self.expand_groups
+
+    def resolve(self, coordinates: List[GAV]) -> Dict:
+        """
+        从 coordinates 出发解析依赖图
+
+        Returns:
+            {
+              'roots': ['g:a:v', ...],
+              'nodes': [{'id', 'groupId', 'artifactId', 'version', 'depth', 'scope', 'expanded', 'error'?,
+                         'timedOut'?}]，timedOut 表示获取 POM 超时（而不是 POM 不存在）,
+              'edges': [{'from', 'to', 'scope', 'requested'?}]，requested 为被冲突规则替换掉的版本,
+              'conflicts': [{'groupId', 'artifactId', 'selected', 'requested': {版本: [依赖方, ...]}}],
+              'roundTrips': 获取 POM 的并发轮数,
+              'timedOut': ['g:a:v', ...] 获取超时的 POM（包括父 POM 和 BOM），不为空时依赖图不完整
+            }
+        """
+        coordinates = list(dict.fromkeys(coordinates))
+        selected: Dict[Tuple[str, str], str] = {}
+        nodes: Dict[GAV, Dict] = {}
+        edges: List[Dict] = []
+        requested: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+
+        frontier: List[Tuple[GAV, FrozenSet[Tuple[str, str]], int]] = []
+        for gav in coordinates:
+            if gav[:2] in selected:
+                continue
+            selected[gav[:2]] = gav[2]
+            nodes[gav] = {'id': gav_id(gav), 'groupId': gav[0], 'artifactId': gav[1], 'version': gav[2],
+                          'depth': 0, 'scope': 'compile', 'expanded': False}
+            requested.setdefault(gav[:2], {}).setdefault(gav[2], []).append('')
+            frontier.append((gav, frozenset(), 0))
+
+        while frontier:
+            expanding = [item for item in frontier if self._should_expand(item[0], item[2])]
+            self._load([gav for gav, _, _ in expanding])
+
+            next_frontier = []
+            for gav, exclusions, depth in expanding:
+                node = nodes[gav]
+                model = self.effective_model(gav)
+                if model is None:
+                    node['error'] = self._errors.get(gav, '无法解析 POM')
+                    if gav in self._timed_out:
+                        node['timedOut'] = True
+                    continue
+                node['expanded'] = True
+                for dependency in model['dependencies']:
+                    if dependency['optional'] or dependency['scope'] in NON_TRANSITIVE_SCOPES:
+                        continue
+                    ga = (dependency['groupId'], dependency['artifactId'])
+                    if ga in exclusions or (ga[0], '*') in exclusions or ('*', '*') in exclusions:
+                        continue
+                    version = dependency['version']
+                    if not version or '$' in version:
+                        self.log(f"⚠️  {gav_id(gav)} 的依赖 {':'.join(ga)} 版本无法确定: {version}")
+                        continue
+                    requested.setdefault(ga, {}).setdefault(version, []).append(node['id'])
+                    # 运行时依赖的传递依赖也是运行时范围
+                    scope = 'runtime' if 'runtime' in (node['scope'], dependency['scope']) else 'compile'
+
+                    if ga in selected:
+                        target = ga + (selected[ga],)
+                        edge = {'from': node['id'], 'to': gav_id(target), 'scope': scope}
+                        if selected[ga] != version:
+                            edge['requested'] = version
+                        edges.append(edge)
+                        if scope == 'compile' and nodes[target]['scope'] == 'runtime':
+                            nodes[target]['scope'] = 'compile'
+                        continue
+
+                    child = ga + (version,)
+                    selected[ga] = version
+                    nodes[child] = {'id': gav_id(child), 'groupId': ga[0], 'artifactId': ga[1], 'version': version,
+                                    'depth': depth + 1, 'scope': scope, 'expanded': False}
+                    edges.append({'from': node['id'], 'to': gav_id(child), 'scope': scope})
+                    child_exclusions = exclusions | frozenset(
+                        (g or '*', a or '*') for g, a in dependency['exclusions']
+                    )
+                    next_frontier.append((child, child_exclusions, depth + 1))
+            frontier = next_frontier
+
+        conflicts = []
+        for ga, versions in requested.items():
+            if len(versions) > 1:
+                conflicts.append({
+                    'groupId': ga[0],
+                    'artifactId': ga[1],
+                    'selected': selected[ga],
+                    'requested': {v: [by for by in requesters if by] for v, requesters in versions.items()},
+                })
+
+        return {
+            'roots': [gav_id(gav) for gav in coordinates if gav in nodes],
+            'nodes': list(nodes.values()),
+            'edges': edges,
+            'conflicts': conflicts,
+            'roundTrips': self.round_trips,
+            'timedOut': sorted(gav_id(gav) for gav in self._timed_out),
+        }
+
+
+def graph_to_dot(graph: Dict) -> str:
+    """把依赖图渲染为 Graphviz DOT 文本，冲突边以红色虚线标出被替换的版本"""
+    def quote(value: str) -> str:
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+    lines = ['digraph dependencies {', '  rankdir=LR;', '  node [shape=box, fontname="monospace"];']
+    roots = set(graph['roots'])
+    for node in graph['nodes']:
+        # 标签中的 \n 是 DOT 的换行转义，不能再被 quote 转义
+        attributes = [f"label={quote(node['artifactId'])[:-1]}\\n{quote(node['version'])[1:]}"]
+        if node['id'] in roots:
+            attributes.append('style=bold')
+        if node.get('timedOut'):
+            attributes += ['color=orange', 'style=dotted']
+        elif node.get('error'):
+            attributes.append('color=red')
+        elif node['scope'] == 'runtime':
+            attributes.append('style=dashed')
+        lines.append(f"  {quote(node['id'])} [{', '.join(attributes)}];")
+    for edge in graph['edges']:
+        attributes = []
+        if edge.get('requested'):
+            attributes += ['color=red', 'style=dashed', f"label={quote(edge['requested'] + ' →')}"]
+        suffix = f" [{', '.join(attributes)}]" if attributes else ''
+        lines.append(f"  {quote(edge['from'])} -> {quote(edge['to'])}{suffix};")
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def format_tree(graph: Dict) -> str:
+    """把依赖图渲染为类似 mvn dependency:tree 的树形文本"""
+    children: Dict[str, List[Dict]] = {}
+    for edge in graph['edges']:
+        children.setdefault(edge['from'], []).append(edge)
+    nodes = {node['id']: node for node in graph['nodes']}
+
+    lines = []
+    printed = set()
+
+    def walk(node_id: str, prefix: str, edges: List[Dict]):
+        for index, edge in enumerate(edges):
+            last = index == len(edges) - 1
+            node = nodes[edge['to']]
+            label = f"{node['id']}"
+            if edge['scope'] != 'compile':
+                label += f" ({edge['scope']})"
+            if edge.get('requested'):
+                label += f"  ⚠️  冲突: 请求 {edge['requested']}，选定 {node['version']}"
+            elif edge['to'] in printed:
+                label += "  (重复，已省略)"
+            elif node.get('error'):
+                label += f"  {'⏱️ ' if node.get('timedOut') else '❌'} {node['error']}"
+            lines.append(f"{prefix}{'└── ' if last else '├── '}{label}")
+            if not edge.get('requested') and edge['to'] not in printed:
+                printed.add(edge['to'])
+                walk(edge['to'], prefix + ('    ' if last else '│   '), children.get(edge['to'], []))
+
+    for root in graph['roots']:
+        node = nodes.get(root)
+        if node is None:
+            continue
+        if node.get('error'):
+            root += f"  {'⏱️ ' if node.get('timedOut') else '❌'} {node['error']}"
+        lines.append(root)
+        printed.add(root)
+        walk(root, '', children.get(root, []))
+    return '\n'.join(lines)
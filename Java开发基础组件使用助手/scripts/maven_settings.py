@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+读取 Maven 的 settings.xml 和环境变量中的仓库与代理配置
+
+- <mirrors> 中的镜像和激活的 <profile> 中的 <repositories> 作为按仓库布局访问的仓库
+  （读取 maven-metadata.xml 和 POM），排在内置仓库之前
+- <servers> 中与仓库 id 相同的账号用于 HTTP Basic 认证（加密的密码无法使用，会被跳过）
+- <proxies> 中第一个激活的代理及其 nonProxyHosts
+- 环境变量 JDEVELOPS_MAVEN_REPOS（空格或逗号分隔的仓库地址）追加额外的仓库
+- 配置中的 ${env.NAME} 和 ${user.home} 会被展开
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 额外仓库地址的环境变量
+REPOS_ENV = 'JDEVELOPS_MAVEN_REPOS'
+
+_PLACEHOLDER = re.compile(r'\$\{(env\.)?([^}]+)\}')
+
+
+def default_settings_path() -> str:
+    """用户级 settings.xml 的路径"""
+    return os.path.join(os.path.expanduser('~'), '.m2', 'settings.xml')
+
+
+def _expand(value: Optional[str]) -> Optional[str]:
+    """展开 ${env.NAME}、${user.home}，无法展开的保持原样"""
+    if not value or '$' not in value:
+        return value
+
+    def lookup(match):
+        if match.group(1):
+            return os.environ.get(match.group(2), match.group(0))
+        if match.group(2) == 'user.home':
+            return os.path.expanduser('~')
+        return match.group(0)
+
+    return _PLACEHOLDER.sub(lookup, value)
+
+
+class MavenSettings:
+    """settings.xml 与环境变量中与仓库访问有关的配置"""
+
+    def __init__(self, repos: Optional[List[Dict]] = None, proxies: Optional[Dict[str, str]] = None,
+                 non_proxy_hosts: Optional[List[str]] = None,
+                 credentials: Optional[Dict[str, Tuple[str, str]]] = None):
+        """
+        Args:
+            repos: 仓库配置列表，格式同 JDevelopsVersionChecker.MAVEN_REPOS（type 为 maven_metadata）
+            proxies: {'http': 代理地址, 'https': 代理地址}
+            non_proxy_hosts: 不经过代理的主机（支持 * 通配符）
+            credentials: 仓库地址 -> (用户名, 密码)
+        """
+        self.repos = repos or []
+        self.proxies = proxies or {}
+        self.non_proxy_hosts = non_proxy_hosts or []
+        self.credentials = credentials or {}
+
+    def bypass_proxy(self, host: str) -> bool:
+        """主机是否在 nonProxyHosts 中"""
+        from fnmatch import fnmatch
+
+        host = host.lower()
+        return any(fnmatch(host, pattern.lower()) for pattern in self.non_proxy_hosts)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _children(element, name: str):
+    if element is None:
+        return []
+    return [child for child in element if _local_name(child.tag) == name]
+
+
+def _child(element, name: str):
+    children = _children(element, name)
+    return children[0] if children else None
+
+
+def _text(element, name: str) -> Optional[str]:
+    child = _child(element, name)
+    if child is None or child.text is None:
+        return None
+    return _expand(child.text.strip()) or None
+
+
+def _parse_settings(path: str):
+    """解析 settings.xml，返回 (仓库, 代理, nonProxyHosts, 账号)"""
+    import xml.etree.ElementTree as ET
+
+    root = ET.parse(path).getroot()
+
+    servers = {}
+    for server in _children(_child(root, 'servers'), 'server'):
+        server_id, username, password = _text(server, 'id'), _text(server, 'username'), _text(server, 'password')
+        if not server_id or not username:
+            continue
+        if password and password.startswith('{') and password.endswith('}'):
+            # 使用 settings-security.xml 加密的密码，无法解密
+            continue
+        servers[server_id] = (username, password or '')
+
+    repos = []
+
+    def add_repo(repo_id: Optional[str], url: Optional[str], origin: str):
+        if not repo_id or not url or not url.startswith(('http://', 'https://')):
+            return
+        repos.append({'name': f"{repo_id} ({origin})", 'base_url': url.rstrip('/'), 'type': 'maven_metadata',
+                      'id': repo_id})
+
+    for mirror in _children(_child(root, 'mirrors'), 'mirror'):
+        add_repo(_text(mirror, 'id'), _text(mirror, 'url'), 'settings.xml mirror')
+
+    active_profiles = {_expand((p.text or '').strip()) for p in _children(_child(root, 'activeProfiles'), 'activeProfile')}
+    for profile in _children(_child(root, 'profiles'), 'profile'):
+        activation = _child(profile, 'activation')
+        active_by_default = (_text(activation, 'activeByDefault') or '').lower() == 'true'
+        if _text(profile, 'id') not in active_profiles and not active_by_default:
+            continue
+        for repository in _children(_child(profile, 'repositories'), 'repository'):
+            add_repo(_text(repository, 'id'), _text(repository, 'url'), 'settings.xml')
+
+    proxies, non_proxy_hosts = {}, []
+    for proxy in _children(_child(root, 'proxies'), 'proxy'):
+        if (_text(proxy, 'active') or 'true').lower() != 'true' or not _text(proxy, 'host'):
+            continue
+        protocol = (_text(proxy, 'protocol') or 'http').lower()
+        auth = ''
+        if _text(proxy, 'username'):
+            from urllib.parse import quote
+
+            auth = f"{quote(_text(proxy, 'username'), safe='')}:{quote(_text(proxy, 'password') or '', safe='')}@"
+        url = f"{protocol}://{auth}{_text(proxy, 'host')}:{_text(proxy, 'port') or '8080'}"
+        # 与 Maven 一致：只使用第一个激活的代理，http 代理同时用于 https 请求
+        proxies = {'http': url, 'https': url}
+        non_proxy_hosts = [h.strip() for h in (_text(proxy, 'nonProxyHosts') or '').split('|') if h.strip()]
+        break
+
+    return repos, proxies, non_proxy_hosts, servers
+
+
+def load_settings(path: Optional[str] = None) -> MavenSettings:
+    """
+    加载 settings.xml 和环境变量中的配置
+
+    Args:
+        path: settings.xml 路径，默认为 ~/.m2/settings.xml；文件不存在时只读取环境变量
+
+    Returns:
+        MavenSettings（没有任何配置时各项为空）
+    """
+    path = path or default_settings_path()
+    repos, proxies, non_proxy_hosts, servers = [], {}, [], {}
+    if os.path.isfile(path):
+        try:
+            repos, proxies, non_proxy_hosts, servers = _parse_settings(path)
+        except Exception as e:
+            import sys
+
+            print(f"⚠️  无法解析 {path}: {e}", file=sys.stderr)
+
+    for index, url in enumerate(os.environ.get(REPOS_ENV, '').replace(',', ' ').split(), 1):
+        if url.startswith(('http://', 'https://')):
+            repos.append({'name': f"{REPOS_ENV}[{index}]", 'base_url': url.rstrip('/'), 'type': 'maven_metadata',
+                          'id': f"env-{index}"})
+
+    # 同一地址只保留第一个
+    unique = {}
+    for repo in repos:
+        unique.setdefault(repo['base_url'], repo)
+    repos = list(unique.values())
+
+    credentials = {repo['base_url']: servers[repo['id']] for repo in repos if repo['id'] in servers}
+    return MavenSettings(repos=repos, proxies=proxies, non_proxy_hosts=non_proxy_hosts, credentials=credentials)
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+项目依赖扫描
+
+遍历一个或多个目录中的 pom.xml、build.gradle(.kts)、gradle.properties 和版本目录（*.versions.toml），
+收集指定 groupId 的依赖坐标并解析 ${property} 形式的版本号。
+构建文件较多时用进程池并行解析；属性解析在主进程中完成，因为它需要跨文件查找父 POM 和上级目录。
+
+由 query_versions.py --scan 调用，每个不同的组件只向仓库查询一次。
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BUILD_FILE_NAMES = frozenset(('pom.xml', 'build.gradle', 'build.gradle.kts', 'gradle.properties'))
+CATALOG_SUFFIX = '.versions.toml'
+
+# 不会包含源码构建文件的目录（构建输出、依赖缓存、版本控制元数据）
+SKIP_DIRS = frozenset((
+    '.git', '.svn', '.hg', '.idea', '.vscode', '.gradle', '.mvn', 'node_modules',
+    'target', 'build', 'out', 'bin', '.venv', 'venv', '__pycache__'
+))
+
+# 构建文件少于该数量时直接在当前进程解析，进程池的启动开销得不偿失
+PARALLEL_THRESHOLD = 16
+
+# 属性引用的最大嵌套层数，防止循环引用
+MAX_PROPERTY_DEPTH = 10
+
+_MAVEN_PLACEHOLDER = re.compile(r'\$\{([^}]+)\}')
+_GRADLE_PLACEHOLDER = re.compile(r'\$(?:\{([^}]+)\}|([A-Za-z_]\w*))')
+_GRADLE_QUOTED_NAME = re.compile(r'''['"]([\w.\-]+)['"]''')
+
+# 'group:artifact:version' 形式的依赖（可带 classifier 和 @ext）
+_GRADLE_STRING_NOTATION = re.compile(
+    r'''(['"])([\w.\-]+):([\w.\-]+):([^'"\s:@]+)(?::[\w.\-]+)?(?:@\w+)?\1'''
+)
+# group: 'g', name: 'a', version: 'v' 形式的依赖（Kotlin DSL 用 =）
+_GRADLE_MAP_NOTATION = re.compile(
+    r'''group\s*[:=]\s*['"]([^'"]+)['"]\s*,\s*name\s*[:=]\s*['"]([^'"]+)['"]'''
+    r'''(?:\s*,\s*version\s*[:=]\s*['"]([^'"]+)['"])?'''
+)
+# def/val/var 变量、ext 属性以及 ext { } 块中的赋值
+_GRADLE_ASSIGNMENT = re.compile(
+    r'''^\s*(?:(?:def|val|var)\s+|(?:(?:rootProject|project)\.)?ext\.)?'''
+    r'''([A-Za-z_][\w.]*)\s*(?::\s*String\s*)?=\s*['"]([^'"$]+)['"]''',
+    re.MULTILINE
+)
+# ext.set('x', '1.0')、set("x", "1.0")、extra["x"] = "1.0"
+_GRADLE_SET = re.compile(
+    r'''(?:\bset\(\s*['"]([\w.\-]+)['"]\s*,\s*['"]([^'"$]+)['"]\s*\)'''
+    r'''|\bextra\[\s*"([\w.\-]+)"\s*\]\s*=\s*"([^"$]+)")'''
+)
+
+
+def find_build_files(roots: Iterable[str]) -> List[str]:
+    """
+    遍历目录，找出所有构建文件
+
+    Args:
+        roots: 要扫描的目录（也可以直接给出构建文件）
+
+    Returns:
+        构建文件的绝对路径列表（去重并保持遍历顺序）
+    """
+    found = {}
+    for root in roots:
+        root = os.path.abspath(root)
+        if os.path.isfile(root):
+            found[root] = None
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for name in sorted(filenames):
+                if name in BUILD_FILE_NAMES or name.endswith(CATALOG_SUFFIX):
+                    found[os.path.join(dirpath, name)] = None
+    return list(found)
+
+
+def parse_build_file(path: str) -> Dict:
+    """
+    解析单个构建文件（在进程池的工作进程中执行，只使用可序列化的参数和返回值）
+
+    Returns:
+        {'path', 'kind', 'properties', 'dependencies', ...}，解析失败时带有 'error'
+    """
+    name = os.path.basename(path)
+    if name == 'pom.xml':
+        kind = 'pom'
+    elif name == 'gradle.properties':
+        kind = 'properties'
+    elif name.endswith(CATALOG_SUFFIX):
+        kind = 'catalog'
+    else:
+        kind = 'gradle'
+
+    result = {'path': path, 'kind': kind, 'properties': {}, 'dependencies': []}
+    try:
+        if kind == 'pom':
+            _parse_pom(path, result)
+        elif kind == 'catalog':
+            _parse_catalog(path, result)
+        else:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            if kind == 'properties':
+                result['properties'] = _parse_properties(text)
+            else:
+                _parse_gradle(text, result)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def _local_name(tag: str) -> str:
+    """去掉 XML 命名空间前缀"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_texts(element) -> Dict[str, str]:
+    """元素的直接子元素文本（按本地名称）"""
+    return {_local_name(child.tag): (child.text or '').strip() for child in element}
+
+
+def _parse_pom(path: str, result: Dict):
+    import xml.etree.ElementTree as ET
+
+    root = ET.parse(path).getroot()
+    project = _child_texts(root)
+    result['groupId'] = project.get('groupId')
+    result['artifactId'] = project.get('artifactId')
+    result['version'] = project.get('version')
+
+    for child in root:
+        tag = _local_name(child.tag)
+        if tag == 'properties':
+            result['properties'] = {_local_name(p.tag): (p.text or '').strip() for p in child}
+        elif tag == 'parent':
+            parent = _child_texts(child)
+            result['parent'] = {
+                'groupId': parent.get('groupId'),
+                'artifactId': parent.get('artifactId'),
+                'version': parent.get('version'),
+                # 未写 relativePath 时 Maven 默认使用 ../pom.xml
+                'relativePath': parent.get('relativePath', '../pom.xml'),
+            }
+            result['dependencies'].append({
+                'groupId': parent.get('groupId'),
+                'artifactId': parent.get('artifactId'),
+                'version': parent.get('version') or None,
+            })
+
+    # dependencies、dependencyManagement（含 BOM 导入）以及插件和插件的依赖
+    for element in root.iter():
+        if _local_name(element.tag) in ('dependency', 'plugin'):
+            fields = _child_texts(element)
+            if fields.get('groupId') and fields.get('artifactId'):
+                result['dependencies'].append({
+                    'groupId': fields['groupId'],
+                    'artifactId': fields['artifactId'],
+                    'version': fields.get('version') or None,
+                })
+
+
+def _parse_properties(text: str) -> Dict[str, str]:
+    """解析 gradle.properties（key=value 或 key: value，# 和 ! 开头为注释）"""
+    properties = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in '#!':
+            continue
+        match = re.match(r'([^=:\s]+)\s*[=:]\s*(.*)', line)
+        if match:
+            properties[match.group(1)] = match.group(2).strip()
+    return properties
+
+
+def _parse_gradle(text: str, result: Dict):
+    properties = result['properties']
+    for name, value in _GRADLE_ASSIGNMENT.findall(text):
+        properties[name.rsplit('.', 1)[-1]] = value
+    for set_name, set_value, extra_name, extra_value in _GRADLE_SET.findall(text):
+        properties[set_name or extra_name] = set_value or extra_value
+
+    dependencies = result['dependencies']
+    for _, group_id, artifact_id, version in _GRADLE_STRING_NOTATION.findall(text):
+        dependencies.append({'groupId': group_id, 'artifactId': artifact_id, 'version': version})
+    for group_id, artifact_id, version in _GRADLE_MAP_NOTATION.findall(text):
+        dependencies.append({'groupId': group_id, 'artifactId': artifact_id, 'version': version or None})
+
+
+def _catalog_version(version) -> Optional[str]:
+    """版本目录中的版本声明：字符串、{ ref = ... } 或 { strictly/require/prefer = ... }"""
+    if isinstance(version, str):
+        return version
+    if isinstance(version, dict):
+        if 'ref' in version:
+            return '${' + version['ref'] + '}'
+        for key in ('strictly', 'require', 'prefer'):
+            if isinstance(version.get(key), str):
+                return version[key]
+    return None
+
+
+def toml_module():
+    """TOML 解析模块：Python 3.11+ 自带的 tomllib，旧版本上使用接口相同的 tomli，都没有时为 None"""
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+    return tomllib
+
+
+def _parse_catalog(path: str, result: Dict):
+    tomllib = toml_module()
+    with open(path, 'rb') as f:
+        catalog = tomllib.load(f)
+
+    for name, version in catalog.get('versions', {}).items():
+        value = _catalog_version(version)
+        if value is not None:
+            result['properties'][name] = value
+
+    for library in catalog.get('libraries', {}).values():
+        if isinstance(library, str):
+            parts = library.split(':')
+            if len(parts) < 2:
+                continue
+            group_id, artifact_id = parts[0], parts[1]
+            version = parts[2] if len(parts) > 2 else None
+        elif isinstance(library, dict):
+            if 'module' in library:
+                group_id, _, artifact_id = library['module'].partition(':')
+            else:
+                group_id, artifact_id = library.get('group'), library.get('name')
+            version = _catalog_version(library.get('version'))
+        else:
+            continue
+        if group_id and artifact_id:
+            result['dependencies'].append({'groupId': group_id, 'artifactId': artifact_id, 'version': version})
+
+
+def parse_build_files(paths: List[str], workers: Optional[int] = None) -> List[Dict]:
+    """
+    解析多个构建文件，文件较多时使用进程池
+
+    Args:
+        paths: 构建文件路径
+        workers: 进程数，默认为 CPU 核数
+    """
+    if len(paths) < PARALLEL_THRESHOLD:
+        return [parse_build_file(path) for path in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    # 按批次分发，减少进程间通信次数
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_build_file, paths, chunksize=chunksize))
+
+
+class PropertyResolver:
+    """
+    按构建工具的规则解析依赖版本中的属性引用
+
+    - POM: 自身 <properties> 与 project.* 内置属性，然后沿 <parent> 链向上查找
+      （先按 relativePath，再按 groupId:artifactId 在已扫描的 POM 中查找）
+    - Gradle: 本文件中的变量/ext 属性，然后是上级目录中的 build.gradle(.kts) 和 gradle.properties
+    - 版本目录: [versions] 表
+    """
+
+    def __init__(self, parsed: List[Dict]):
+        self._by_path = {p['path']: p for p in parsed}
+        self._poms_by_ga = {}
+        for p in parsed:
+            if p['kind'] == 'pom':
+                group_id = p.get('groupId') or (p.get('parent') or {}).get('groupId')
+                self._poms_by_ga[(group_id, p.get('artifactId'))] = p
+        self._scopes = {}
+
+    def _pom_parent(self, pom: Dict) -> Optional[Dict]:
+        parent = pom.get('parent')
+        if not parent:
+            return None
+        relative = parent.get('relativePath')
+        if relative:
+            candidate = os.path.normpath(os.path.join(os.path.dirname(pom['path']), relative))
+            if os.path.basename(candidate) != 'pom.xml':
+                candidate = os.path.join(candidate, 'pom.xml')
+            found = self._by_path.get(candidate)
+            if found and found.get('artifactId') == parent.get('artifactId'):
+                return found
+        return self._poms_by_ga.get((parent.get('groupId'), parent.get('artifactId')))
+
+    def _pom_scope(self, pom: Dict) -> List[Dict[str, str]]:
+        scopes, seen = [], set()
+        while pom is not None and pom['path'] not in seen:
+            seen.add(pom['path'])
+            parent = pom.get('parent') or {}
+            version = pom.get('version') or parent.get('version')
+            builtins = {
+                'project.version': version, 'version': version, 'pom.version': version,
+                'project.groupId': pom.get('groupId') or parent.get('groupId'),
+                'project.artifactId': pom.get('artifactId'),
+                'project.parent.version': parent.get('version'),
+                'parent.version': parent.get('version'),
+            }
+            scopes.append(pom['properties'])
+            scopes.append({k: v for k, v in builtins.items() if v})
+            pom = self._pom_parent(pom)
+        return scopes
+
+    def _gradle_scope(self, build_file: Dict) -> List[Dict[str, str]]:
+        scopes = [build_file['properties']]
+        directory = os.path.dirname(build_file['path'])
+        while True:
+            for name in ('build.gradle', 'build.gradle.kts', 'gradle.properties'):
+                found = self._by_path.get(os.path.join(directory, name))
+                if found is not None and found is not build_file:
+                    scopes.append(found['properties'])
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return scopes
+            directory = parent
+
+    def _scope(self, parsed: Dict) -> List[Dict[str, str]]:
+        path = parsed['path']
+        if path not in self._scopes:
+            if parsed['kind'] == 'pom':
+                self._scopes[path] = self._pom_scope(parsed)
+            elif parsed['kind'] == 'gradle':
+                self._scopes[path] = self._gradle_scope(parsed)
+            else:
+                self._scopes[path] = [parsed['properties']]
+        return self._scopes[path]
+
+    def resolve(self, parsed: Dict, value: Optional[str]) -> Optional[str]:
+        """展开属性引用，无法完全展开时返回 None"""
+        if value is None:
+            return None
+        scopes = self._scope(parsed)
+        placeholder = _MAVEN_PLACEHOLDER if parsed['kind'] != 'gradle' else _GRADLE_PLACEHOLDER
+
+        def lookup(match):
+            name = _placeholder_name(match)
+            for scope in scopes:
+                if name in scope:
+                    return scope[name]
+            return match.group(0)
+
+        for _ in range(MAX_PROPERTY_DEPTH):
+            expanded = placeholder.sub(lookup, value)
+            if expanded == value:
+                break
+            value = expanded
+        return None if '$' in value else value
+
+
+def _placeholder_name(match) -> str:
+    """${name}、$name、${rootProject.ext.name}、${property("name")} 中的属性名"""
+    if match.lastindex == 2 and match.group(2):
+        return match.group(2)
+    expression = match.group(1).strip()
+    quoted = _GRADLE_QUOTED_NAME.search(expression)
+    if quoted and '(' in expression:
+        return quoted.group(1)
+    if match.re is _MAVEN_PLACEHOLDER:
+        return expression
+    expression = expression[:-len('.get()')] if expression.endswith('.get()') else expression
+    return expression.rsplit('.', 1)[-1]
+
+
+def scan_projects(roots: Iterable[str], group_ids: Iterable[str],
+                  workers: Optional[int] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    扫描项目目录，收集指定 groupId 的依赖
+
+    Args:
+        roots: 要扫描的目录
+        group_ids: 关注的 groupId
+        workers: 解析构建文件的进程数
+
+    Returns:
+        (依赖使用列表, 解析失败的文件列表)
+        每个依赖使用为 {'groupId', 'artifactId', 'version', 'declared', 'file'}，
+        version 为 None 表示属性无法解析；没有 TOML 解析模块时所有版本目录合并为一条错误
+    """
+    group_ids = set(group_ids)
+    paths = find_build_files(roots)
+    usages, errors = [], []
+    if toml_module() is None:
+        catalogs = [path for path in paths if path.endswith(CATALOG_SUFFIX)]
+        if catalogs:
+            paths = [path for path in paths if not path.endswith(CATALOG_SUFFIX)]
+            errors.append({
+                'path': f"{len(catalogs)} 个版本目录（*{CATALOG_SUFFIX}）",
+                'error': '需要 Python 3.11+ 自带的 tomllib，旧版本 Python 请先 pip install tomli',
+            })
+    parsed = parse_build_files(paths, workers)
+    resolver = PropertyResolver(parsed)
+
+    for build_file in parsed:
+        if 'error' in build_file:
+            errors.append(build_file)
+            continue
+        seen = set()
+        for dependency in build_file['dependencies']:
+            # 未声明版本的依赖由 dependencyManagement/BOM/platform 管理，管理它的声明本身会被报告
+            if dependency['groupId'] not in group_ids or dependency['version'] is None:
+                continue
+            key = (dependency['groupId'], dependency['artifactId'], dependency['version'])
+            if key in seen:
+                continue
+            seen.add(key)
+            usages.append({
+                'groupId': dependency['groupId'],
+                'artifactId': dependency['artifactId'],
+                'version': resolver.resolve(build_file, dependency['version']),
+                'declared': dependency['version'],
+                'file': build_file['path'],
+            })
+    return usages, errors
+
+
+def build_report(usages: List[Dict], latest: Dict[Tuple[str, str], Dict]) -> List[Dict]:
+    """
+    按组件和当前版本汇总依赖使用情况
+
+    Args:
+        usages: scan_projects 返回的依赖使用列表
+        latest: (groupId, artifactId) -> 查询到的最新版本信息
+
+    Returns:
+        每项为 {'groupId', 'artifactId', 'current', 'latest', 'status', 'files'}，
+        status 为 outdated / up-to-date / ahead / unresolved / unknown
+    """
+    from version_checker import version_key
+
+    rows = {}
+    for usage in usages:
+        key = (usage['groupId'], usage['artifactId'], usage['version'] or usage['declared'])
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = {
+                'groupId': usage['groupId'],
+                'artifactId': usage['artifactId'],
+                'current': key[2],
+                'latest': None,
+                'status': 'unresolved',
+                'files': [],
+            }
+            artifact = latest.get((usage['groupId'], usage['artifactId']))
+            if artifact:
+                row['latest'] = artifact['version']
+            if usage['version'] is None:
+                pass
+            elif not artifact:
+                row['status'] = 'unknown'
+            else:
+                current, newest = version_key(usage['version']), version_key(artifact['version'])
+                row['status'] = 'outdated' if current < newest else 'ahead' if current > newest else 'up-to-date'
+        if usage['file'] not in row['files']:
+            row['files'].append(usage['file'])
+
+    order = {'outdated': 0, 'unresolved': 1, 'unknown': 2, 'ahead': 3, 'up-to-date': 4}
+    return sorted(rows.values(), key=lambda r: (order[r['status']], r['artifactId'], r['current'] or ''))
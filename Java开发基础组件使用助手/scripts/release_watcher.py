@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+组件发布监视
+
+周期性地用条件请求（ETag/Last-Modified）读取各组件的 maven-metadata.xml，与上次已知的最新版本快照比较，
+只在出现新组件或版本升级时输出 NDJSON 事件或执行钩子命令。没有新发布时每轮只产生若干 304 响应。
+
+轮询间隔自适应：发现变化后回到最短间隔（发布通常成批出现），没有变化时逐步拉长到最长间隔，
+查询出错时也拉长间隔以免加重仓库负担。
+
+由 query_versions.py --watch 调用。
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from version_checker import JDevelopsVersionChecker
+
+
+class ReleaseWatcher:
+    """
+    组件发布监视器
+
+    快照保存在 $XDG_STATE_HOME/jdevelops-skill/watch_state.json，重启后仍能发现停止期间的新发布。
+    """
+
+    # 没有变化时间隔的增长倍数、出错时的增长倍数
+    IDLE_GROWTH = 1.5
+    ERROR_GROWTH = 2.0
+    # 间隔的随机抖动比例，避免多个监视进程同时请求
+    JITTER = 0.1
+
+    def __init__(self, checker: 'JDevelopsVersionChecker', group_ids: List[str],
+                 artifact_ids: Optional[List[str]] = None, interval: float = 120, max_interval: float = 900,
+                 discover_interval: float = 3600, hook: Optional[str] = None, workers: int = 8,
+                 state_path: Optional[str] = None, log: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            checker: 版本查询器（应开启 refresh，使每次轮询都向仓库发起条件请求）
+            group_ids: 监视的 groupId
+            artifact_ids: 只监视这些组件（仅对第一个 groupId 有效），None 表示监视 groupId 下的全部组件
+            interval: 最短轮询间隔（秒）
+            max_interval: 最长轮询间隔（秒）
+            discover_interval: 未指定组件时，重新列出 groupId 下组件（发现新组件）的间隔（秒）
+            hook: 每个事件执行一次的 shell 命令，事件 JSON 从标准输入传入，并设置 JDEVELOPS_* 环境变量
+            workers: 并发轮询的线程数
+            state_path: 快照文件路径，默认为 $XDG_STATE_HOME/jdevelops-skill/watch_state.json
+            log: 详细日志函数
+        """
+        self.checker = checker
+        self.group_ids = group_ids
+        self.artifact_ids = artifact_ids
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.discover_interval = discover_interval
+        self.hook = hook
+        self.workers = workers
+        self.log = log or (lambda message: None)
+        if state_path is None:
+            base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+            state_path = os.path.join(base, 'jdevelops-skill', 'watch_state.json')
+        self.state_path = state_path
+        self._snapshot = self._load()
+        # 需要轮询的组件：(groupId, artifactId)
+        self._watched: List[Tuple[str, str]] = []
+        self._discovered_at = None
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._snapshot, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"⚠️  写入监视快照失败: {e}", file=sys.stderr)
+
+    def _discover(self) -> List[Dict]:
+        """确定要轮询的组件；未指定组件时列出各 groupId 下的全部组件（开销较大，按 discover_interval 执行）"""
+        if self.artifact_ids is not None:
+            if not self._watched:
+                self._watched = [(self.group_ids[0], a) for a in self.artifact_ids]
+            return []
+
+        now = time.monotonic()
+        if self._discovered_at is not None and now - self._discovered_at < self.discover_interval:
+            return []
+        self._discovered_at = now
+
+        found = []
+        watched = dict.fromkeys(self._watched)
+        for group_id, artifacts in self.checker.search_groups(self.group_ids):
+            for artifact in artifacts:
+                watched[(group_id, artifact['artifactId'])] = None
+                found.append(artifact)
+        self._watched = list(watched)
+        return found
+
+    def poll(self) -> Tuple[List[Dict], int]:
+        """
+        执行一轮轮询
+
+        Returns:
+            (变化事件列表, 查询失败的组件数)
+        """
+        latest: Dict[Tuple[str, str], Optional[Dict]] = {}
+        # 列出组件时已经得到了最新版本，这些组件本轮无需再读取 maven-metadata.xml
+        for artifact in self._discover():
+            latest[(artifact['groupId'], artifact['artifactId'])] = artifact
+        pending = [key for key in self._watched if key not in latest]
+        latest.update(self.checker.poll_artifacts(pending, workers=self.workers))
+
+        from version_checker import version_key
+
+        events = []
+        failures = 0
+        # 第一次见到的 groupId（以及 -a 模式下新加入监视的组件）只记录快照，不产生事件
+        known_groups = set(self._snapshot)
+        recorded = 0
+        for (group_id, artifact_id), artifact in latest.items():
+            if not artifact:
+                failures += 1
+                continue
+            known = self._snapshot.setdefault(group_id, {})
+            previous = known.get(artifact_id)
+            version = artifact['version']
+            if previous == version:
+                continue
+            known[artifact_id] = version
+            if group_id not in known_groups or (previous is None and self.artifact_ids is not None):
+                recorded += 1
+                continue
+            if previous is not None and version_key(version) <= version_key(previous):
+                # 仓库之间同步有延迟时可能读到较旧的版本，不视为变化
+                known[artifact_id] = previous
+                continue
+            events.append({
+                'event': 'new_artifact' if previous is None else 'version_bump',
+                'groupId': group_id,
+                'artifactId': artifact_id,
+                'version': version,
+                'previous': previous,
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            })
+
+        if recorded:
+            print(f"📸 已记录初始快照: {recorded} 个组件", file=sys.stderr)
+        self._save()
+        self.checker.flush()
+        return events, failures
+
+    def emit(self, event: Dict):
+        """输出一个事件：写到标准输出（NDJSON），有钩子时执行钩子"""
+        line = json.dumps(event, ensure_ascii=False)
+        sys.stdout.write(line + '\n')
+        sys.stdout.flush()
+        if not self.hook:
+            return
+        env = dict(os.environ)
+        env.update({
+            'JDEVELOPS_EVENT': event['event'],
+            'JDEVELOPS_GROUP_ID': event['groupId'],
+            'JDEVELOPS_ARTIFACT_ID': event['artifactId'],
+            'JDEVELOPS_VERSION': event['version'],
+            'JDEVELOPS_PREVIOUS_VERSION': event['previous'] or '',
+        })
+        try:
+            result = subprocess.run(self.hook, shell=True, input=line + '\n', text=True, env=env,
+                                    stdout=sys.stderr)
+            if result.returncode != 0:
+                print(f"⚠️  钩子命令退出码 {result.returncode}: {event['artifactId']} {event['version']}",
+                      file=sys.stderr)
+        except OSError as e:
+            print(f"⚠️  无法执行钩子命令: {e}", file=sys.stderr)
+
+    def next_interval(self, current: float, changed: bool, failed: bool) -> float:
+        """自适应轮询间隔"""
+        if changed:
+            return self.interval
+        growth = self.ERROR_GROWTH if failed else self.IDLE_GROWTH
+        return min(self.max_interval, current * growth)
+
+    def run(self, cycles: int = 0) -> int:
+        """
+        持续轮询，直到完成 cycles 轮（0 表示一直运行）或被中断
+
+        Returns:
+            进程退出码
+        """
+        interval = self.interval
+        cycle = 0
+        try:
+            while True:
+                cycle += 1
+                started = time.monotonic()
+                try:
+                    events, failures = self.poll()
+                except Exception as e:
+                    print(f"❌ 第 {cycle} 轮轮询出错: {e}", file=sys.stderr)
+                    events, failures = [], 1
+                for event in events:
+                    self.emit(event)
+
+                if cycles and cycle >= cycles:
+                    return 0
+                interval = self.next_interval(interval, bool(events), failures > 0)
+                delay = interval * random.uniform(1 - self.JITTER, 1 + self.JITTER)
+                delay = max(0.0, delay - (time.monotonic() - started))
+                self.log(f"💤 第 {cycle} 轮完成（{len(events)} 个事件，{failures} 个失败），"
+                         f"{delay:.0f} 秒后再次轮询")
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            print("\n👋 停止监视", file=sys.stderr)
+            return 0
+        finally:
+            self._save()
+            self.checker.flush()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+请求级的性能埋点
+
+每次 HTTP 尝试（包括重试）记录一个 span：仓库、URL、状态码、响应字节数（Content-Length）、
+DNS/连接/TLS/首字节/总耗时、第几次尝试、缓存命中情况。命中本地缓存而未联网的查询也记录一个 span。
+
+输出格式由 --metrics-out 的文件名决定：
+- *.prom：Prometheus textfile（供 node_exporter 的 textfile collector 读取），每次 flush 时原子替换
+- 其他：JSON Lines，每个 span 一行，实时追加
+
+未指定 --metrics-out 时不会导入本模块，查询路径上也没有任何额外开销。
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 当前线程正在进行的请求的阶段耗时，由带计时的连接类写入
+_phases = threading.local()
+
+# 各阶段在 span 中的字段名
+PHASES = ('dns', 'connect', 'tls', 'first_byte', 'total')
+
+# Prometheus 直方图的桶上界（秒）
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """收集并导出请求 span（线程安全）"""
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        """
+        Args:
+            path: 输出文件路径
+            fmt: 'jsonl' 或 'prometheus'，默认按扩展名判断（.prom 为 prometheus）
+        """
+        self.path = path
+        self.format = fmt or ('prometheus' if path.endswith('.prom') else 'jsonl')
+        self._lock = threading.Lock()
+        self._file = None
+        # Prometheus 聚合值
+        self._requests: Dict[Tuple[str, str], int] = {}
+        self._durations: Dict[str, List] = {}
+        self._phase_totals: Dict[Tuple[str, str], List[float]] = {}
+        self._bytes: Dict[str, int] = {}
+        self._retries: Dict[str, int] = {}
+        self._cache: Dict[str, int] = {}
+
+    def begin(self, url: str, repo: str, attempt: int, cache: Optional[str]) -> Dict:
+        """
+        开始一次 HTTP 尝试
+
+        Args:
+            url: 请求地址
+            repo: 仓库名称
+            attempt: 第几次尝试（从 1 开始）
+            cache: 缓存状态：miss（无缓存）、revalidate（携带 ETag 的条件请求），不使用缓存时为 None
+        """
+        _phases.timings = {}
+        return {
+            'ts': time.time(),
+            'repo': repo,
+            'url': url,
+            'attempt': attempt,
+            'cache': cache,
+            '_started': time.perf_counter(),
+        }
+
+    def finish(self, span: Dict, response=None, error: Optional[BaseException] = None):
+        """结束一次 HTTP 尝试并记录 span"""
+        total = time.perf_counter() - span.pop('_started')
+        timings = getattr(_phases, 'timings', None) or {}
+        _phases.timings = None
+
+        span['status'] = response.status_code if response is not None else None
+        span['error'] = type(error).__name__ if error is not None else None
+        length = response.headers.get('Content-Length') if response is not None else None
+        span['bytes'] = int(length) if length and length.isdigit() else None
+        # 没有建立新连接说明复用了连接池中的连接
+        span['reused'] = 'connect' not in timings if response is not None else None
+        for phase in ('dns', 'connect', 'tls'):
+            span[phase] = _round(timings.get(phase))
+        span['first_byte'] = _round(response.elapsed.total_seconds()) if response is not None else None
+        span['total'] = _round(total)
+        if span['status'] == 304:
+            span['cache'] = 'revalidated'
+        self._record(span)
+
+    def cache_hit(self, url: str, repo: str):
+        """记录一次直接命中本地缓存（未联网）的查询"""
+        span = {'ts': time.time(), 'repo': repo, 'url': url, 'attempt': 0, 'cache': 'hit', 'status': None,
+                'error': None, 'bytes': None, 'reused': None}
+        span.update(dict.fromkeys(PHASES))
+        self._record(span)
+
+    def _record(self, span: Dict):
+        with self._lock:
+            if self.format == 'jsonl':
+                self._write_line(span)
+            else:
+                self._aggregate(span)
+
+    def _write_line(self, span: Dict):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(span, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def _aggregate(self, span: Dict):
+        repo = span['repo']
+        # 缓存结果按查询计数，重试不重复计入
+        if span['cache'] and span['attempt'] <= 1:
+            self._cache[span['cache']] = self._cache.get(span['cache'], 0) + 1
+        if span['attempt'] == 0:
+            return
+
+        status = str(span['status']) if span['status'] is not None else 'error'
+        self._requests[(repo, status)] = self._requests.get((repo, status), 0) + 1
+        if span['attempt'] > 1:
+            self._retries[repo] = self._retries.get(repo, 0) + 1
+        if span['bytes']:
+            self._bytes[repo] = self._bytes.get(repo, 0) + span['bytes']
+
+        buckets = self._durations.setdefault(repo, [[0] * len(DURATION_BUCKETS), 0.0, 0])
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if span['total'] <= bound:
+                buckets[0][index] += 1
+        buckets[1] += span['total']
+        buckets[2] += 1
+
+        for phase in PHASES:
+            if span[phase] is not None:
+                totals = self._phase_totals.setdefault((repo, phase), [0.0, 0])
+                totals[0] += span[phase]
+                totals[1] += 1
+
+    def flush(self):
+        """JSON Lines 已实时写入；Prometheus 格式在此时整体写出（原子替换）"""
+        with self._lock:
+            if self.format == 'jsonl':
+                if self._file is not None:
+                    self._file.flush()
+                return
+            text = self._render_prometheus()
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  写入指标文件失败: {e}", file=sys.stderr)
+
+    def _render_prometheus(self) -> str:
+        lines = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header('jdevelops_http_requests_total', 'counter', 'HTTP requests sent to repositories, one per attempt.')
+        for (repo, status), count in sorted(self._requests.items()):
+            lines.append(f"jdevelops_http_requests_total{_labels(repo=repo, status=status)} {count}")
+
+        header('jdevelops_http_request_duration_seconds', 'histogram', 'Total time of each HTTP attempt.')
+        for repo, (counts, total, count) in sorted(self._durations.items()):
+            for bound, bucket in zip(DURATION_BUCKETS, counts):
+                lines.append(f"jdevelops_http_request_duration_seconds_bucket{_labels(repo=repo, le=f'{bound:g}')} "
+                             f"{bucket}")
+            lines.append(f"jdevelops_http_request_duration_seconds_bucket{_labels(repo=repo, le='+Inf')} {count}")
+            lines.append(f"jdevelops_http_request_duration_seconds_sum{_labels(repo=repo)} {total:.6f}")
+            lines.append(f"jdevelops_http_request_duration_seconds_count{_labels(repo=repo)} {count}")
+
+        header('jdevelops_http_phase_seconds', 'summary', 'Time spent in each phase of HTTP attempts.')
+        for (repo, phase), (total, count) in sorted(self._phase_totals.items()):
+            lines.append(f"jdevelops_http_phase_seconds_sum{_labels(repo=repo, phase=phase)} {total:.6f}")
+            lines.append(f"jdevelops_http_phase_seconds_count{_labels(repo=repo, phase=phase)} {count}")
+
+        header('jdevelops_http_response_bytes_total', 'counter', 'Response bytes reported by Content-Length.')
+        for repo, size in sorted(self._bytes.items()):
+            lines.append(f"jdevelops_http_response_bytes_total{_labels(repo=repo)} {size}")
+
+        header('jdevelops_http_retries_total', 'counter', 'HTTP attempts that were retries.')
+        for repo, count in sorted(self._retries.items()):
+            lines.append(f"jdevelops_http_retries_total{_labels(repo=repo)} {count}")
+
+        header('jdevelops_cache_lookups_total', 'counter', 'Response cache outcomes: hit, miss, revalidate (conditional request), revalidated (304), stale.')
+        for result, count in sorted(self._cache.items()):
+            lines.append(f"jdevelops_cache_lookups_total{_labels(result=result)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 6) if value is not None else None
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels.items()) + '}'
+
+
+_adapter_class = None
+
+
+def timed_adapter_class():
+    """
+    返回记录 DNS/连接/TLS 耗时的 HTTPAdapter 子类（首次调用时才导入 requests/urllib3）
+
+    计时写入当前线程的 span：只有 begin() 与 finish() 之间新建的连接会被计时，
+    复用连接池中已有连接的请求没有这三个阶段。
+    """
+    global _adapter_class
+    if _adapter_class is not None:
+        return _adapter_class
+
+    import socket
+
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedConnectionMixin:
+        def _new_conn(self):
+            timings = getattr(_phases, 'timings', None)
+            if timings is None:
+                return super()._new_conn()
+
+            host = self._dns_host
+            started = time.perf_counter()
+            try:
+                address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+            except OSError:
+                # 交给 urllib3 报告解析失败
+                return super()._new_conn()
+            resolved = time.perf_counter()
+            timings['dns'] = resolved - started
+
+            # 直接连接已解析的地址，把 DNS 与 TCP 连接的耗时分开；失败时按原主机名重试（尝试其余地址）
+            self._dns_host = address
+            try:
+                sock = super()._new_conn()
+            except Exception:
+                self._dns_host = host
+                sock = super()._new_conn()
+            finally:
+                self._dns_host = host
+            timings['connect'] = time.perf_counter() - resolved
+            return sock
+
+    class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+        pass
+
+    class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+        def connect(self):
+            timings = getattr(_phases, 'timings', None)
+            started = time.perf_counter()
+            super().connect()
+            if timings is not None and 'connect' in timings:
+                # connect() 包含 TCP 连接，其余部分是 TLS 握手（经代理时还包括建立隧道）
+                elapsed = time.perf_counter() - started
+                timings['tls'] = max(0.0, elapsed - timings['dns'] - timings['connect'])
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    pool_classes = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+    class TimedHTTPAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = pool_classes
+
+        def proxy_manager_for(self, proxy, **proxy_kwargs):
+            manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+            # SOCKS 代理使用自己的连接类，不做计时
+            if not proxy.lower().startswith('socks'):
+                manager.pool_classes_by_scheme = pool_classes
+            return manager
+
+    _adapter_class = TimedHTTPAdapter
+    return _adapter_class
@@ -0,0 +1,2976 @@
+#!/usr/bin/env python3
+"""
+JDevelops 组件版本查询工具的实现
+
+用于查询 Maven 仓库上 cn.tannn.jdevelops 组件的最新版本信息
+支持多个 Maven 仓库源，自动切换，或并发竞速（--race）
+单个组件优先直接读取仓库的 maven-metadata.xml，搜索接口用于发现组件
+
+命令行入口是 query_versions.py。实现放在独立模块中，是因为直接运行的脚本每次都要重新编译，
+而被导入的模块可以复用 __pycache__ 中的字节码；requests、XML 解析、线程池等较重的模块
+也只在真正需要时才导入。这样 --help、参数错误以及命中缓存/本地仓库的调用几乎没有额外的启动开销
+（用 scripts/bench_startup.py 测量）。
+"""
+
+import json
+import sys
+import time
+import functools
+import os
+import queue
+import threading
+import atexit
+import io
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+    from maven_settings import MavenSettings
+    from request_metrics import RequestMetrics
+
+
+def _merge_into_file(path: str, merge: Callable[[Any], Any], **dump_options) -> Any:
+    """
+    读取-合并-写回 JSON 状态文件
+
+    CLI、常驻服务和并发的多个进程共用同一份文件，直接用内存中的内容覆盖会丢掉其他进程
+    期间写入的条目。这里在 <path>.lock 上持有排他的 fcntl 锁，重新读取磁盘上的当前内容交给
+    merge 合并，再写临时文件并原子替换。没有 fcntl 的平台上不加锁，只做合并。
+
+    Args:
+        path: 状态文件路径
+        merge: 接收磁盘上的当前内容（文件不存在或损坏时为 None），返回要写入的内容
+        **dump_options: 传给 json.dump 的参数
+
+    Returns:
+        写入的内容
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = None
+        merged = merge(current)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, **dump_options)
+        os.replace(tmp_path, path)
+    return merged
+
+
+class RepoHealth:
+    """
+    仓库健康度记分板
+
+    记录每个仓库的延迟（指数滑动平均）、成功率和最近失败时间，保存在
+    $XDG_STATE_HOME/jdevelops-skill/repo_health.json，下次运行时按得分排序仓库；
+    连续失败达到阈值的仓库在冷却期内被跳过（熔断）。
+    """
+
+    # 滑动平均的平滑系数
+    ALPHA = 0.3
+    # 没有记录的仓库的假定延迟（秒）
+    DEFAULT_LATENCY = 1.0
+    # 失败率对得分的惩罚（相当于多少秒延迟）
+    FAILURE_PENALTY = 10.0
+
+    def __init__(self, path: Optional[str] = None, failure_threshold: int = 3, cooldown: int = 300):
+        """
+        Args:
+            path: 状态文件路径，默认为 $XDG_STATE_HOME/jdevelops-skill/repo_health.json
+            failure_threshold: 连续失败多少次后熔断
+            cooldown: 熔断后的冷却时间（秒）
+        """
+        if path is None:
+            base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+            path = os.path.join(base, 'jdevelops-skill', 'repo_health.json')
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._stats = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        if self._stats is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._stats = json.load(f)
+            except (OSError, ValueError):
+                self._stats = {}
+        return self._stats
+
+    def record(self, repo_name: str, ok: bool, latency: float, probe: bool = False):
+        """记录一次查询结果（probe 为 True 表示这是一次延迟探测）"""
+        with self._lock:
+            stats = self._load().setdefault(repo_name, {
+                'latency': latency,
+                'failure_rate': 0.0,
+                'consecutive_failures': 0,
+                'last_failure': None,
+                'last_success': None
+            })
+            now = time.time()
+            if ok:
+                stats['latency'] += self.ALPHA * (latency - stats['latency'])
+                stats['failure_rate'] *= 1 - self.ALPHA
+                stats['consecutive_failures'] = 0
+                stats['last_success'] = now
+            else:
+                stats['failure_rate'] += self.ALPHA * (1 - stats['failure_rate'])
+                stats['consecutive_failures'] += 1
+                stats['last_failure'] = now
+            if probe:
+                stats['probed_at'] = now
+            self._dirty = True
+
+    def probed_at(self, repo_name: str) -> float:
+        """最近一次延迟探测的时间，从未探测过时为 0"""
+        with self._lock:
+            stats = self._load().get(repo_name)
+        return (stats or {}).get('probed_at') or 0
+
+    def score(self, repo_name: str) -> float:
+        """仓库得分，越小越好"""
+        with self._lock:
+            stats = self._load().get(repo_name)
+        if not stats:
+            return self.DEFAULT_LATENCY
+        return stats['latency'] + self.FAILURE_PENALTY * stats['failure_rate']
+
+    def is_open(self, repo_name: str) -> bool:
+        """仓库是否处于熔断状态（连续失败且仍在冷却期内）"""
+        with self._lock:
+            stats = self._load().get(repo_name)
+        return bool(
+            stats
+            and stats['consecutive_failures'] >= self.failure_threshold
+            and time.time() - (stats['last_failure'] or 0) < self.cooldown
+        )
+
+    def order(self, repos: List[Dict]) -> List[Dict]:
+        """按得分排序并跳过熔断中的仓库；全部熔断时仍按得分返回全部仓库"""
+        ranked = sorted(repos, key=lambda repo: self.score(repo['name']))
+        available = [repo for repo in ranked if not self.is_open(repo['name'])]
+        return available or ranked
+
+    @staticmethod
+    def _last_activity(stats: Dict) -> float:
+        """最近一次记录（成功、失败或探测）的时间"""
+        return max(stats.get('last_success') or 0, stats.get('last_failure') or 0, stats.get('probed_at') or 0)
+
+    def _merge(self, current: Any) -> Dict:
+        """逐个仓库取最近有记录的一方，其他进程后来的成功/失败不会被本进程较旧的统计覆盖"""
+        merged = current if isinstance(current, dict) else {}
+        for repo_name, stats in self._stats.items():
+            other = merged.get(repo_name)
+            if not isinstance(other, dict) or self._last_activity(stats) > self._last_activity(other):
+                merged[repo_name] = stats
+        return merged
+
+    def flush(self):
+        """与状态文件的当前内容合并后写回"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._stats = _merge_into_file(self.path, self._merge, indent=2)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️  写入仓库健康度失败: {e}", file=sys.stderr)
+
+
+class LocalRepoIndex:
+    """
+    本地 Maven 仓库（~/.m2/repository）索引
+
+    用 os.scandir 扫描 groupId 目录下的组件目录，读取版本目录和 maven-metadata-*.xml，
+    结果按目录 mtime 增量更新并保存在 $XDG_CACHE_HOME/jdevelops-skill/local_index.json。
+
+    每个组件记录两个时间：updated 为本地最近的变化（版本目录 mtime 或元数据的 lastUpdated），
+    checked 为 Maven 最近一次从远程仓库刷新元数据的时间（maven-metadata-<仓库id>.xml 的 lastUpdated，
+    不包括 mvn install 生成的 maven-metadata-local.xml）。下载或安装旧版本只会改变 updated，
+    因此判断本地的“最新版本”是否可信只能看 checked。
+    """
+
+    def __init__(self, root: Optional[str] = None, index_path: Optional[str] = None):
+        """
+        Args:
+            root: 本地仓库目录，默认为 ~/.m2/repository
+            index_path: 索引文件路径，默认为 $XDG_CACHE_HOME/jdevelops-skill/local_index.json
+        """
+        self.root = root or os.path.join(os.path.expanduser('~'), '.m2', 'repository')
+        self.index_path = index_path or os.path.join(ResponseCache.default_dir(), 'local_index.json')
+        self._index = None
+        self._dirty = False
+        # 本进程扫描过并有变化的 (groupId, artifactId)，写回时只用这些条目覆盖文件中的内容
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+                if self._index.get('root') != self.root:
+                    self._index = None
+            except (OSError, ValueError):
+                pass
+            if self._index is None:
+                self._index = {'root': self.root, 'groups': {}}
+        return self._index
+
+    def _group_dir(self, group_id: str) -> str:
+        return os.path.join(self.root, *group_id.split('.'))
+
+    def pom_path(self, group_id: str, artifact_id: str, version: str) -> str:
+        """某个版本的 POM 文件在本地仓库中的路径"""
+        return os.path.join(self._group_dir(group_id), artifact_id, version, f"{artifact_id}-{version}.pom")
+
+    def artifacts(self, group_id: str) -> Dict[str, Dict]:
+        """
+        列出本地仓库中某个 groupId 下的全部组件
+
+        Returns:
+            artifactId -> {'versions': [...], 'updated': 最近更新时间（秒）, 'checked': 最近从远程刷新的时间（秒）}
+        """
+        group_dir = self._group_dir(group_id)
+        with self._lock:
+            group = self._load()['groups'].setdefault(group_id, {})
+            seen = set()
+            try:
+                with os.scandir(group_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            seen.add(entry.name)
+                            self._refresh_artifact(group_id, group, entry.name, entry.path, entry.stat().st_mtime_ns)
+            except OSError:
+                pass
+            for artifact_id in set(group) - seen:
+                del group[artifact_id]
+                self._changed.add((group_id, artifact_id))
+                self._dirty = True
+            return {a: e for a, e in group.items() if e['versions']}
+
+    def artifact(self, group_id: str, artifact_id: str) -> Optional[Dict]:
+        """读取单个组件的本地信息，目录未变化时直接使用索引"""
+        path = os.path.join(self._group_dir(group_id), artifact_id)
+        with self._lock:
+            group = self._load()['groups'].setdefault(group_id, {})
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                if group.pop(artifact_id, None) is not None:
+                    self._changed.add((group_id, artifact_id))
+                    self._dirty = True
+                return None
+            entry = self._refresh_artifact(group_id, group, artifact_id, path, mtime_ns)
+            return entry if entry['versions'] else None
+
+    def _refresh_artifact(self, group_id: str, group: Dict, artifact_id: str, path: str, mtime_ns: int) -> Dict:
+        entry = group.get(artifact_id)
+        if entry is None or entry['mtime_ns'] != mtime_ns or self._metadata_changed(path, entry):
+            entry = self._scan_artifact(artifact_id, path)
+            entry['mtime_ns'] = mtime_ns
+            group[artifact_id] = entry
+            self._changed.add((group_id, artifact_id))
+            self._dirty = True
+        return entry
+
+    @staticmethod
+    def _metadata_changed(path: str, entry: Dict) -> bool:
+        """元数据文件被原地改写时目录的 mtime 不变，逐个比较上次扫描时记录的文件 mtime"""
+        if 'metadata' not in entry:
+            # 旧版本的索引没有记录元数据文件，重新扫描一次
+            return True
+        for name, mtime_ns in entry['metadata'].items():
+            try:
+                if os.stat(os.path.join(path, name)).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    @staticmethod
+    def _scan_artifact(artifact_id: str, path: str) -> Dict:
+        """扫描组件目录：已下载 POM/JAR 的版本目录 + maven-metadata-*.xml 中的版本"""
+        import calendar
+        import xml.etree.ElementTree as ET
+
+        versions = set()
+        updated = 0.0
+        checked = 0.0
+        metadata = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        version = entry.name
+                        # 下载失败时只留下 *.lastUpdated 文件，不算已安装
+                        prefix = os.path.join(entry.path, f"{artifact_id}-{version}")
+                        if os.path.exists(prefix + '.pom') or os.path.exists(prefix + '.jar'):
+                            versions.add(version)
+                            updated = max(updated, entry.stat().st_mtime)
+                    elif entry.name.startswith('maven-metadata') and entry.name.endswith('.xml'):
+                        # maven-metadata-local.xml 由 mvn install 生成，不代表远程仓库的状态
+                        remote = entry.name not in ('maven-metadata.xml', 'maven-metadata-local.xml')
+                        try:
+                            metadata[entry.name] = entry.stat().st_mtime_ns
+                            for _, element in ET.iterparse(entry.path):
+                                text = (element.text or '').strip()
+                                if element.tag == 'version' and text:
+                                    versions.add(text)
+                                elif element.tag == 'lastUpdated' and text:
+                                    stamp = float(calendar.timegm(time.strptime(text, '%Y%m%d%H%M%S')))
+                                    updated = max(updated, stamp)
+                                    if remote:
+                                        checked = max(checked, stamp)
+                        except (ET.ParseError, ValueError, OSError):
+                            pass
+        except OSError:
+            pass
+        return {'versions': sorted(versions), 'updated': updated, 'checked': checked, 'metadata': metadata}
+
+    def _merge(self, current: Any) -> Dict:
+        """文件中其他进程写入的组件保留，本进程重新扫描或删除过的组件以本进程为准"""
+        if not isinstance(current, dict) or current.get('root') != self.root \
+                or not isinstance(current.get('groups'), dict):
+            return self._index
+        groups = current['groups']
+        for group_id, artifact_id in self._changed:
+            entry = self._index['groups'].get(group_id, {}).get(artifact_id)
+            group = groups.setdefault(group_id, {})
+            if entry is None:
+                group.pop(artifact_id, None)
+            else:
+                group[artifact_id] = entry
+        return current
+
+    def flush(self):
+        """与索引文件的当前内容合并后写回"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._index = _merge_into_file(self.index_path, self._merge, separators=(',', ':'))
+                self._changed.clear()
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️  写入本地仓库索引失败: {e}", file=sys.stderr)
+
+
+# Maven ComparableVersion 的限定符顺序："" 表示正式版（ga/final/release）
+_QUALIFIERS = ('alpha', 'beta', 'milestone', 'rc', 'snapshot', '', 'sp')
+_QUALIFIER_ALIASES = {'ga': '', 'final': '', 'release': '', 'cr': 'rc'}
+_RELEASE_INDEX = str(_QUALIFIERS.index(''))
+# 预发布限定符（不含 snapshot）
+_PRERELEASE_QUALIFIERS = frozenset(('alpha', 'beta', 'milestone', 'rc'))
+
+# 解析后的版本项类型
+_INT, _STRING, _LIST = 0, 1, 2
+
+
+def _comparable_qualifier(qualifier: str) -> str:
+    """限定符的可比较形式：已知限定符为其序号，未知限定符排在所有已知限定符之后按字母序"""
+    if qualifier in _QUALIFIERS:
+        return str(_QUALIFIERS.index(qualifier))
+    return f"{len(_QUALIFIERS)}-{qualifier}"
+
+
+def _string_item(value: str, followed_by_digit: bool) -> Tuple[int, str, str]:
+    if followed_by_digit and len(value) == 1:
+        # 1.0a1 / 1.0b2 / 1.0m3 这类简写
+        value = {'a': 'alpha', 'b': 'beta', 'm': 'milestone'}.get(value, value)
+    value = _QUALIFIER_ALIASES.get(value, value)
+    return (_STRING, value, _comparable_qualifier(value))
+
+
+def _parse_item(is_digit: bool, buf: str) -> Tuple:
+    return (_INT, int(buf)) if is_digit else _string_item(buf, False)
+
+
+def _is_null(item: Tuple) -> bool:
+    if item[0] == _INT:
+        return item[1] == 0
+    if item[0] == _STRING:
+        return item[2] == _RELEASE_INDEX
+    return not item[1]
+
+
+def _normalize(items: List[Tuple]):
+    """去掉末尾的空项（0、正式版限定符、空列表），与 ComparableVersion.ListItem.normalize 一致"""
+    for i in range(len(items) - 1, -1, -1):
+        if _is_null(items[i]):
+            del items[i]
+        elif items[i][0] != _LIST:
+            break
+
+
+def _parse_version(version: str) -> Tuple:
+    """按 Maven ComparableVersion 规则把版本号解析为嵌套的版本项"""
+    version = version.lower()
+    items: List[Tuple] = []
+    root = (_LIST, items)
+    stack = [items]
+    is_digit = False
+    start = 0
+
+    def push_list():
+        nonlocal items
+        sub_items: List[Tuple] = []
+        items.append((_LIST, sub_items))
+        items = sub_items
+        stack.append(items)
+
+    for i, c in enumerate(version):
+        if c == '.':
+            items.append((_INT, 0) if i == start else _parse_item(is_digit, version[start:i]))
+            start = i + 1
+        elif c == '-':
+            items.append((_INT, 0) if i == start else _parse_item(is_digit, version[start:i]))
+            start = i + 1
+            push_list()
+        elif c.isdigit():
+            if not is_digit and i > start:
+                items.append(_string_item(version[start:i], True))
+                start = i
+                push_list()
+            is_digit = True
+        else:
+            if is_digit and i > start:
+                items.append(_parse_item(True, version[start:i]))
+                start = i
+                push_list()
+            is_digit = False
+
+    if len(version) > start:
+        items.append(_parse_item(is_digit, version[start:]))
+
+    while stack:
+        _normalize(stack.pop())
+    return root
+
+
+def _compare_items(left: Optional[Tuple], right: Optional[Tuple]) -> int:
+    """比较两个版本项，None 表示缺失项（视为 0 / 正式版 / 空列表）"""
+    if left is None:
+        return 0 if right is None else -_compare_items(right, None)
+
+    kind = left[0]
+    if right is None:
+        if kind == _INT:
+            return 1 if left[1] else 0
+        if kind == _STRING:
+            return (left[2] > _RELEASE_INDEX) - (left[2] < _RELEASE_INDEX)
+        return _compare_items(left[1][0], None) if left[1] else 0
+
+    other = right[0]
+    if kind == _INT:
+        if other == _INT:
+            return (left[1] > right[1]) - (left[1] < right[1])
+        return 1
+    if kind == _STRING:
+        if other == _STRING:
+            return (left[2] > right[2]) - (left[2] < right[2])
+        return -1
+    # kind == _LIST
+    if other == _INT:
+        return -1
+    if other == _STRING:
+        return 1
+    left_items, right_items = left[1], right[1]
+    for i in range(max(len(left_items), len(right_items))):
+        result = _compare_items(
+            left_items[i] if i < len(left_items) else None,
+            right_items[i] if i < len(right_items) else None
+        )
+        if result:
+            return result
+    return 0
+
+
+def _has_qualifier(item: Tuple, qualifiers) -> bool:
+    if item[0] == _STRING:
+        return item[1] in qualifiers
+    if item[0] == _LIST:
+        return any(_has_qualifier(sub_item, qualifiers) for sub_item in item[1])
+    return False
+
+
+@functools.total_ordering
+class VersionKey:
+    """
+    Maven 版本号的排序键
+
+    语义与 Maven 的 ComparableVersion 一致：1.10.0 > 1.9.0，3.0.0-M1 < 3.0.0-RC1 < 3.0.0，
+    2.0.7-SNAPSHOT < 2.0.7，1.0.0.RELEASE == 1.0.0。版本号只解析一次，可直接用于 max()/sorted()。
+    """
+
+    __slots__ = ('version', '_items')
+
+    def __init__(self, version: str):
+        self.version = version
+        self._items = _parse_version(version)
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionKey):
+            return NotImplemented
+        return _compare_items(self._items, other._items) == 0
+
+    def __lt__(self, other):
+        if not isinstance(other, VersionKey):
+            return NotImplemented
+        return _compare_items(self._items, other._items) < 0
+
+    def __hash__(self):
+        return hash(self.canonical)
+
+    def __repr__(self):
+        return f"VersionKey({self.version!r})"
+
+    @property
+    def canonical(self) -> str:
+        """规范化形式，相等的版本号规范化形式相同"""
+        def render(items):
+            parts = []
+            for i, item in enumerate(items):
+                if i > 0:
+                    parts.append('-' if item[0] == _LIST else '.')
+                parts.append(str(item[1]) if item[0] != _LIST else render(item[1]))
+            return ''.join(parts)
+        return render(self._items[1])
+
+    @property
+    def is_snapshot(self) -> bool:
+        """是否为快照版本"""
+        return _has_qualifier(self._items, ('snapshot',))
+
+    @property
+    def is_prerelease(self) -> bool:
+        """是否为预发布版本（alpha/beta/milestone/rc）"""
+        return _has_qualifier(self._items, _PRERELEASE_QUALIFIERS)
+
+
+@functools.lru_cache(maxsize=4096)
+def version_key(version: str) -> VersionKey:
+    """获取版本号的排序键（带缓存，同一版本号只解析一次）"""
+    return VersionKey(version)
+
+
+def latest_version(versions, include_prereleases: bool = False,
+                   include_snapshots: bool = False) -> Optional[str]:
+    """
+    单次遍历取最新版本
+
+    Args:
+        versions: 版本号可迭代对象
+        include_prereleases: 是否包含 alpha/beta/milestone/rc 版本
+        include_snapshots: 是否包含 SNAPSHOT 版本
+
+    Returns:
+        最新的版本号，没有符合条件的版本时为 None
+    """
+    best = None
+    for version in versions:
+        if not version:
+            continue
+        key = version_key(version)
+        if not include_snapshots and key.is_snapshot:
+            continue
+        if not include_prereleases and key.is_prerelease:
+            continue
+        if best is None or key > best:
+            best = key
+    return best.version if best else None
+
+
+class QueryCancelled(Exception):
+    """竞速模式下其他仓库已返回结果，当前查询被取消"""
+
+
+class DeadlineExceeded(Exception):
+    """查询超出了总时间预算"""
+
+
+class RetryPolicy:
+    """
+    重试与超时策略
+
+    每个组件（组件组、POM）的查询各有一个总时间预算（deadline），依次尝试多个仓库时为每个尚未尝试的仓库
+    预留一份剩余预算；每次请求的超时取单次超时与当前可用预算中的较小值；
+    只对连接错误、超时、429 和 5xx 重试，退避时间为全抖动指数退避，并遵守 Retry-After。
+    """
+
+    RETRYABLE_STATUS = frozenset((429, 500, 502, 503, 504))
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 10.0,
+                 attempt_timeout: float = 30.0, deadline: Optional[float] = 60.0):
+        """
+        Args:
+            max_attempts: 每个请求的最大尝试次数（含首次）
+            base_delay: 退避基准时间（秒）
+            max_delay: 单次退避的上限（秒）
+            attempt_timeout: 单次请求的超时上限（秒）
+            deadline: 每个组件查询的总时间预算（秒），None 表示不限制
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """第 attempt 次失败后的等待时间：服务端给出 Retry-After 时以其为准，否则为全抖动退避"""
+        if retry_after is not None:
+            return retry_after
+        import random
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """解析 Retry-After 头（秒数或 HTTP 日期）"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        import email.utils
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+
+class CacheMiss(Exception):
+    """仅查缓存时未命中未过期的条目"""
+
+
+class ResponseCache:
+    """
+    查询结果的本地磁盘缓存
+
+    以 JSON 文件保存在 $XDG_CACHE_HOME/jdevelops-skill/ 下，按仓库地址 + 查询参数
+    （即仓库、groupId、artifactId）索引，并记录 ETag/Last-Modified 用于条件请求。
+    """
+
+    # 默认缓存有效期：6 小时
+    DEFAULT_TTL = 6 * 3600
+    # 超过该时间未更新的条目在保存时清理
+    MAX_AGE = 30 * 24 * 3600
+
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_TTL, persist: bool = True):
+        """
+        初始化缓存
+
+        Args:
+            path: 缓存文件路径，默认为 $XDG_CACHE_HOME/jdevelops-skill/query_versions.json
+            ttl: 缓存有效期（秒）
+            persist: 为 False 时只保存在内存中（不读取也不写入缓存文件）
+        """
+        self.path = path or os.path.join(self.default_dir(), 'query_versions.json')
+        self.ttl = ttl
+        self._entries = None if persist else {}
+        self.persist = persist
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_dir() -> str:
+        """缓存目录，遵循 XDG 规范"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'jdevelops-skill')
+
+    @staticmethod
+    def make_key(api_url: str, params: Dict) -> str:
+        """由接口地址和查询参数生成缓存键"""
+        query = '&'.join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{api_url}?{query}"
+
+    def _load(self) -> Dict:
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        """读取缓存条目（无论是否过期）"""
+        with self._lock:
+            return self._load().get(key)
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """条目是否仍在有效期内"""
+        return time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def put(self, key: str, data: Any, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """写入缓存条目"""
+        with self._lock:
+            self._load()[key] = {
+                'data': data,
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': time.time()
+            }
+            self._dirty = True
+
+    def touch(self, key: str):
+        """条件请求返回 304 后刷新条目的获取时间"""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry:
+                entry['fetched_at'] = time.time()
+                self._dirty = True
+
+    def _merge(self, current: Any) -> Dict:
+        """逐个键取 fetched_at 较新的条目，并清理过旧的条目"""
+        merged = current if isinstance(current, dict) else {}
+        for key, entry in self._entries.items():
+            other = merged.get(key)
+            if not isinstance(other, dict) or entry.get('fetched_at', 0) > other.get('fetched_at', 0):
+                merged[key] = entry
+        now = time.time()
+        return {
+            k: v for k, v in merged.items()
+            if isinstance(v, dict) and now - v.get('fetched_at', 0) < self.MAX_AGE
+        }
+
+    def flush(self):
+        """
+        将缓存写回磁盘
+
+        在文件锁内与其他进程已写入的条目合并，先写临时文件再替换，避免并发进程读到半个文件
+        """
+        with self._lock:
+            if not self._dirty or not self.persist:
+                return
+            try:
+                self._entries = _merge_into_file(self.path, self._merge)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️  写入缓存失败: {e}", file=sys.stderr)
+
+
+class PomStore:
+    """
+    已发布 POM 文件的磁盘缓存
+
+    按 Maven 仓库布局保存在 $XDG_CACHE_HOME/jdevelops-skill/poms/ 下。
+    已发布版本的 POM 内容不会再变化，因此不设有效期、也不做条件请求；SNAPSHOT 版本不缓存。
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: 缓存目录，默认为 $XDG_CACHE_HOME/jdevelops-skill/poms
+        """
+        self.root = root or os.path.join(ResponseCache.default_dir(), 'poms')
+
+    def path(self, group_id: str, artifact_id: str, version: str) -> str:
+        """POM 文件在缓存目录中的路径"""
+        return os.path.join(self.root, *group_id.split('.'), artifact_id, version, f"{artifact_id}-{version}.pom")
+
+    def get(self, group_id: str, artifact_id: str, version: str) -> Optional[bytes]:
+        """读取缓存的 POM，不存在时返回 None"""
+        try:
+            with open(self.path(group_id, artifact_id, version), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, group_id: str, artifact_id: str, version: str, content: bytes):
+        """保存 POM（先写临时文件再替换，并发写入同一文件也是安全的）"""
+        if version.upper().endswith('SNAPSHOT'):
+            return
+        path = self.path(group_id, artifact_id, version)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  写入 POM 缓存失败: {e}", file=sys.stderr)
+
+
+# 常驻服务：空闲多久后退出（秒）、客户端连接超时（秒）
+DAEMON_IDLE_TIMEOUT = 30 * 60
+DAEMON_CONNECT_TIMEOUT = 0.5
+# 常驻服务最多保留的查询器数量，超过后丢弃最早创建的（环境或 settings.xml 变化后旧的查询器不再使用）
+DAEMON_MAX_CHECKERS = 8
+
+# 影响查询结果的环境变量：常驻服务按客户端的取值复用查询器（仓库、代理、证书、缓存和状态目录）
+DAEMON_ENV = (
+    'HOME', 'JDEVELOPS_MAVEN_REPOS',
+    'HTTP_PROXY', 'HTTPS_PROXY', 'NO_PROXY', 'ALL_PROXY', 'http_proxy', 'https_proxy', 'no_proxy', 'all_proxy',
+    'REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE', 'SSL_CERT_FILE', 'SSL_CERT_DIR',
+    'XDG_CACHE_HOME', 'XDG_STATE_HOME', 'XDG_RUNTIME_DIR'
+)
+
+
+class JDevelopsVersionChecker:
+    """JDevelops 版本查询器"""
+
+    # Maven 仓库配置（按优先级排序）
+    # maven_metadata 类型直接读取 maven-metadata.xml，体积小、有 CDN 缓存且与发布同步，
+    # 但无法列出 groupId 下的组件，查询组件组时跳过
+    MAVEN_REPOS = [
+        {
+            'name': 'Maven Central Repository',
+            'base_url': 'https://repo1.maven.org/maven2',
+            'type': 'maven_metadata'
+        },
+        {
+            'name': 'Aliyun Maven Repository',
+            'base_url': 'https://maven.aliyun.com/repository/public',
+            'type': 'maven_metadata'
+        },
+        {
+            'name': 'Maven Central',
+            'search_api': 'https://search.maven.org/solrsearch/select',
+            'type': 'maven_central'
+        },
+        {
+            'name': 'Aliyun Maven Mirror',
+            'search_api': 'https://maven.aliyun.com/nexus/service/local/lucene/search',
+            'type': 'nexus'
+        },
+    ]
+
+    # 支持按 groupId 列出组件的仓库类型
+    GROUP_SEARCH_TYPES = ('maven_central', 'nexus')
+
+    # 仓库延迟探测：单个请求的超时（秒）、探测结果的有效期（秒）
+    PROBE_TIMEOUT = 2.0
+    PROBE_TTL = 3600
+
+    def __init__(self, verbose: bool = False, proxy: Optional[str] = None, race: bool = False,
+                 cache: Optional[ResponseCache] = None, refresh: bool = False, page_workers: int = 4,
+                 include_prereleases: bool = False, include_snapshots: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None, health: Optional[RepoHealth] = None,
+                 source: str = 'remote', local_index: Optional[LocalRepoIndex] = None,
+                 local_max_age: int = 24 * 3600, pom_store: Optional[PomStore] = None,
+                 settings: Optional['MavenSettings'] = None, metrics: Optional['RequestMetrics'] = None):
+        """
+        初始化版本查询器
+
+        Args:
+            verbose: 是否显示详细日志
+            proxy: 代理服务器地址，如 'http://127.0.0.1:7890'
+            race: 是否并发查询所有仓库，采用最先返回的有效结果
+            cache: 本地响应缓存，为 None 时不使用缓存
+            refresh: 忽略缓存有效期，强制向仓库重新验证
+            page_workers: 分页查询时并发获取的页数
+            include_prereleases: 最新版本是否包含 alpha/beta/milestone/rc 版本
+            include_snapshots: 最新版本是否包含 SNAPSHOT 版本
+            retry_policy: 重试与超时策略，默认为 RetryPolicy()
+            health: 仓库健康度记分板，为 None 时按 MAVEN_REPOS 的固定顺序查询
+            source: 查询来源：remote（远程仓库）、local（仅本地 ~/.m2）、
+                auto（Maven 从远程刷新本地元数据不超过 local_max_age 时直接使用本地信息，否则查询远程）
+            local_index: 本地仓库索引，默认为 LocalRepoIndex()；任何来源下都用于读取本地已有的 POM
+            local_max_age: auto 模式下本地元数据距最近一次从远程刷新的最大可接受时长（秒）
+            pom_store: POM 文件的磁盘缓存，为 None 时每次都从仓库下载
+            settings: settings.xml 和环境变量中的仓库、代理和账号配置（见 maven_settings.load_settings）
+            metrics: 请求埋点，为 None 时不记录（见 request_metrics.RequestMetrics）
+        """
+        self.verbose = verbose
+        self.race = race
+        self.cache = cache
+        self.refresh = refresh
+        self.page_workers = max(1, page_workers)
+        self.include_prereleases = include_prereleases
+        self.include_snapshots = include_snapshots
+        self.retry_policy = retry_policy or RetryPolicy()
+        if cache is not None:
+            atexit.register(cache.flush)
+        self.health = health
+        if health is not None:
+            atexit.register(health.flush)
+        self.source = source
+        self.local_max_age = local_max_age
+        # 发布后的 POM 不会变化，任何来源下都先读本地仓库；版本信息只在 local/auto 模式下使用本地仓库
+        self.local_index = local_index or LocalRepoIndex()
+        atexit.register(self.local_index.flush)
+        self.pom_store = pom_store
+        # settings.xml 和环境变量中配置的仓库（通常是更近的内部镜像）排在内置仓库之前
+        self.settings = settings
+        if settings is not None and settings.repos:
+            configured = {repo['base_url'] for repo in settings.repos}
+            self.MAVEN_REPOS = settings.repos + [r for r in self.MAVEN_REPOS if r.get('base_url') not in configured]
+        self._probed = set()
+        self._probe_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self.metrics = metrics
+        if metrics is not None:
+            atexit.register(metrics.close)
+        # 每个线程各自持有竞速取消标志、仅缓存标志和当前查询的截止时间
+        self._local = threading.local()
+        # HTTP 会话在第一次发起网络请求时才创建（届时才导入 requests）
+        self.proxy = proxy
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._pool_size = None
+
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP 会话（首次访问时创建）"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> 'requests.Session':
+        import requests
+
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'JDevelops-Version-Checker/2.0'
+        })
+        if self._pool_size or self.metrics is not None:
+            self._mount_adapters(session, self._pool_size or 0)
+
+        # 设置代理
+        if self.proxy:
+            session.proxies.update({
+                'http': self.proxy,
+                'https': self.proxy
+            })
+            self._log(f"✅ 使用代理: {self.proxy}")
+
+        # settings.xml 中激活的代理
+        elif self.settings is not None and self.settings.proxies:
+            session.proxies.update(self.settings.proxies)
+            self._log("✅ 使用 settings.xml 中的代理")
+
+        # 从环境变量读取代理
+        elif os.environ.get('HTTP_PROXY') or os.environ.get('HTTPS_PROXY'):
+            http_proxy = os.environ.get('HTTP_PROXY', os.environ.get('http_proxy'))
+            https_proxy = os.environ.get('HTTPS_PROXY', os.environ.get('https_proxy'))
+            if http_proxy:
+                session.proxies['http'] = http_proxy
+            if https_proxy:
+                session.proxies['https'] = https_proxy
+            self._log(f"✅ 使用环境变量代理")
+        return session
+
+    def flush(self):
+        """把缓存、健康度、本地仓库索引和指标写回磁盘"""
+        for state in (self.cache, self.health, self.local_index, self.metrics):
+            if state is not None:
+                state.flush()
+
+    def _log(self, message: str, force: bool = False):
+        """输出日志（多个工作线程同时输出时整行写出，不会交错）"""
+        if self.verbose or force:
+            with self._log_lock:
+                sys.stderr.write(message + '\n')
+                sys.stderr.flush()
+
+    def _check_cancelled(self):
+        """竞速模式下若已有仓库胜出，则终止当前查询"""
+        cancel = getattr(self._local, 'cancel', None)
+        if cancel is not None and cancel.is_set():
+            raise QueryCancelled()
+
+    def _start_deadline(self):
+        """在当前线程开始一次查询的时间预算"""
+        deadline = self.retry_policy.deadline
+        self._local.deadline_at = time.monotonic() + deadline if deadline else None
+
+    def _remaining(self) -> float:
+        """当前线程的查询剩余的时间预算（秒）"""
+        deadline_at = getattr(self._local, 'deadline_at', None)
+        if deadline_at is None:
+            return float('inf')
+        return deadline_at - time.monotonic()
+
+    def _check_deadline(self):
+        """预算耗尽时抛出 DeadlineExceeded"""
+        if self._remaining() <= 0:
+            raise DeadlineExceeded(f"超出总时间预算 {self.retry_policy.deadline} 秒")
+
+    def _attempt_timeout(self) -> float:
+        """本次请求的超时时间：不超过剩余预算"""
+        self._check_deadline()
+        return min(self.retry_policy.attempt_timeout, self._remaining())
+
+    def _sleep(self, seconds: float):
+        """可被竞速取消打断的等待"""
+        cancel = getattr(self._local, 'cancel', None)
+        if cancel is None:
+            time.sleep(seconds)
+        elif cancel.wait(seconds):
+            raise QueryCancelled()
+
+    def _query_repos(self, query: Callable[[Dict], Any],
+                     repos: Optional[List[Dict]] = None) -> Tuple[Optional[Dict], Any]:
+        """
+        在所有仓库上执行查询
+
+        默认按优先级依次尝试；竞速模式下并发查询所有仓库。
+        启用健康度记分板时，按历史延迟和成功率排序仓库，并跳过熔断中的仓库。
+
+        Args:
+            query: 接收仓库配置并返回结果的函数，返回空值表示未找到
+            repos: 参与查询的仓库，默认为 MAVEN_REPOS
+
+        Returns:
+            (命中的仓库, 查询结果)，全部失败时为 (None, None)
+
+        Raises:
+            DeadlineExceeded: 没有仓库返回结果且时间预算已耗尽（此时无法确定结果是否存在）
+        """
+        if repos is None:
+            repos = self.MAVEN_REPOS
+
+        if self.cache is not None and not self.refresh:
+            repo, result = self._query_cached(query, repos)
+            if result:
+                return repo, result
+
+        if self.health is not None:
+            self._probe_repos(repos)
+            ordered = self.health.order(repos)
+            skipped = [repo['name'] for repo in repos if repo not in ordered]
+            if skipped:
+                self._log(f"🚧 熔断中，跳过仓库: {', '.join(skipped)}")
+            repos = ordered
+
+        if self.race and len(repos) > 1:
+            repo, result = self._race_repos(query, repos)
+            if not result:
+                self._check_deadline()
+            return repo, result
+
+        deadline_at = getattr(self._local, 'deadline_at', None)
+        for index, repo in enumerate(repos):
+            if self._remaining() <= 0:
+                break
+            self._log(f"📡 尝试仓库: {repo['name']}")
+
+            # 剩余预算平分给尚未尝试的仓库：一个慢仓库（连同它的重试）最多用掉自己那一份，
+            # 不会让后面的仓库还没尝试就超时；先结束的仓库省下的时间留给后面的仓库
+            if deadline_at is not None:
+                self._local.deadline_at = time.monotonic() + self._remaining() / (len(repos) - index)
+            try:
+                result = self._timed_query(query, repo)
+                if result:
+                    return repo, result
+                else:
+                    self._log(f"⚠️  {repo['name']} 未找到结果，尝试下一个仓库")
+            except Exception as e:
+                self._log(f"❌ {repo['name']} 查询失败: {e}")
+                continue
+            finally:
+                self._local.deadline_at = deadline_at
+
+        self._check_deadline()
+        return None, None
+
+    def _request_options(self, url: str) -> Dict:
+        """按 settings.xml 为请求设置 Basic 认证，并让 nonProxyHosts 中的主机绕过代理"""
+        options = {}
+        if self.settings is None:
+            return options
+        for base_url, auth in self.settings.credentials.items():
+            if url == base_url or url.startswith(base_url + '/'):
+                options['auth'] = auth
+                break
+        if self.settings.non_proxy_hosts and not self.proxy and self.settings.proxies:
+            from urllib.parse import urlsplit
+
+            if self.settings.bypass_proxy(urlsplit(url).hostname or ''):
+                # 值为 None 的键会覆盖掉 Session 上的代理设置
+                options['proxies'] = {'http': None, 'https': None}
+        return options
+
+    def _repo_of(self, url: str) -> str:
+        """请求地址所属的仓库名称（用于埋点），不属于已配置仓库时为主机名"""
+        for repo in self.MAVEN_REPOS:
+            base_url = repo.get('base_url') or repo.get('search_api')
+            if url.startswith(base_url):
+                return repo['name']
+        from urllib.parse import urlsplit
+
+        return urlsplit(url).hostname or url
+
+    def _probe_repos(self, repos: List[Dict]):
+        """
+        首次联网前并发探测各仓库的延迟
+
+        对每个仓库发一个 HEAD 请求（任何非 5xx 响应都算可用），结果计入健康度记分板，
+        之后的查询按得分优先路由到最快的可用仓库；探测结果在 PROBE_TTL 内有效，期间不再探测。
+        """
+        if len(repos) < 2:
+            return
+        # 持有锁完成探测，并发的查询等待探测结果后再排序
+        with self._probe_lock:
+            now = time.time()
+            stale = [
+                repo for repo in repos
+                if repo['name'] not in self._probed and now - self.health.probed_at(repo['name']) >= self.PROBE_TTL
+            ]
+            self._probed.update(repo['name'] for repo in repos)
+            if not stale:
+                return
+
+            def probe(repo: Dict):
+                url = repo.get('base_url') or repo['search_api']
+                started = time.monotonic()
+                try:
+                    response = self.session.head(url + ('/' if 'base_url' in repo else ''),
+                                                 timeout=self.PROBE_TIMEOUT, allow_redirects=False,
+                                                 **self._request_options(url))
+                    response.close()
+                    ok = response.status_code < 500
+                except Exception:
+                    ok = False
+                latency = time.monotonic() - started
+                self.health.record(repo['name'], ok, latency, probe=True)
+                return f"📶 探测 {repo['name']}: {latency * 1000:.0f} ms{'' if ok else ' (不可用)'}"
+
+            self._log(f"📶 探测 {len(stale)} 个仓库的延迟...")
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=len(stale), thread_name_prefix='probe') as executor:
+                for message in executor.map(probe, stale):
+                    self._log(message)
+
+    def _timed_query(self, query: Callable[[Dict], Any], repo: Dict) -> Any:
+        """执行查询并把耗时和成败记入健康度记分板（被取消的查询不计入）"""
+        if self.health is None:
+            return query(repo)
+
+        started = time.monotonic()
+        try:
+            result = query(repo)
+        except (QueryCancelled, DeadlineExceeded):
+            # 预算被之前的仓库耗尽或被竞速取消，不代表本仓库不健康
+            raise
+        except Exception:
+            self.health.record(repo['name'], False, time.monotonic() - started)
+            raise
+        self.health.record(repo['name'], True, time.monotonic() - started)
+        return result
+
+    def _query_cached(self, query: Callable[[Dict], Any], repos: List[Dict]) -> Tuple[Optional[Dict], Any]:
+        """只查本地缓存：任一仓库有未过期的结果即可直接返回，无需联网"""
+        self._local.cache_only = True
+        try:
+            for repo in repos:
+                try:
+                    result = query(repo)
+                except CacheMiss:
+                    continue
+                if result:
+                    self._log(f"💾 使用 {repo['name']} 的本地缓存")
+                    return repo, result
+        finally:
+            self._local.cache_only = False
+        return None, None
+
+    def _race_repos(self, query: Callable[[Dict], Any], repos: List[Dict]) -> Tuple[Optional[Dict], Any]:
+        """并发查询所有仓库，返回最先得到的有效结果并取消其余查询"""
+        results = queue.Queue()
+        cancel = threading.Event()
+        # 竞速线程共用调用方的时间预算
+        deadline_at = getattr(self._local, 'deadline_at', None)
+
+        def worker(repo: Dict):
+            self._local.cancel = cancel
+            self._local.deadline_at = deadline_at
+            try:
+                results.put((repo, self._timed_query(query, repo), None))
+            except Exception as e:
+                results.put((repo, None, e))
+
+        # 使用守护线程：胜出后无需等待慢仓库的请求结束即可退出进程
+        for repo in repos:
+            self._log(f"📡 并发查询仓库: {repo['name']}")
+            threading.Thread(target=worker, args=(repo,), name=f"race-{repo['type']}", daemon=True).start()
+
+        try:
+            for _ in repos:
+                repo, result, error = results.get()
+                if error is not None:
+                    self._log(f"❌ {repo['name']} 查询失败: {error}")
+                elif result:
+                    self._log(f"🏁 {repo['name']} 最先返回结果，取消其余查询")
+                    return repo, result
+                else:
+                    self._log(f"⚠️  {repo['name']} 未找到结果")
+        finally:
+            cancel.set()
+
+        return None, None
+
+    def search_group(self, group_id: str = "cn.tannn.jdevelops", rows: int = 100) -> List[Dict]:
+        """
+        搜索指定 groupId 下的所有组件
+
+        Args:
+            group_id: Maven groupId，默认为 cn.tannn.jdevelops
+            rows: 每页结果数量，默认 100（会自动分页获取全部结果）
+
+        Returns:
+            组件列表，每个组件包含 artifactId 和最新版本信息
+        """
+        result = self._search_group(group_id, rows)
+        if not result:
+            self._print_group_failure(group_id)
+        return result
+
+    def search_groups(self, group_ids: List[str], rows: int = 100) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        并发搜索多个 groupId，每个 groupId 查询完成后立即产出结果
+
+        所有 groupId 共享同一个 Session，各自有独立的时间预算，调用方可以边接收边输出，无需等待全部完成。
+
+        Args:
+            group_ids: Maven groupId 列表
+            rows: 每页结果数量
+
+        Yields:
+            (groupId, 组件列表)，按完成先后顺序；查询失败的 groupId 对应空列表
+        """
+        group_ids = list(dict.fromkeys(group_ids))
+        if len(group_ids) == 1:
+            result = self._search_group(group_ids[0], rows)
+            if not result:
+                self._print_group_failure(group_ids[0])
+            yield group_ids[0], result
+            return
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        # 每个 groupId 的分页查询各自还会并发获取 page_workers 页
+        self._resize_pool(len(group_ids) * self.page_workers * (len(self.MAVEN_REPOS) if self.race else 1))
+        failed = []
+        with ThreadPoolExecutor(max_workers=len(group_ids), thread_name_prefix='group') as executor:
+            futures = {executor.submit(self._search_group, g, rows): g for g in group_ids}
+            for future in as_completed(futures):
+                group_id = futures[future]
+                result = future.result()
+                if not result:
+                    failed.append(group_id)
+                yield group_id, result
+        if failed:
+            self._print_group_failure(', '.join(failed))
+
+    def _search_group(self, group_id: str, rows: int) -> List[Dict]:
+        """依次从远程仓库和本地仓库查询组件组（有独立的时间预算），全部失败时返回空列表"""
+        self._log(f"🔍 开始查询 groupId: {group_id}")
+        self._start_deadline()
+
+        # 本地仓库只包含下载过的组件，无法得到完整列表：auto 模式下仍以远程为准，远程失败时再用本地
+        if self.source != 'local':
+            repos = [r for r in self.MAVEN_REPOS if r['type'] in self.GROUP_SEARCH_TYPES]
+            try:
+                repo, result = self._query_repos(lambda r: self._search_group_from_repo(r, group_id, rows), repos)
+            except DeadlineExceeded as e:
+                self._log(f"⏱️  查询 {group_id} 超时: {e}", force=True)
+                repo, result = None, None
+            if result:
+                self._log(f"✅ 从 {repo['name']} 查询 {group_id} 成功，找到 {len(result)} 个组件", force=True)
+                return result
+
+        if self.source != 'remote':
+            result = self._search_local_group(group_id)
+            if result:
+                self._log(f"✅ 从本地仓库 {self.local_index.root} 找到 {len(result)} 个组件", force=True)
+                return result
+        return []
+
+    @staticmethod
+    def _print_group_failure(group_id: str):
+        """所有仓库都查询失败时输出可能的原因和解决方案"""
+        print(f"❌ 所有 Maven 仓库都查询失败: {group_id}", file=sys.stderr)
+        print("💡 可能的原因:", file=sys.stderr)
+        print("   1. 网络连接问题（尝试检查网络或使用代理）", file=sys.stderr)
+        print("   2. Maven 仓库暂时不可用", file=sys.stderr)
+        print("   3. 组件 groupId 不存在", file=sys.stderr)
+        print("\n💡 解决方案:", file=sys.stderr)
+        print("   - 使用 -v 参数查看详细日志: python query_versions.py -v", file=sys.stderr)
+        print("   - 设置代理: python query_versions.py --proxy http://127.0.0.1:7890", file=sys.stderr)
+        print("   - 或设置环境变量: export HTTP_PROXY=http://127.0.0.1:7890", file=sys.stderr)
+
+    def _search_group_from_repo(self, repo: Dict, group_id: str, rows: int) -> List[Dict]:
+        """从指定仓库查询组件组"""
+        if repo['type'] == 'maven_central':
+            return self._search_maven_central_group(repo['search_api'], group_id, rows)
+        elif repo['type'] == 'nexus':
+            return self._search_nexus_group(repo['search_api'], group_id, rows)
+        return []
+
+    def _get_json(self, api_url: str, params: Dict) -> Dict:
+        """发送 GET 请求并解析 JSON 响应（带重试和本地缓存）"""
+        return self._fetch(api_url, params, self._parse_json)
+
+    def _parse_json(self, response: 'requests.Response') -> Dict:
+        """解析 JSON 响应"""
+        return response.json()
+
+    def _fetch(self, api_url: str, params: Dict, parse: Callable[['requests.Response'], Any],
+               missing_ok: bool = False, stream: bool = False, use_cache: bool = True) -> Any:
+        """
+        发送 GET 请求并解析响应（带重试和本地缓存）
+
+        未过期的缓存直接返回；过期条目携带 ETag/Last-Modified 发起条件请求，
+        服务端返回 304 时复用缓存内容；网络不可用时退回到过期缓存。
+
+        Args:
+            api_url: 请求地址
+            params: 查询参数
+            parse: 将响应解析为可 JSON 序列化数据的函数，结果会写入缓存
+            missing_ok: 为 True 时 404 返回 None 而不是报错
+            stream: 是否以流式方式读取响应体
+            use_cache: 为 False 时不读写响应缓存（由调用方自行缓存的大响应）
+
+        Returns:
+            解析后的数据
+        """
+        cache = self.cache if use_cache else None
+        key = ResponseCache.make_key(api_url, params)
+        entry = cache.get(key) if cache else None
+
+        if entry and not self.refresh and cache.is_fresh(entry):
+            self._log("💾 命中本地缓存")
+            if self.metrics is not None:
+                self.metrics.cache_hit(api_url, self._repo_of(api_url))
+            return entry['data']
+        if getattr(self._local, 'cache_only', False):
+            raise CacheMiss(key)
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        # 确定需要联网后才导入网络相关模块
+        import requests
+        import xml.etree.ElementTree as ET
+
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            self._check_cancelled()
+            attempt += 1
+            retry_after = None
+            response = None
+            error = None
+            span = None
+            if metrics is not None:
+                cache_state = None if cache is None else ('revalidate' if entry else 'miss')
+                span = metrics.begin(api_url, self._repo_of(api_url), attempt, cache_state)
+            try:
+                try:
+                    response = self.session.get(
+                        api_url,
+                        params=params,
+                        headers=headers,
+                        timeout=self._attempt_timeout(),
+                        stream=stream,
+                        verify=True,  # 验证 SSL 证书
+                        **self._request_options(api_url)
+                    )
+                except requests.exceptions.SSLError as e:
+                    # 证书问题重试也无法恢复
+                    self._log(f"🔒 SSL 证书验证失败: {e}")
+                    raise
+                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                    if isinstance(e, requests.exceptions.Timeout):
+                        self._log(f"⏱️  请求超时: {e}")
+                    else:
+                        self._log(f"🔌 连接错误: {e}")
+                    error = e
+                    if entry:
+                        # 离线时使用过期缓存，不再重试
+                        self._log("📴 网络不可用，使用过期的本地缓存")
+                        if span is not None:
+                            span['cache'] = 'stale'
+                        return entry['data']
+                else:
+                    self._log(f"📊 HTTP 状态码: {response.status_code}")
+                    if self.verbose and response.headers.get('Content-Length'):
+                        self._log(f"📦 响应数据大小: {response.headers['Content-Length']} 字节")
+                    if response.status_code == 304 and entry:
+                        self._log("💾 缓存未变化 (304)，继续使用本地缓存")
+                        # 流式响应不读完响应体就不会归还连接
+                        response.close()
+                        cache.touch(key)
+                        return entry['data']
+                    if response.status_code == 404 and missing_ok:
+                        response.close()
+                        return None
+
+                    if response.status_code in self.retry_policy.RETRYABLE_STATUS:
+                        retry_after = self.retry_policy.parse_retry_after(response.headers.get('Retry-After'))
+                        error = requests.exceptions.HTTPError(
+                            f"{response.status_code} {response.reason} for url: {response.url}", response=response
+                        )
+                        response.close()
+                        self._log(f"⚠️  HTTP 请求错误: {error}")
+                    else:
+                        # 其余 4xx 等错误重试无意义，立即失败
+                        response.raise_for_status()
+
+                        try:
+                            with response:
+                                data = parse(response)
+                        except ET.ParseError as e:
+                            self._log(f"📄 XML 解析错误: {e}")
+                            raise
+                        except ValueError as e:
+                            self._log(f"📄 JSON 解析错误: {e}")
+                            raise
+
+                        if cache:
+                            cache.put(
+                                key, data,
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified')
+                            )
+                        return data
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                # 每次尝试（包括重试）记录一个 span，总耗时包含读取和解析响应体
+                if span is not None:
+                    metrics.finish(span, response, error)
+
+            # 可重试的错误：在剩余时间预算内按全抖动退避后重试
+            wait_time = self.retry_policy.backoff(attempt, retry_after)
+            if attempt >= self.retry_policy.max_attempts or wait_time >= self._remaining():
+                if entry:
+                    self._log("📴 仓库暂时不可用，使用过期的本地缓存")
+                    return entry['data']
+                raise error
+            self._log(f"⏳ 等待 {wait_time:.1f} 秒后重试...")
+            self._sleep(wait_time)
+            self._log(f"🔄 第 {attempt + 1} 次尝试...")
+
+    def _fetch_all_pages(self, api_url: str, params: Dict, offset_param: str, page_size: int,
+                         total_of: Callable[[Dict], int], merge: Callable[[Dict], None]):
+        """
+        分页获取全部结果
+
+        先获取第一页得到总数，再并发获取剩余页；每页到达后立即合并，不保留原始页面数据。
+        任意一页失败则整体失败，避免返回被截断的结果。
+
+        Args:
+            api_url: 查询接口地址
+            params: 除分页偏移量外的查询参数
+            offset_param: 分页偏移量参数名（Solr 为 start，Nexus 为 from）
+            page_size: 每页数量
+            total_of: 从响应中读取结果总数
+            merge: 合并一页结果
+        """
+        first_page = self._get_json(api_url, {**params, offset_param: 0})
+        merge(first_page)
+
+        offsets = range(page_size, total_of(first_page), page_size)
+        if not offsets:
+            return
+        self._log(f"📄 共 {total_of(first_page)} 条结果，并发获取剩余 {len(offsets)} 页")
+
+        # 工作线程沿用当前线程的取消/仅缓存标志
+        local_state = dict(vars(self._local))
+
+        def fetch(offset: int) -> Dict:
+            vars(self._local).update(local_state)
+            return self._get_json(api_url, {**params, offset_param: offset})
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        executor = ThreadPoolExecutor(max_workers=min(self.page_workers, len(offsets)), thread_name_prefix='page')
+        try:
+            for future in as_completed([executor.submit(fetch, offset) for offset in offsets]):
+                merge(future.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search_maven_central_group(self, api_url: str, group_id: str, rows: int) -> List[Dict]:
+        """从 Maven Central 查询（core=gav 每个版本一条记录，需要分页获取全部）"""
+        params = {
+            'q': f'g:{group_id}',
+            'rows': rows,
+            'wt': 'json',
+            'core': 'gav'
+        }
+
+        # 按 artifactId 分组，获取每个组件的最新版本（按 Maven 版本号规则，而非发布时间）
+        artifacts = {}
+        latest_keys = {}
+        lock = threading.Lock()
+
+        def merge(data: Dict):
+            docs = data.get('response', {}).get('docs', [])
+            self._log(f"📋 本页结果数量: {len(docs)}")
+            with lock:
+                for doc in docs:
+                    artifact_id = doc.get('a', '')
+                    key = self._accepted_key(doc.get('v', ''))
+                    if key is None:
+                        continue
+
+                    if artifact_id not in latest_keys or key > latest_keys[artifact_id]:
+                        latest_keys[artifact_id] = key
+                        artifacts[artifact_id] = {
+                            'groupId': doc.get('g', ''),
+                            'artifactId': artifact_id,
+                            'version': key.version,
+                            'timestamp': doc.get('timestamp', 0)
+                        }
+
+        self._fetch_all_pages(
+            api_url, params, 'start', rows,
+            total_of=lambda data: data.get('response', {}).get('numFound', 0),
+            merge=merge
+        )
+
+        # 转换为列表并按 artifactId 排序
+        result = sorted(artifacts.values(), key=lambda x: x['artifactId'])
+        return result
+
+    def _search_nexus_group(self, api_url: str, group_id: str, rows: int) -> List[Dict]:
+        """从 Nexus 仓库查询（如阿里云镜像），按 from/count 分页获取全部结果"""
+        params = {
+            'g': group_id,
+            'count': rows
+        }
+
+        artifacts = {}
+        latest_keys = {}
+        lock = threading.Lock()
+
+        def merge(data: Dict):
+            # 解析 Nexus 格式的返回结果
+            artifacts_data = data.get('data', [])
+            self._log(f"📋 本页结果数量: {len(artifacts_data)}")
+            if data.get('tooManyResults'):
+                self._log("⚠️  Nexus 提示结果过多，返回内容可能不完整", force=True)
+
+            with lock:
+                for item in artifacts_data:
+                    artifact_id = item.get('artifactId', '')
+                    # Nexus 返回所有版本，需要找最新的
+                    for version in self._nexus_item_versions(item):
+                        key = self._accepted_key(version)
+                        if key is None:
+                            continue
+
+                        if artifact_id not in latest_keys or key > latest_keys[artifact_id]:
+                            latest_keys[artifact_id] = key
+                            artifacts[artifact_id] = {
+                                'groupId': item.get('groupId', ''),
+                                'artifactId': artifact_id,
+                                'version': key.version,
+                                'timestamp': 0  # Nexus 不提供时间戳
+                            }
+
+        self._fetch_all_pages(
+            api_url, params, 'from', rows,
+            total_of=lambda data: data.get('totalCount', 0),
+            merge=merge
+        )
+
+        result = sorted(artifacts.values(), key=lambda x: x['artifactId'])
+        return result
+
+    def _accepted_key(self, version: str) -> Optional[VersionKey]:
+        """返回版本号的排序键，被预发布/快照过滤规则排除时返回 None"""
+        if not version:
+            return None
+        key = version_key(version)
+        if not self.include_snapshots and key.is_snapshot:
+            return None
+        if not self.include_prereleases and key.is_prerelease:
+            return None
+        return key
+
+    def _latest_version(self, versions) -> Optional[str]:
+        """按过滤规则单次遍历取最新版本"""
+        return latest_version(versions, self.include_prereleases, self.include_snapshots)
+
+    @staticmethod
+    def _nexus_item_versions(item: Dict):
+        """遍历 Nexus 搜索结果条目中的版本号（条目自身及 artifactLinks 上的版本）"""
+        if item.get('version'):
+            yield item['version']
+        for artifact_hit in item.get('artifactHits', []):
+            for artifact_link in artifact_hit.get('artifactLinks', []):
+                if artifact_link.get('version'):
+                    yield artifact_link['version']
+
+    def search_artifact(self, artifact_id: str, group_id: str = "cn.tannn.jdevelops") -> Optional[Dict]:
+        """
+        搜索指定组件的版本信息
+
+        Args:
+            artifact_id: Maven artifactId
+            group_id: Maven groupId，默认为 cn.tannn.jdevelops
+
+        Returns:
+            组件信息，包含最新版本号
+
+        Raises:
+            DeadlineExceeded: 超出时间预算，无法确定组件是否存在
+        """
+        result = self._find_artifact(artifact_id, group_id)
+        if result:
+            return result
+
+        # 所有仓库都失败
+        print("❌ 所有 Maven 仓库都查询失败", file=sys.stderr)
+        print("💡 可能的原因:", file=sys.stderr)
+        print("   1. 网络连接问题（尝试检查网络或使用代理）", file=sys.stderr)
+        print("   2. Maven 仓库暂时不可用", file=sys.stderr)
+        print("   3. 组件不存在", file=sys.stderr)
+        return None
+
+    def search_artifacts(self, artifact_ids: List[str], group_id: str = "cn.tannn.jdevelops",
+                         workers: int = 8) -> Tuple[List[Dict], List[str]]:
+        """
+        批量查询多个组件的版本信息
+
+        使用有界线程池并发查询，所有线程共享同一个 Session 及其连接池，每个组件有独立的时间预算。
+
+        Args:
+            artifact_ids: Maven artifactId 列表
+            group_id: Maven groupId，默认为 cn.tannn.jdevelops
+            workers: 并发线程数，默认 8
+
+        Returns:
+            (找到的组件列表, 未找到的 artifactId 列表, 超出时间预算的 artifactId 列表)，均保持输入顺序；
+            超时的组件不计入未找到，它们可能存在
+        """
+        # 去重并保持顺序
+        artifact_ids = list(dict.fromkeys(artifact_ids))
+        workers = max(1, min(workers, len(artifact_ids)))
+        self._log(f"🔍 开始批量查询 {len(artifact_ids)} 个组件（{workers} 个线程）")
+
+        # 竞速模式下每个组件会同时占用所有仓库的连接
+        self._resize_pool(workers * (len(self.MAVEN_REPOS) if self.race else 1))
+
+        def find(artifact_id: str) -> Tuple[Optional[Dict], bool]:
+            try:
+                # 每个组件的成功信息只在 -v 时输出，结束后输出一行汇总
+                return self._find_artifact(artifact_id, group_id, announce=False), False
+            except DeadlineExceeded:
+                return None, True
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='artifact') as executor:
+            results = list(executor.map(find, artifact_ids))
+
+        found = [r for r, _ in results if r]
+        missing = [a for a, (r, expired) in zip(artifact_ids, results) if not r and not expired]
+        timed_out = [a for a, (_, expired) in zip(artifact_ids, results) if expired]
+        self._log(f"✅ 批量查询完成: 找到 {len(found)} 个组件", force=True)
+        if missing:
+            self._log(f"⚠️  未找到 {len(missing)} 个组件: {', '.join(missing)}", force=True)
+        if timed_out:
+            self._log(f"⏱️  {len(timed_out)} 个组件超出时间预算: {', '.join(timed_out)}", force=True)
+        return found, missing, timed_out
+
+    def poll_artifacts(self, coordinates: List[Tuple[str, str]],
+                       workers: int = 8) -> Dict[Tuple[str, str], Optional[Dict]]:
+        """
+        只通过 maven-metadata.xml 查询一批组件的最新版本
+
+        开启 refresh 时每个文件都携带 ETag/Last-Modified 发起条件请求，没有新发布时仓库只返回 304，
+        适合周期性轮询；不会使用搜索接口和本地仓库。
+
+        Args:
+            coordinates: (groupId, artifactId) 列表
+            workers: 并发线程数
+
+        Returns:
+            (groupId, artifactId) -> 组件信息，查询失败或不存在时为 None
+        """
+        if not coordinates:
+            return {}
+        repos = [r for r in self.MAVEN_REPOS if r['type'] == 'maven_metadata']
+        workers = max(1, min(workers, len(coordinates)))
+        self._resize_pool(workers * (len(repos) if self.race else 1))
+
+        def poll(coordinate: Tuple[str, str]) -> Optional[Dict]:
+            group_id, artifact_id = coordinate
+            self._start_deadline()
+            try:
+                _, result = self._query_repos(
+                    lambda r: self._search_metadata_artifact(r['base_url'], artifact_id, group_id), repos
+                )
+            except DeadlineExceeded as e:
+                self._log(f"⏱️  查询 {group_id}:{artifact_id} 超时: {e}")
+                return None
+            return result
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='poll') as executor:
+            return dict(zip(coordinates, executor.map(poll, coordinates)))
+
+    def watch(self, group_ids: List[str], artifact_ids: Optional[List[str]] = None, interval: float = 120,
+              max_interval: float = 900, discover_interval: float = 3600, hook: Optional[str] = None,
+              workers: int = 8, cycles: int = 0) -> int:
+        """
+        监视组件发布，出现新组件或版本升级时输出 NDJSON 事件或执行钩子命令
+
+        参数含义见 release_watcher.ReleaseWatcher；cycles 为轮询轮数，0 表示一直运行。
+
+        Returns:
+            进程退出码
+        """
+        from release_watcher import ReleaseWatcher
+
+        watcher = ReleaseWatcher(self, group_ids, artifact_ids=artifact_ids, interval=interval,
+                                 max_interval=max_interval, discover_interval=discover_interval,
+                                 hook=hook, workers=workers, log=self._log)
+        return watcher.run(cycles)
+
+    def _find_artifact(self, artifact_id: str, group_id: str, announce: bool = True) -> Optional[Dict]:
+        """
+        在本地仓库和所有远程仓库中查询单个组件（有独立的时间预算），找不到时返回 None
+
+        Args:
+            announce: 是否总是输出查询成功的来源；为 False 时只在 verbose 模式下输出（批量查询）
+
+        Raises:
+            DeadlineExceeded: 远程仓库在时间预算内都没有返回结果，且本地仓库中也没有该组件
+        """
+        self._log(f"🔍 开始查询组件: {group_id}:{artifact_id}")
+        self._start_deadline()
+
+        local = None
+        if self.source != 'remote':
+            entry = self.local_index.artifact(group_id, artifact_id)
+            local = self._local_result(group_id, artifact_id, entry) if entry else None
+            # 只信任远程仓库自己的刷新时间：下载或安装旧版本不会让本地的“最新版本”变得可信
+            fresh = local and time.time() - entry.get('checked', 0) < self.local_max_age
+            if local and (self.source == 'local' or fresh):
+                self._log(f"✅ 从本地仓库查询成功: {artifact_id}", force=announce)
+                return local
+            if self.source == 'local':
+                return None
+            if local:
+                self._log(f"⏰ 本地仓库中的 {artifact_id} 元数据超过 {self.local_max_age} 秒未从远程刷新，查询远程仓库")
+
+        try:
+            repo, result = self._query_repos(lambda r: self._search_artifact_from_repo(r, artifact_id, group_id))
+        except DeadlineExceeded:
+            if not local:
+                raise
+            repo, result = None, None
+        if result:
+            self._log(f"✅ 从 {repo['name']} 查询成功: {artifact_id}", force=announce)
+        elif local:
+            self._log(f"📴 远程仓库查询失败，使用本地仓库中的信息: {artifact_id}", force=True)
+            return local
+        return result
+
+    def _search_local_group(self, group_id: str) -> List[Dict]:
+        """从本地仓库索引列出 groupId 下的组件"""
+        result = []
+        for artifact_id, entry in self.local_index.artifacts(group_id).items():
+            artifact = self._local_result(group_id, artifact_id, entry)
+            if artifact:
+                result.append(artifact)
+        return sorted(result, key=lambda x: x['artifactId'])
+
+    def _local_result(self, group_id: str, artifact_id: str, entry: Dict) -> Optional[Dict]:
+        version = self._latest_version(entry['versions'])
+        if not version:
+            return None
+        return {
+            'groupId': group_id,
+            'artifactId': artifact_id,
+            'version': version,
+            'timestamp': int(entry['updated'] * 1000)
+        }
+
+    def _resize_pool(self, size: int):
+        """按并发度调整连接池大小，避免连接被反复丢弃重建"""
+        # 会话尚未创建时只记录大小，创建会话时再挂载
+        self._pool_size = size
+        if self._session is not None:
+            self._mount_adapters(self._session, size)
+
+    def _mount_adapters(self, session: 'requests.Session', size: int):
+        from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+        adapter_class = HTTPAdapter
+        if self.metrics is not None:
+            from request_metrics import timed_adapter_class
+
+            adapter_class = timed_adapter_class()
+        size = max(size, DEFAULT_POOLSIZE)
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, adapter_class(pool_connections=size, pool_maxsize=size))
+
+    def _search_artifact_from_repo(self, repo: Dict, artifact_id: str, group_id: str) -> Optional[Dict]:
+        """从指定仓库查询单个组件"""
+        if repo['type'] == 'maven_metadata':
+            return self._search_metadata_artifact(repo['base_url'], artifact_id, group_id)
+        elif repo['type'] == 'maven_central':
+            return self._search_maven_central_artifact(repo['search_api'], artifact_id, group_id)
+        elif repo['type'] == 'nexus':
+            return self._search_nexus_artifact(repo['search_api'], artifact_id, group_id)
+        return None
+
+    def fetch_pom(self, group_id: str, artifact_id: str, version: str) -> Optional[bytes]:
+        """
+        获取组件某个版本的 POM 文件
+
+        依次查找本地 Maven 仓库、POM 磁盘缓存和远程仓库（只使用按仓库布局提供文件的仓库）；
+        每个 POM 的远程查询有独立的时间预算。
+
+        Returns:
+            POM 文件内容，找不到时返回 None
+
+        Raises:
+            DeadlineExceeded: 超出时间预算，无法确定 POM 是否存在
+        """
+        try:
+            with open(self.local_index.pom_path(group_id, artifact_id, version), 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+        if self.pom_store is not None:
+            content = self.pom_store.get(group_id, artifact_id, version)
+            if content is not None:
+                return content
+        if self.source == 'local':
+            return None
+
+        repos = [r for r in self.MAVEN_REPOS if r['type'] == 'maven_metadata']
+        self._start_deadline()
+        repo, content = self._query_repos(
+            lambda r: self._fetch_pom_from_repo(r['base_url'], group_id, artifact_id, version), repos
+        )
+        if content is None:
+            return None
+        self._log(f"📄 从 {repo['name']} 获取 POM: {group_id}:{artifact_id}:{version}")
+        if self.pom_store is not None:
+            self.pom_store.put(group_id, artifact_id, version, content)
+        return content
+
+    def _fetch_pom_from_repo(self, base_url: str, group_id: str, artifact_id: str,
+                             version: str) -> Optional[bytes]:
+        """从指定仓库下载 POM 文件（由 PomStore 缓存，不写入响应缓存）"""
+        url = (f"{base_url.rstrip('/')}/{group_id.replace('.', '/')}/{artifact_id}/{version}/"
+               f"{artifact_id}-{version}.pom")
+        return self._fetch(url, {}, lambda response: response.content, missing_ok=True, use_cache=False)
+
+    def resolve_graph(self, coordinates: List[Tuple[str, str, str]], expand_groups: Optional[List[str]] = None,
+                      max_depth: int = 0, workers: int = 8) -> Dict:
+        """
+        解析一组组件的传递依赖图
+
+        按层广度优先遍历，同一层需要的 POM（包括父 POM 和导入的 BOM）并发获取；
+        同一 groupId:artifactId 出现多个版本时按 Maven 的最近优先规则选定一个，其余记为冲突。
+
+        Args:
+            coordinates: (groupId, artifactId, version) 列表
+            expand_groups: 只展开这些 groupId 的依赖（其余依赖作为叶子节点），None 表示全部展开
+            max_depth: 最大遍历深度，0 表示不限制
+            workers: 并发获取 POM 的线程数
+
+        Returns:
+            {'roots', 'nodes', 'edges', 'conflicts', 'timedOut'}，详见 dependency_graph.DependencyGraphResolver
+        """
+        from dependency_graph import DependencyGraphResolver
+
+        def fetch_pom(group_id: str, artifact_id: str, version: str) -> Optional[bytes]:
+            # 解析器不依赖本模块，超时以标准的 TimeoutError 告知
+            try:
+                return self.fetch_pom(group_id, artifact_id, version)
+            except DeadlineExceeded as e:
+                raise TimeoutError(str(e)) from e
+
+        self._resize_pool(workers * (len(self.MAVEN_REPOS) if self.race else 1))
+        resolver = DependencyGraphResolver(fetch_pom, expand_groups=expand_groups,
+                                           max_depth=max_depth, workers=workers, log=self._log)
+        return resolver.resolve(coordinates)
+
+    def _search_metadata_artifact(self, base_url: str, artifact_id: str, group_id: str) -> Optional[Dict]:
+        """从仓库的 maven-metadata.xml 读取单个组件的版本信息"""
+        url = f"{base_url.rstrip('/')}/{group_id.replace('.', '/')}/{artifact_id}/maven-metadata.xml"
+        metadata = self._fetch(url, {}, self._parse_metadata, missing_ok=True, stream=True)
+        if not metadata:
+            return None
+
+        # <release> 可能是预发布版本，优先按过滤规则从 <versions> 中选出最新版本
+        version = self._latest_version(metadata['versions'])
+        if not version and not metadata['versions']:
+            version = self._latest_version([metadata['release'], metadata['latest']])
+        if not version:
+            return None
+        return {
+            'groupId': metadata['groupId'] or group_id,
+            'artifactId': metadata['artifactId'] or artifact_id,
+            'version': version,
+            'timestamp': metadata['timestamp']
+        }
+
+    def _parse_metadata(self, response: 'requests.Response') -> Dict:
+        """
+        流式解析 maven-metadata.xml
+
+        Returns:
+            包含 groupId、artifactId、latest、release、versions、timestamp 的字典，
+            timestamp 为 lastUpdated 转换的毫秒时间戳（与 Maven Central 搜索接口一致）
+        """
+        metadata = {
+            'groupId': None,
+            'artifactId': None,
+            'latest': None,
+            'release': None,
+            'versions': [],
+            'timestamp': 0
+        }
+        import calendar
+        import xml.etree.ElementTree as ET
+
+        parser = ET.XMLPullParser(events=('end',))
+        for chunk in response.iter_content(chunk_size=8192):
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                tag = element.tag
+                text = (element.text or '').strip()
+                if tag == 'version':
+                    metadata['versions'].append(text)
+                elif tag in ('groupId', 'artifactId', 'latest', 'release'):
+                    metadata[tag] = text or None
+                elif tag == 'lastUpdated' and text:
+                    try:
+                        updated = time.strptime(text, '%Y%m%d%H%M%S')
+                        metadata['timestamp'] = int(calendar.timegm(updated)) * 1000
+                    except ValueError:
+                        pass
+        parser.close()
+        return metadata
+
+    def _search_maven_central_artifact(self, api_url: str, artifact_id: str, group_id: str) -> Optional[Dict]:
+        """从 Maven Central 查询单个组件"""
+        # 取最近发布的若干个版本，按版本号规则而非发布时间选出最新版本
+        params = {
+            'q': f'g:{group_id} AND a:{artifact_id}',
+            'rows': 20,
+            'wt': 'json',
+            'core': 'gav'
+        }
+
+        data = self._get_json(api_url, params)
+
+        docs = data.get('response', {}).get('docs', [])
+        latest = self._latest_version(doc.get('v', '') for doc in docs)
+        for doc in docs:
+            if doc.get('v') == latest:
+                return {
+                    'groupId': doc.get('g', ''),
+                    'artifactId': doc.get('a', ''),
+                    'version': latest,
+                    'timestamp': doc.get('timestamp', 0)
+                }
+        return None
+
+    def _search_nexus_artifact(self, api_url: str, artifact_id: str, group_id: str) -> Optional[Dict]:
+        """从 Nexus 仓库查询单个组件"""
+        # Nexus 每个版本一条记录，需要取足够多的记录才能找到最新版本
+        params = {
+            'g': group_id,
+            'a': artifact_id,
+            'count': 200
+        }
+
+        data = self._get_json(api_url, params)
+
+        artifacts_data = data.get('data', [])
+        if artifacts_data:
+            item = artifacts_data[0]
+            # 获取最新版本
+            latest = self._latest_version(
+                version for entry in artifacts_data for version in self._nexus_item_versions(entry)
+            )
+
+            if latest:
+                return {
+                    'groupId': item.get('groupId', ''),
+                    'artifactId': item.get('artifactId', ''),
+                    'version': latest,
+                    'timestamp': 0
+                }
+        return None
+
+
+def print_maven_dependency(artifact: Dict):
+    """打印 Maven 依赖配置"""
+    print(f"""
+<dependency>
+    <groupId>{artifact['groupId']}</groupId>
+    <artifactId>{artifact['artifactId']}</artifactId>
+    <version>{artifact['version']}</version>
+</dependency>
+""")
+
+
+def print_gradle_dependency(artifact: Dict):
+    """打印 Gradle 依赖配置"""
+    print(f"implementation '{artifact['groupId']}:{artifact['artifactId']}:{artifact['version']}'")
+
+
+# 逐行输出、可边查询边消费的格式；这些格式下进度信息输出到标准错误，标准输出只有数据
+STREAM_FORMATS = ('ndjson', 'csv')
+CSV_FIELDS = ('groupId', 'artifactId', 'version', 'timestamp')
+
+
+def status_stream(fmt: str):
+    """进度信息的输出位置"""
+    return sys.stderr if fmt in STREAM_FORMATS else sys.stdout
+
+
+def write_rows(rows: List[Dict], fmt: str, fields=CSV_FIELDS, header: bool = True):
+    """以 NDJSON 或 CSV 格式逐行写出并立即刷新，供下游工具边读边处理"""
+    if fmt == 'ndjson':
+        for row in rows:
+            sys.stdout.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        import csv
+
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        if header:
+            writer.writerow(fields)
+        for row in rows:
+            writer.writerow([';'.join(v) if isinstance(v, list) else v for v in (row.get(f, '') for f in fields)])
+    sys.stdout.flush()
+
+
+def print_artifacts(artifacts: List[Dict], fmt: str, header: bool = True):
+    """按指定格式打印组件列表（header 仅对 CSV 有效）"""
+    if fmt == 'json':
+        print(json.dumps(artifacts, indent=2, ensure_ascii=False))
+    elif fmt in STREAM_FORMATS:
+        write_rows(artifacts, fmt, header=header)
+    elif fmt == 'maven':
+        for artifact in artifacts:
+            print_maven_dependency(artifact)
+    elif fmt == 'gradle':
+        for artifact in artifacts:
+            print_gradle_dependency(artifact)
+    else:  # table
+        print(f"\n✅ 找到 {len(artifacts)} 个组件:\n")
+        print(f"{'序号':<6} {'ArtifactId':<50} {'最新版本':<15}")
+        print("-" * 75)
+        for idx, artifact in enumerate(artifacts, 1):
+            print(f"{idx:<6} {artifact['artifactId']:<50} {artifact['version']:<15}")
+
+
+SCAN_STATUS_LABELS = {
+    'outdated': '⬆️  可升级',
+    'up-to-date': '✅ 最新',
+    'ahead': '🔼 高于仓库',
+    'unresolved': '❓ 版本未解析',
+    'unknown': '⚠️  仓库未找到',
+}
+
+
+def print_scan_report(rows: List[Dict], fmt: str, roots: List[str]):
+    """按指定格式打印项目扫描结果"""
+    if fmt == 'json':
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    if fmt in STREAM_FORMATS:
+        write_rows(rows, fmt, fields=('groupId', 'artifactId', 'current', 'latest', 'status', 'files'))
+        return
+
+    outdated = [row for row in rows if row['status'] == 'outdated']
+    if fmt in ('maven', 'gradle'):
+        # 只输出需要升级的组件的最新依赖配置
+        latest = {(row['groupId'], row['artifactId']): row['latest'] for row in outdated}
+        for (group_id, artifact_id), version in latest.items():
+            artifact = {'groupId': group_id, 'artifactId': artifact_id, 'version': version}
+            if fmt == 'maven':
+                print_maven_dependency(artifact)
+            else:
+                print_gradle_dependency(artifact)
+        return
+
+    def display_path(path):
+        for root in roots:
+            if path.startswith(root + os.sep):
+                return os.path.relpath(path, os.path.dirname(root))
+        return path
+
+    print(f"\n📋 共 {len(rows)} 项依赖，其中 {len(outdated)} 项可升级:\n")
+    print(f"{'ArtifactId':<45} {'当前版本':<15} {'最新版本':<15} 状态")
+    print("-" * 95)
+    for row in rows:
+        print(f"{row['artifactId']:<45} {row['current'] or '-':<15} {row['latest'] or '-':<15} "
+              f"{SCAN_STATUS_LABELS[row['status']]}")
+        for path in row['files'][:3]:
+            print(f"    {display_path(path)}")
+        if len(row['files']) > 3:
+            print(f"    ... 以及另外 {len(row['files']) - 3} 个文件")
+
+
+def run_scan(args, checker: 'JDevelopsVersionChecker'):
+    """扫描项目目录并报告可升级的依赖，每个不同的组件只查询一次"""
+    from project_scanner import build_report, scan_projects
+
+    status = status_stream(args.format)
+    roots = [os.path.abspath(root) for root in args.scan]
+    missing_roots = [root for root in roots if not os.path.exists(root)]
+    if missing_roots:
+        print(f"❌ 目录不存在: {', '.join(missing_roots)}", file=status)
+        sys.exit(1)
+
+    groups = ', '.join(args.groups)
+    print(f"🔍 正在扫描 {len(roots)} 个目录中的 {groups} 依赖...", file=status)
+    usages, errors = scan_projects(roots, args.groups, workers=args.workers)
+    for error in errors:
+        print(f"⚠️  无法解析 {error['path']}: {error['error']}", file=sys.stderr)
+    if not usages:
+        print(f"ℹ️  未找到 {groups} 的依赖", file=status)
+        return
+
+    by_group: Dict[str, List[str]] = {}
+    for usage in usages:
+        by_group.setdefault(usage['groupId'], [])
+        if usage['artifactId'] not in by_group[usage['groupId']]:
+            by_group[usage['groupId']].append(usage['artifactId'])
+    count = sum(len(artifact_ids) for artifact_ids in by_group.values())
+    print(f"📄 找到 {len(usages)} 处依赖，涉及 {count} 个不同组件，正在查询最新版本...", file=status)
+
+    latest = {}
+    timed_out = []
+    for group_id, artifact_ids in by_group.items():
+        if len(artifact_ids) == 1:
+            try:
+                artifact = checker.search_artifact(artifact_ids[0], group_id)
+            except DeadlineExceeded:
+                artifact = None
+                timed_out.append(f"{group_id}:{artifact_ids[0]}")
+            artifacts = [artifact] if artifact else []
+        else:
+            artifacts, _, expired = checker.search_artifacts(artifact_ids, group_id, workers=args.workers)
+            timed_out.extend(f"{group_id}:{artifact_id}" for artifact_id in expired)
+        latest.update({(a['groupId'], a['artifactId']): a for a in artifacts})
+    if timed_out:
+        print(f"⏱️  查询超时，未能获取最新版本: {', '.join(timed_out)}", file=sys.stderr)
+    print_scan_report(build_report(usages, latest), args.format, roots)
+
+
+def parse_coordinates(values: List[str], default_group: str) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    解析 --graph 的组件坐标
+
+    支持 artifactId、artifactId:version、groupId:artifactId 和 groupId:artifactId:version，
+    两段式中第二段以数字开头时视为版本号
+    """
+    coordinates = []
+    for value in read_artifact_ids(values):
+        parts = value.split(':')
+        if len(parts) >= 3:
+            coordinates.append((parts[0], parts[1], parts[2]))
+        elif len(parts) == 2 and parts[1][:1].isdigit():
+            coordinates.append((default_group, parts[0], parts[1]))
+        elif len(parts) == 2:
+            coordinates.append((parts[0], parts[1], None))
+        else:
+            coordinates.append((default_group, value, None))
+    return coordinates
+
+
+def run_graph(args, checker: 'JDevelopsVersionChecker'):
+    """解析并输出传递依赖图"""
+    from dependency_graph import format_tree, graph_to_dot
+
+    coordinates = parse_coordinates(args.graph, args.group)
+    if not coordinates:
+        print("❌ 未提供任何组件")
+        sys.exit(1)
+
+    # 未指定版本的组件先按 groupId 批量查询最新版本
+    unversioned: Dict[str, List[str]] = {}
+    for group_id, artifact_id, version in coordinates:
+        if version is None:
+            unversioned.setdefault(group_id, []).append(artifact_id)
+    latest = {}
+    for group_id, artifact_ids in unversioned.items():
+        artifacts, missing, timed_out = checker.search_artifacts(artifact_ids, group_id, workers=args.workers)
+        if missing:
+            print(f"❌ 未找到组件: {', '.join(missing)}")
+        if timed_out:
+            print(f"⏱️  查询超时，无法确定最新版本: {', '.join(timed_out)}")
+        if missing or timed_out:
+            sys.exit(1)
+        latest.update({(a['groupId'], a['artifactId']): a['version'] for a in artifacts})
+    coordinates = [(g, a, v or latest[(g, a)]) for g, a, v in coordinates]
+
+    # 同一 groupId:artifactId 只能作为一个根节点，重复指定时只解析第一个版本
+    roots: Dict[Tuple[str, str], str] = {}
+    for group_id, artifact_id, version in coordinates:
+        ga = (group_id, artifact_id)
+        if ga not in roots:
+            roots[ga] = version
+        elif roots[ga] != version:
+            print(f"⚠️  {group_id}:{artifact_id} 指定了多个版本，只解析 {roots[ga]}，忽略 {version}", file=sys.stderr)
+        else:
+            print(f"⚠️  重复指定的组件已忽略: {group_id}:{artifact_id}:{version}", file=sys.stderr)
+    coordinates = [(g, a, v) for (g, a), v in roots.items()]
+
+    print(f"🔍 正在解析 {len(coordinates)} 个组件的依赖图...", file=sys.stderr)
+    graph = checker.resolve_graph(
+        coordinates,
+        expand_groups=None if args.graph_all else args.groups,
+        max_depth=args.graph_depth,
+        workers=args.workers
+    )
+    print(f"✅ {len(graph['nodes'])} 个组件，{len(graph['conflicts'])} 处版本冲突，"
+          f"{graph['roundTrips']} 轮并发请求", file=sys.stderr)
+    if graph['timedOut']:
+        print(f"⏱️  {len(graph['timedOut'])} 个 POM 获取超时，依赖图不完整: {', '.join(graph['timedOut'])}",
+              file=sys.stderr)
+
+    if args.format == 'json':
+        print(json.dumps(graph, indent=2, ensure_ascii=False))
+    elif args.format == 'dot':
+        print(graph_to_dot(graph))
+    elif args.format in ('maven', 'gradle'):
+        # 输出解析后的全部依赖（扁平列表）
+        for node in graph['nodes']:
+            if node['depth'] > 0:
+                artifact = {'groupId': node['groupId'], 'artifactId': node['artifactId'], 'version': node['version']}
+                if args.format == 'maven':
+                    print_maven_dependency(artifact)
+                else:
+                    print_gradle_dependency(artifact)
+    else:  # table
+        print(format_tree(graph))
+        if graph['conflicts']:
+            print(f"\n⚠️  版本冲突（按最近优先选定）:")
+            for conflict in graph['conflicts']:
+                versions = ', '.join(
+                    f"{version} ← {', '.join(by) or '直接指定'}" for version, by in conflict['requested'].items()
+                )
+                print(f"  {conflict['groupId']}:{conflict['artifactId']} 选定 {conflict['selected']}: {versions}")
+
+    if graph['timedOut'] or any(node.get('error') for node in graph['nodes']):
+        sys.exit(1)
+
+
+def read_artifact_ids(values: List[str]) -> List[str]:
+    """
+    解析 -a 参数
+
+    每个值可以是 artifactId、逗号分隔的多个 artifactId、@文件（每行一个，# 开头为注释）
+    或 -（从标准输入读取，格式同文件）
+    """
+    def from_lines(lines):
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                yield from line.replace(',', ' ').split()
+
+    artifact_ids = []
+    for value in values:
+        if value == '-':
+            artifact_ids.extend(from_lines(sys.stdin))
+        elif value.startswith('@'):
+            with open(value[1:], 'r', encoding='utf-8') as f:
+                artifact_ids.extend(from_lines(f))
+        else:
+            artifact_ids.extend(from_lines([value]))
+    return list(dict.fromkeys(artifact_ids))
+
+
+def build_parser():
+    """构建命令行参数解析器"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='查询 JDevelops 组件的最新版本',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 查询所有 jdevelops 组件
+  python query_versions.py
+
+  # 查询指定组件
+  python query_versions.py -a jdevelops-apis-result
+
+  # 输出 Maven 依赖格式
+  python query_versions.py -a jdevelops-apis-result -f maven
+
+  # 输出 Gradle 依赖格式
+  python query_versions.py -a jdevelops-apis-result -f gradle
+
+  # 批量查询多个组件（并发）
+  python query_versions.py -a jdevelops-apis-result jdevelops-dals-jpa -f maven
+  python query_versions.py -a @artifacts.txt
+  cat artifacts.txt | python query_versions.py -a -
+
+  # 并发查询所有仓库，采用最快返回的结果
+  python query_versions.py --race
+
+  # 忽略缓存有效期，强制从仓库刷新
+  python query_versions.py --refresh
+
+  # 只使用本地 ~/.m2 仓库（不联网）
+  python query_versions.py -a jdevelops-apis-result --source local
+
+  # 并发查询多个 groupId，每个 groupId 完成后立即逐行输出
+  python query_versions.py -g cn.tannn.jdevelops cn.tannn -f ndjson
+
+  # 监视新版本发布（NDJSON 事件），或在发布时执行命令
+  python query_versions.py --watch
+  python query_versions.py --watch -a jdevelops-apis-result --watch-hook 'notify-send "$JDEVELOPS_ARTIFACT_ID $JDEVELOPS_VERSION"'
+
+  # 扫描项目目录，找出可升级的 jdevelops 依赖
+  python query_versions.py --scan ~/projects/service-a ~/projects/service-b
+
+  # 查看 starter 实际引入的依赖（含版本冲突），或输出为 Graphviz 图
+  python query_versions.py --graph jdevelops-spring-boot-starter jdevelops-dals-jpa
+  python query_versions.py --graph jdevelops-spring-boot-starter -f dot | dot -Tsvg > deps.svg
+
+  # 启动常驻查询服务（之后的调用自动经由服务执行，省去启动和 TLS 握手开销）
+  python query_versions.py --daemon -a jdevelops-apis-result
+        """
+    )
+
+    target = parser.add_mutually_exclusive_group()
+
+    target.add_argument(
+        '-a', '--artifact',
+        nargs='+',
+        metavar='ARTIFACT',
+        help='指定要查询的 artifactId，可以是多个（也支持逗号分隔、@文件、- 表示从标准输入读取）'
+    )
+
+    target.add_argument(
+        '--scan',
+        nargs='+',
+        metavar='DIR',
+        help='扫描目录中的 pom.xml、build.gradle(.kts) 和版本目录，报告可升级的依赖（当前版本 → 最新版本）'
+    )
+
+    target.add_argument(
+        '--graph',
+        nargs='+',
+        metavar='COORD',
+        help='解析组件的传递依赖图，COORD 可以是 artifactId、artifactId:version 或 groupId:artifactId:version'
+             '（未指定版本时使用最新版本）；-f json/dot 输出 JSON 或 Graphviz DOT，默认输出依赖树'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='持续监视组件发布（-a 指定的组件或 -g 下的全部组件），只在出现新组件或版本升级时输出 NDJSON 事件；'
+             '轮询使用 maven-metadata.xml 的条件请求，没有新发布时仓库只返回 304'
+    )
+
+    parser.add_argument(
+        '--watch-interval',
+        type=float,
+        default=120,
+        help='--watch 的最短轮询间隔（秒，默认: 120），没有变化时逐步拉长'
+    )
+
+    parser.add_argument(
+        '--watch-max-interval',
+        type=float,
+        default=900,
+        help='--watch 的最长轮询间隔（秒，默认: 900）'
+    )
+
+    parser.add_argument(
+        '--watch-discover',
+        type=float,
+        default=3600,
+        help='--watch 未指定 -a 时重新列出组件、发现新组件的间隔（秒，默认: 3600）'
+    )
+
+    parser.add_argument(
+        '--watch-hook',
+        metavar='CMD',
+        help='--watch 时每个事件执行一次的 shell 命令，事件 JSON 从标准输入传入，'
+             '并设置 JDEVELOPS_EVENT/JDEVELOPS_ARTIFACT_ID/JDEVELOPS_VERSION 等环境变量'
+    )
+
+    parser.add_argument(
+        '--watch-cycles',
+        type=int,
+        default=0,
+        help='--watch 的轮询轮数 (默认: 0，一直运行)，可用于定时任务'
+    )
+
+    parser.add_argument(
+        '--graph-depth',
+        type=int,
+        default=0,
+        help='--graph 的最大遍历深度 (默认: 0，不限制)'
+    )
+
+    parser.add_argument(
+        '--graph-all',
+        action='store_true',
+        help='--graph 时也展开第三方组件的依赖（默认只展开 -g 指定的 groupId）'
+    )
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=8,
+        help='批量查询时的并发线程数 (默认: 8)；--scan 时也是解析构建文件的进程数上限'
+    )
+
+    parser.add_argument(
+        '-g', '--group',
+        dest='groups',
+        nargs='+',
+        metavar='GROUP',
+        default=['cn.tannn.jdevelops'],
+        help='指定 groupId，可以是多个（也支持逗号分隔），多个 groupId 并发查询 (默认: cn.tannn.jdevelops)'
+    )
+
+    parser.add_argument(
+        '-f', '--format',
+        choices=['table', 'maven', 'gradle', 'json', 'ndjson', 'csv', 'dot'],
+        default='table',
+        help='输出格式: table(表格), maven(Maven依赖), gradle(Gradle依赖), json(JSON格式), '
+             'ndjson/csv(逐行输出，每个 groupId 查询完成即输出), dot(Graphviz，仅用于 --graph)'
+    )
+
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='显示详细日志'
+    )
+
+    parser.add_argument(
+        '--proxy',
+        help='代理服务器地址，如 http://127.0.0.1:7890'
+    )
+
+    parser.add_argument(
+        '--race',
+        action='store_true',
+        help='并发查询所有仓库，采用最先返回的有效结果（适合某个仓库很慢或不可用时）'
+    )
+
+    parser.add_argument(
+        '--include-prerelease',
+        action='store_true',
+        help='最新版本包含 alpha/beta/milestone/rc 等预发布版本'
+    )
+
+    parser.add_argument(
+        '--include-snapshot',
+        action='store_true',
+        help='最新版本包含 SNAPSHOT 版本'
+    )
+
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        default=60,
+        help='每个组件（组件组、POM）查询的总时间预算（秒，默认: 60），0 表示不限制'
+    )
+
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='每个请求的最大尝试次数 (默认: 3)，只对连接错误、超时、429 和 5xx 重试'
+    )
+
+    parser.add_argument(
+        '--source',
+        choices=['local', 'remote', 'auto'],
+        default='remote',
+        help='查询来源: remote(远程仓库，默认), local(仅本地 ~/.m2 仓库), '
+             'auto(Maven 最近从远程刷新过本地元数据时直接使用本地信息，否则查询远程)'
+    )
+
+    parser.add_argument(
+        '--local-repo',
+        help='本地 Maven 仓库目录 (默认: ~/.m2/repository)'
+    )
+
+    parser.add_argument(
+        '--local-max-age',
+        type=int,
+        default=24 * 3600,
+        help='auto 模式下本地元数据距最近一次从远程刷新的最大可接受时长（秒，默认: 86400）'
+    )
+
+    parser.add_argument(
+        '--settings',
+        metavar='PATH',
+        help='Maven settings.xml 路径 (默认: ~/.m2/settings.xml)，其中的镜像、仓库、账号和代理会被使用；'
+             '环境变量 JDEVELOPS_MAVEN_REPOS 可追加仓库地址'
+    )
+
+    parser.add_argument(
+        '--static-order',
+        action='store_true',
+        help='按固定顺序查询仓库，不探测延迟，也不根据历史延迟/成功率调整顺序'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='不读取也不写入本地缓存'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='忽略缓存有效期，强制向仓库重新验证（未变化时仅返回 304）'
+    )
+
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=ResponseCache.DEFAULT_TTL,
+        help=f'缓存有效期（秒，默认: {ResponseCache.DEFAULT_TTL}），缓存位于 $XDG_CACHE_HOME/jdevelops-skill/'
+    )
+
+    parser.add_argument(
+        '--metrics-out',
+        metavar='PATH',
+        help='把每次 HTTP 请求的埋点（仓库、状态码、字节数、DNS/连接/TLS/首字节/总耗时、重试、缓存命中）'
+             '写入文件：*.prom 为 Prometheus textfile 格式，其他为 JSON Lines'
+    )
+
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='常驻服务未运行时在后台启动它，后续调用自动经由服务执行'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='不使用常驻服务，始终在当前进程中查询'
+    )
+
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help=f'以常驻服务方式运行，监听 Unix 套接字（空闲 {DAEMON_IDLE_TIMEOUT} 秒后自动退出）'
+    )
+
+    return parser
+
+
+def parse_args(argv: List[str]):
+    """解析并校验命令行参数"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    args.groups = list(dict.fromkeys(g for value in args.groups for g in value.replace(',', ' ').split()))
+    if not args.groups:
+        parser.error('未提供任何 groupId')
+    # 只针对单个 groupId 的功能使用第一个
+    args.group = args.groups[0]
+
+    if args.artifact and len(args.groups) > 1:
+        parser.error('-a 只能与单个 groupId 一起使用，组件坐标可写为 --graph groupId:artifactId')
+    if args.format == 'dot' and not args.graph:
+        parser.error('-f dot 只能与 --graph 一起使用')
+    if args.format in STREAM_FORMATS and args.graph:
+        parser.error(f'--graph 不支持 -f {args.format}，请使用 json 或 dot')
+    if args.watch and (args.scan or args.graph):
+        parser.error('--watch 不能与 --scan/--graph 一起使用')
+    return args
+
+
+# 影响 JDevelopsVersionChecker 行为的参数，常驻服务按这些参数复用查询器
+CHECKER_OPTIONS = (
+    'verbose', 'proxy', 'race', 'no_cache', 'refresh', 'cache_ttl', 'include_prerelease',
+    'include_snapshot', 'deadline', 'retries', 'static_order', 'source', 'local_repo', 'local_max_age', 'watch',
+    'settings', 'metrics_out'
+)
+
+
+def checker_key(args) -> Tuple:
+    """
+    常驻服务复用查询器的键
+
+    除 CHECKER_OPTIONS 外还包括 DAEMON_ENV 中环境变量的取值和 settings.xml 的修改时间，
+    环境或 settings.xml 变化后会创建新的查询器，结果与不经由服务时一致。
+    """
+    from maven_settings import default_settings_path
+
+    settings_path = args.settings or default_settings_path()
+    try:
+        settings_mtime = os.stat(settings_path).st_mtime_ns
+    except OSError:
+        settings_mtime = None
+    return (tuple(getattr(args, name) for name in CHECKER_OPTIONS),
+            tuple(os.environ.get(name) for name in DAEMON_ENV),
+            settings_path, settings_mtime)
+
+
+def build_checker(args) -> JDevelopsVersionChecker:
+    """根据命令行参数创建查询器"""
+    from maven_settings import load_settings
+
+    if args.metrics_out:
+        from request_metrics import RequestMetrics
+
+    if args.watch:
+        # 监视模式每次都向远程仓库发起条件请求；条件请求依赖缓存的 ETag，--no-cache 时只缓存在内存中
+        cache = ResponseCache(ttl=args.cache_ttl, persist=not args.no_cache)
+        source = 'remote'
+    else:
+        cache = None if args.no_cache else ResponseCache(ttl=args.cache_ttl)
+        source = args.source
+    return JDevelopsVersionChecker(
+        verbose=args.verbose,
+        proxy=args.proxy,
+        race=args.race,
+        cache=cache,
+        refresh=args.refresh or args.watch,
+        include_prereleases=args.include_prerelease,
+        include_snapshots=args.include_snapshot,
+        retry_policy=RetryPolicy(max_attempts=args.retries, deadline=args.deadline or None),
+        health=None if args.static_order else RepoHealth(),
+        source=source,
+        local_index=LocalRepoIndex(root=args.local_repo),
+        local_max_age=args.local_max_age,
+        pom_store=None if args.no_cache else PomStore(),
+        settings=load_settings(args.settings),
+        metrics=RequestMetrics(args.metrics_out) if args.metrics_out else None
+    )
+
+
+def run(args, checker: JDevelopsVersionChecker):
+    """执行查询并输出结果"""
+    if args.scan:
+        run_scan(args, checker)
+        return
+
+    if args.graph:
+        run_graph(args, checker)
+        return
+
+    if args.watch:
+        artifact_ids = read_artifact_ids(args.artifact) if args.artifact else None
+        target = ', '.join(f"{args.group}:{a}" for a in artifact_ids) if artifact_ids else ', '.join(args.groups)
+        print(f"👀 开始监视 {target}（最短间隔 {args.watch_interval:g} 秒，Ctrl+C 停止）", file=sys.stderr)
+        sys.exit(checker.watch(
+            args.groups,
+            artifact_ids=artifact_ids,
+            interval=args.watch_interval,
+            max_interval=args.watch_max_interval,
+            discover_interval=args.watch_discover,
+            hook=args.watch_hook,
+            workers=args.workers,
+            cycles=args.watch_cycles
+        ))
+
+    status = status_stream(args.format)
+    if args.artifact:
+        artifact_ids = read_artifact_ids(args.artifact)
+        if not artifact_ids:
+            print("❌ 未提供任何 artifactId", file=status)
+            sys.exit(1)
+
+    if args.artifact and len(artifact_ids) == 1:
+        # 查询单个组件
+        print(f"🔍 正在查询组件: {args.group}:{artifact_ids[0]}", file=status)
+        try:
+            artifact = checker.search_artifact(artifact_ids[0], args.group)
+        except DeadlineExceeded as e:
+            print(f"⏱️  查询超时（{e}），无法确定组件是否存在: {artifact_ids[0]}", file=status)
+            sys.exit(1)
+
+        if artifact:
+            if args.format == 'maven':
+                print_maven_dependency(artifact)
+            elif args.format == 'gradle':
+                print_gradle_dependency(artifact)
+            elif args.format == 'json':
+                print(json.dumps(artifact, indent=2, ensure_ascii=False))
+            elif args.format in STREAM_FORMATS:
+                write_rows([artifact], args.format)
+            else:  # table
+                print(f"\n✅ 最新版本: {artifact['version']}")
+                print(f"📦 完整坐标: {artifact['groupId']}:{artifact['artifactId']}:{artifact['version']}")
+        else:
+            print(f"❌ 未找到组件: {artifact_ids[0]}", file=status)
+            sys.exit(1)
+    elif args.artifact:
+        # 批量查询多个组件
+        print(f"🔍 正在查询 {len(artifact_ids)} 个 {args.group} 组件...", file=status)
+        artifacts, missing, timed_out = checker.search_artifacts(artifact_ids, args.group, workers=args.workers)
+
+        if artifacts:
+            print_artifacts(artifacts, args.format)
+        if missing:
+            print(f"❌ 未找到组件: {', '.join(missing)}", file=status)
+        if timed_out:
+            print(f"⏱️  查询超时，无法确定组件是否存在: {', '.join(timed_out)}", file=status)
+        if missing or timed_out:
+            sys.exit(1)
+    else:
+        # 查询所有组件：多个 groupId 并发查询，每个 groupId 完成后立即输出，不在内存中累积
+        print(f"🔍 正在查询所有 {', '.join(args.groups)} 组件...", file=status)
+        collected = []
+        failed = []
+        header = True
+        for group_id, artifacts in checker.search_groups(args.groups):
+            if not artifacts:
+                failed.append(group_id)
+            elif args.format == 'json':
+                # JSON 数组只能在全部完成后输出
+                collected.extend(artifacts)
+            else:
+                if args.format == 'table' and len(args.groups) > 1:
+                    print(f"\n📦 {group_id}")
+                print_artifacts(artifacts, args.format, header=header)
+                header = False
+
+        if collected:
+            print_artifacts(collected, args.format)
+        if args.format == 'table' and len(failed) < len(args.groups):
+            print("\n💡 提示:")
+            print("  - 查看特定组件详情: python query_versions.py -a <artifactId>")
+            print("  - 生成 Maven 依赖: python query_versions.py -a <artifactId> -f maven")
+            print("  - 生成 Gradle 依赖: python query_versions.py -a <artifactId> -f gradle")
+        if failed:
+            print(f"❌ 未找到任何组件: {', '.join(failed)}", file=status)
+            sys.exit(1)
+
+
+def daemon_socket_path() -> str:
+    """常驻服务的 Unix 套接字路径（位于仅当前用户可访问的目录）"""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base:
+        directory = os.path.join(base, 'jdevelops-skill')
+    else:
+        directory = os.path.join(ResponseCache.default_dir(), 'run')
+    return os.path.join(directory, 'query_versions.sock')
+
+
+def run_via_daemon(argv: List[str]) -> Optional[int]:
+    """
+    把命令交给常驻服务执行
+
+    Returns:
+        退出码；服务不可用时返回 None，由调用方在当前进程中执行
+    """
+    import socket
+
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = daemon_socket_path()
+    if not os.path.exists(path):
+        return None
+
+    # 转交全部环境变量：查询器在服务进程中按客户端的环境创建（settings.xml 中的 ${env.NAME} 也能展开）
+    request = {'argv': argv, 'cwd': os.getcwd(), 'env': dict(os.environ)}
+    if '-' in argv:
+        # -a - 从标准输入读取，需要由客户端读取后转交
+        request['stdin'] = sys.stdin.read()
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(DAEMON_CONNECT_TIMEOUT)
+            client.connect(path)
+            client.settimeout(None)
+            client.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8'))
+            client.shutdown(socket.SHUT_WR)
+            response = json.loads(_recv_all(client))
+    except (OSError, ValueError):
+        if 'stdin' in request:
+            # 标准输入已被读取，只能在本进程中继续用读到的内容执行
+            sys.stdin = io.StringIO(request['stdin'])
+        return None
+
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    return response.get('code', 1)
+
+
+def _recv_all(conn) -> bytes:
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def spawn_daemon():
+    """在后台启动常驻服务（与当前终端会话分离）"""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'query_versions.py'), '--serve'],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True
+    )
+
+
+def serve(socket_path: Optional[str] = None, idle_timeout: int = 0) -> int:
+    """
+    以常驻服务方式运行
+
+    每个请求携带一次命令行参数、工作目录和环境变量，服务端按 checker_key 复用已预热的查询器
+    （Session、连接池、内存中的缓存），在当前进程内以客户端的环境执行，返回标准输出、标准错误和退出码。请求串行处理；空闲超时后退出。
+    客户端只转交耗时短的 -a 查询（见 daemon_eligible），长时间运行的命令不会占用服务。
+
+    Args:
+        socket_path: Unix 套接字路径，默认为 daemon_socket_path()
+        idle_timeout: 空闲多少秒后退出，默认为 DAEMON_IDLE_TIMEOUT
+    """
+    import signal
+    import socket
+
+    # 收到 SIGTERM 时也走正常退出流程，清理套接字并写回缓存
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    path = socket_path or daemon_socket_path()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+                print(f"⚠️  常驻服务已在运行: {path}", file=sys.stderr)
+                return 1
+            except OSError:
+                # 上次的服务异常退出，遗留了套接字文件
+                os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    server.settimeout(idle_timeout or DAEMON_IDLE_TIMEOUT)
+    print(f"✅ 常驻服务已启动: {path}", file=sys.stderr)
+
+    checkers: Dict[Tuple, JDevelopsVersionChecker] = {}
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                print("💤 空闲超时，常驻服务退出", file=sys.stderr)
+                return 0
+            with conn:
+                try:
+                    request = json.loads(_recv_all(conn))
+                    response = _handle_request(request, checkers)
+                    conn.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  处理请求失败: {e}", file=sys.stderr)
+    finally:
+        server.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        for checker in checkers.values():
+            checker.flush()
+
+
+def _handle_request(request: Dict, checkers: Dict[Tuple, JDevelopsVersionChecker]) -> Dict:
+    """在服务进程中执行一次命令，捕获其输出和退出码"""
+    from contextlib import redirect_stderr, redirect_stdout
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    old_stdin, old_cwd, old_env = sys.stdin, os.getcwd(), dict(os.environ)
+    code = 0
+    try:
+        sys.stdin = io.StringIO(request.get('stdin') or '')
+        os.chdir(request.get('cwd') or old_cwd)
+        if request.get('env') is not None:
+            # 请求串行处理，可以直接替换进程的环境变量
+            os.environ.clear()
+            os.environ.update(request['env'])
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                args = parse_args(request.get('argv', []))
+                key = checker_key(args)
+                checker = checkers.get(key)
+                if checker is None:
+                    if len(checkers) >= DAEMON_MAX_CHECKERS:
+                        checkers.pop(next(iter(checkers))).flush()
+                    checker = checkers[key] = build_checker(args)
+                try:
+                    run(args, checker)
+                finally:
+                    checker.flush()
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                print(f"❌ 查询出错: {e}", file=sys.stderr)
+                code = 1
+    finally:
+        sys.stdin = old_stdin
+        os.chdir(old_cwd)
+        if os.environ != old_env:
+            os.environ.clear()
+            os.environ.update(old_env)
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'code': code}
+
+
+def daemon_eligible(args) -> bool:
+    """
+    命令是否经由常驻服务执行
+
+    服务串行处理请求，命令结束后才一次性返回输出，因此只转交耗时短的 -a 查询。
+    --scan、--graph、查询整个 groupId 耗时长且需要边查询边输出，--watch 长期运行，
+    --metrics-out 需要记录本进程发出的请求，这些都在当前进程中执行，不会阻塞其他客户端。
+    """
+    return bool(args.artifact) and not (args.no_daemon or args.watch or args.metrics_out)
+
+
+def main():
+    """主函数"""
+    argv = sys.argv[1:]
+
+    if '--serve' in argv:
+        sys.exit(serve())
+
+    args = parse_args(argv)
+    eligible = daemon_eligible(args)
+    if eligible:
+        code = run_via_daemon(argv)
+        if code is not None:
+            sys.exit(code)
+    # 服务不可用时启动它；不经由服务的命令只在套接字不存在时启动，避免每次都拉起一个立即退出的进程
+    if args.daemon and not args.no_daemon and (eligible or not os.path.exists(daemon_socket_path())):
+        spawn_daemon()
+
+    run(args, build_checker(args))
+
+
+if __name__ == '__main__':
+    main()
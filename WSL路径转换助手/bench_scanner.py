@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+路径扫描器的性能与正确性基准
+
+1. 对抗性输入：对每类输入按 16KB → 1MB 逐级放大，测量 extract_windows_paths
+   和 find_windows_paths 的每字节耗时（--legacy 同时测量旧版）。线性时间的扫描器每字节耗时应基本不变，
+   最大规模与最小规模的比值超过 --max-growth 即判定为失败。
+2. 差分测试：用随机生成的单行文本比较 extract_windows_paths 与旧版实现（嵌套量词的正则 + 列表去重）的结果，
+   必须完全一致。旧版的路径可以跨越换行，新版在换行处结束路径，因此随机文本中不含换行；
+   旧版补上了与新版相同的盘符左边界（盘符前不能紧跟字母、数字或下划线）。
+3. 流式切分：构造超过 MAX_PENDING_CHARS 仍没有换行等分隔字符的输入，让路径恰好跨过读取块的边界（即强制切分点），
+   逐片段扫描的结果必须与整体扫描一致，且没有片段边界落在路径内部。
+4. 改写回归：--rewrite 不能改动不含Windows路径的配置文件（如 YAML 的 name: app、host:/path），
+   --dry-run 不能输出差异；含有路径的文件只转换路径本身，正文中路径后面的文字不能被并入路径。
+
+用法:
+    python3 bench_scanner.py
+    python3 bench_scanner.py --fuzz 20000 --max-growth 2.5
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from path_converter import is_wsl
+from smart_converter import (STREAM_CHUNK_SIZE, _stream_pieces, extract_windows_paths, find_rewritable_paths,
+                             find_windows_paths, rewrite_tree)
+
+# 旧版实现（加上盘符左边界），作为差分测试的参照和性能基线
+LEGACY_PATH_PATTERN = re.compile(r'(?<![A-Za-z0-9_])[a-zA-Z]:[/\\](?:[a-zA-Z0-9\s._\-()]+[/\\])*[a-zA-Z0-9\s._\-()]+')
+LEGACY_DRIVE_PATTERN = re.compile(r'(?<![A-Za-z0-9_])([a-zA-Z]:)(?=[\s，。、；：！？,;]|$)')
+
+
+def legacy_extract_windows_paths(text):
+    """旧版 extract_windows_paths"""
+    found_paths = []
+    for match in LEGACY_PATH_PATTERN.finditer(text):
+        path = match.group(0).rstrip('.,;:!?/\\，。、；：！？ ')
+        if path and len(path) > 3:
+            if path not in found_paths:
+                found_paths.append(path)
+    for match in LEGACY_DRIVE_PATTERN.finditer(text):
+        path = match.group(1)
+        is_part_of_longer = any(
+            existing.startswith(path + '/') or existing.startswith(path + '\\')
+            for existing in found_paths
+        )
+        if not is_part_of_longer and path not in found_paths:
+            found_paths.append(path)
+    return found_paths
+
+
+def repeat_to(unit, size):
+    """把 unit 重复到约 size 个字符"""
+    return unit * max(1, size // len(unit))
+
+
+# 名称 -> 按大小生成输入的函数
+ADVERSARIAL_INPUTS = {
+    # 长串空白后跟无法结束路径的双斜杠
+    'whitespace-run': lambda size: 'C:\\' + ' ' * size + '\\\\',
+    # 大量路径组件，最后以双斜杠 + 非路径字符结尾
+    'deep-components': lambda size: 'C:\\' + repeat_to('a \\', size) + '\\中',
+    # 空白与斜杠交替
+    'space-slash': lambda size: 'C:\\' + repeat_to(' \\', size) + '，',
+    # 大量互不相同的路径（旧版去重为 O(n²)）
+    'many-unique-paths': lambda size: ''.join(f'C:\\dir{i} ' for i in range(size // 10)),
+    # 大量单独盘符与完整路径混合（旧版盘符检查为 O(盘符数 × 路径数)）
+    'many-drives': lambda size: ''.join(f'{chr(65 + i % 26)}: D:\\p{i} ' for i in range(size // 12)),
+    # 只有 字母+冒号，没有斜杠
+    'letter-colon': lambda size: repeat_to('a:', size),
+    # 无路径的中文长文本
+    'plain-text': lambda size: repeat_to('这是一段没有路径的普通文本，包含标点：逗号、句号。', size),
+}
+
+SIZES = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024)
+
+# 旧版在部分输入上是二次的，只测量到这个规模
+LEGACY_MAX_SIZE = 64 * 1024
+
+
+def ns_per_byte(function, text, repeat=3):
+    """取 repeat 次中的最小耗时"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e9 / len(text)
+
+
+def run_adversarial(max_growth, legacy):
+    """返回是否全部通过"""
+    functions = [('extract', extract_windows_paths), ('find', find_windows_paths)]
+    if legacy:
+        functions.append(('legacy', legacy_extract_windows_paths))
+
+    header = f"{'输入':<20} {'函数':<8}" + ''.join(f"{size // 1024:>9}KB" for size in SIZES) + f"{'增长':>8}"
+    print(header)
+    print('-' * len(header))
+    passed = True
+    for name, generate in ADVERSARIAL_INPUTS.items():
+        texts = [generate(size) for size in SIZES]
+        for label, function in functions:
+            costs = [ns_per_byte(function, text) for text in texts
+                     if label != 'legacy' or len(text) <= LEGACY_MAX_SIZE]
+            growth = costs[-1] / costs[0]
+            failed = label != 'legacy' and growth > max_growth
+            passed = passed and not failed
+            cells = [f"{cost:>9.1f}ns" for cost in costs] + [f"{'-':>11}"] * (len(SIZES) - len(costs))
+            print(f"{name:<20} {label:<8}" + ''.join(cells) + f"{growth:>7.1f}x" + (' ❌' if failed else ''))
+    return passed
+
+
+def random_text(rng, length):
+    alphabet = ['C', 'd', 'Z', 'a', '1', ':', '\\', '/', ' ', '\t', '.', '-', '(', ')',
+                '中', '，', '。', '：', ',', ';', '!', '?']
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def run_fuzz(cases, seed):
+    """返回不一致的用例数"""
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(cases):
+        text = random_text(rng, rng.randint(0, 80))
+        expected = legacy_extract_windows_paths(text)
+        actual = extract_windows_paths(text)
+        if actual != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"❌ 不一致: {text!r}\n   旧版: {expected}\n   新版: {actual}")
+    return mismatches
+
+
+# 不含换行等分隔字符的填充内容（只有路径字符、斜杠和冒号），流式转换只能强制切分
+STREAM_FILLER = ('a ', 'x.y ', 'a:b ', 'C:\\tmp ', 'dir/sub ', 'Q ')
+
+# 跨过强制切分点的路径
+STREAM_PATHS = ('C:\\Program Files\\App\\bin\\app.exe', 'D:/work/my project/src', 'E:\\a', 'z:\\x\\')
+
+
+def stream_spans(text):
+    """按流式转换的切分方式逐片段扫描，返回 (各片段中的路径位置, 片段边界)"""
+    spans = []
+    boundaries = []
+    offset = 0
+    for piece in _stream_pieces(io.BytesIO(text.encode('utf-8'))):
+        spans.extend((start + offset, end + offset, path) for start, end, path in find_windows_paths(piece))
+        offset += len(piece)
+        boundaries.append(offset)
+    return spans, boundaries[:-1]
+
+
+def run_stream_check(cases, seed):
+    """返回不一致的用例数"""
+    rng = random.Random(seed)
+    mismatches = 0
+    for case in range(cases):
+        filler = rng.choice(STREAM_FILLER)
+        path = STREAM_PATHS[case % len(STREAM_PATHS)]
+        # 第一块读满 STREAM_CHUNK_SIZE 个字符后强制切分，路径从切分点之前若干个字符开始
+        before = repeat_to(filler, STREAM_CHUNK_SIZE)[:STREAM_CHUNK_SIZE - rng.randint(1, len(path) + 2)]
+        after = repeat_to(filler, rng.randint(1, 3) * STREAM_CHUNK_SIZE)
+        # 路径字符包括空白，填充内容会接在路径后面：用冒号结束路径，否则整个剩余部分都是一个超长路径
+        text = before + rng.choice(('', ' ', '(')) + path + ': ' + after
+        expected = find_windows_paths(text)
+        actual, boundaries = stream_spans(text)
+        inside = [b for b in boundaries for start, end, _ in expected if start < b < end]
+        if actual != expected or inside:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"❌ 流式切分不一致: 填充 {filler!r}，路径 {path!r}，片段边界落在路径内部: {inside}")
+    print(f"流式切分: {cases} 个用例，{mismatches} 个不一致")
+    return mismatches
+
+
+# 不含Windows路径的配置文件，改写后必须逐字节不变
+REWRITE_UNCHANGED = {
+    'app.yml': 'name: app\nhost:/path\nlogLevel: debug\nx: 1\nserver:\n  port: 8080\n',
+    'app.properties': 'spring.datasource.url=jdbc:mysql://db:3306/app\nremote=user@host:/srv/data\n',
+}
+
+# 含有路径的文件：只转换路径，键名不变
+REWRITE_CONVERTED = ('paths.yml', 'name: app\nlogDir: C:\\logs\\app\n', 'name: app\nlogDir: {c}/logs/app\n')
+
+
+# 正文中的路径 -> --rewrite 应转换的路径：路径后面的文字不属于路径，含空白的路径只有加了引号才转换
+REWRITE_PROSE = {
+    'C:\\tmp\\a.txt to D:\\b': ['C:\\tmp\\a.txt', 'D:\\b'],
+    'open C:\\Users\\me\\file.txt now please': ['C:\\Users\\me\\file.txt'],
+    'install to "C:\\Program Files\\App" first': ['C:\\Program Files\\App'],
+    'install to C:\\Program Files\\App first': [],
+}
+
+
+def run_rewrite_check():
+    """返回失败的检查项列表"""
+    failures = []
+    # 扫描器本身（与 --rewrite 一样不含单独的盘符）：键名中的 "字母:" 不能被识别为盘符
+    for name, text in REWRITE_UNCHANGED.items():
+        spans = find_windows_paths(text, bare_drives=False)
+        if spans:
+            failures.append(f"{name}: 误识别 {spans}")
+    for text, expected in REWRITE_PROSE.items():
+        spans, _ = find_rewritable_paths(text)
+        actual = [path for _, _, path in spans]
+        if actual != expected:
+            failures.append(f"{text!r}: 期望 {expected}，实际 {actual}")
+
+    if not is_wsl():
+        print("改写回归: 不在WSL环境中，只检查了扫描结果")
+        return failures
+
+    with tempfile.TemporaryDirectory() as root:
+        for name, text in REWRITE_UNCHANGED.items():
+            with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        name, text, _ = REWRITE_CONVERTED
+        with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+        with open(os.path.join(root, 'notes.md'), 'w', encoding='utf-8') as f:
+            f.write(''.join(line + '\n' for line in REWRITE_PROSE))
+
+        for dry_run in (True, False):
+            for result in rewrite_tree(root, dry_run=dry_run, jobs=1):
+                filename = os.path.basename(result['path'])
+                if filename in REWRITE_UNCHANGED and (result['status'] != 'unchanged' or result['diff']):
+                    failures.append(f"{filename}: dry_run={dry_run} 时被改动:\n{result['diff'] or ''}")
+
+        for name, text in REWRITE_UNCHANGED.items():
+            with open(os.path.join(root, name), 'rb') as f:
+                if f.read() != text.encode('utf-8'):
+                    failures.append(f"{name}: 改写后内容不同")
+
+        name, _, expected = REWRITE_CONVERTED
+        with open(os.path.join(root, name), encoding='utf-8') as f:
+            actual = f.read()
+        from path_converter import convert_windows_path_to_wsl
+        expected = expected.format(c=convert_windows_path_to_wsl('C:\\').rstrip('/'))
+        if actual != expected:
+            failures.append(f"{name}: 期望 {expected!r}，实际 {actual!r}")
+
+        with open(os.path.join(root, 'notes.md'), encoding='utf-8') as f:
+            actual = f.read().splitlines()
+        for line, paths, converted in zip(REWRITE_PROSE, REWRITE_PROSE.values(), actual):
+            expected = line
+            for path in paths:
+                expected = expected.replace(path, convert_windows_path_to_wsl(path), 1)
+            if converted != expected:
+                failures.append(f"notes.md: 期望 {expected!r}，实际 {converted!r}")
+
+    print(f"改写回归: {len(failures)} 个失败")
+    return failures
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='路径扫描器的性能与正确性基准')
+    parser.add_argument('--max-growth', type=float, default=3.0,
+                        help='1MB 与 16KB 输入的每字节耗时之比的上限 (默认: 3.0)')
+    parser.add_argument('--fuzz', type=int, default=5000, help='差分测试的随机用例数 (默认: 5000)')
+    parser.add_argument('--stream-cases', type=int, default=24, help='流式切分的用例数 (默认: 24)')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子 (默认: 0)')
+    parser.add_argument('--legacy', action='store_true',
+                        help=f'同时测量旧版实现（最大到 {LEGACY_MAX_SIZE // 1024}KB）')
+    args = parser.parse_args()
+
+    passed = run_adversarial(args.max_growth, args.legacy)
+    mismatches = run_fuzz(args.fuzz, args.seed)
+    print(f"\n差分测试: {args.fuzz} 个随机用例，{mismatches} 个不一致")
+    stream_mismatches = run_stream_check(args.stream_cases, args.seed)
+    rewrite_failures = run_rewrite_check()
+    for failure in rewrite_failures:
+        print(f"❌ {failure}")
+
+    if not passed or mismatches or stream_mismatches or rewrite_failures:
+        print("❌ 基准未通过", file=sys.stderr)
+        return 1
+    print("✓ 扫描时间与输入长度成线性关系，结果与旧版一致，流式切分不会拆开路径，改写不会破坏配置文件")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,17 +8,61 @@ WSL路径转换工具
     python3 path_converter.py "C:\\Users\\tan\\Documents"
     python3 path_converter.py --verify "D:\\projects\\my-app"
     python3 path_converter.py "C:\\path1" "D:\\path2" "E:\\path3"
+    cat windows_paths.txt | python3 path_converter.py --stdin
+    find . -print0 | python3 path_converter.py --stdin -0
 """
 
 import re
 import os
 import sys
+import stat
 import argparse
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
+# 盘符路径：C:\path 或 C: 或 C:/path（盘符必须是字母，后面跟冒号）
+WINDOWS_PATH_PATTERN = re.compile(r'^[a-zA-Z]:[/\\]?')
 
+# 盘符 + 冒号 + 可选的斜杠 + 剩余路径
+DRIVE_PATH_PATTERN = re.compile(r'^([a-zA-Z]):[/\\]?(.*)$')
+
+# --stdin 模式每次读取的字节数
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# 挂载表和WSL配置文件
+MOUNTINFO_PATH = '/proc/self/mountinfo'
+WSL_CONF_PATH = '/etc/wsl.conf'
+
+# /etc/wsl.conf 未配置 [automount] root 时Windows盘符的挂载根目录
+DEFAULT_AUTOMOUNT_ROOT = '/mnt/'
+
+# WSL挂载Windows盘符使用的文件系统类型（WSL1为drvfs，WSL2为9p/virtiofs）
+DRVFS_TYPES = ('drvfs', '9p', 'virtiofs')
+
+# mountinfo 中以八进制转义的字符，如空格为 \040、反斜杠为 \134
+MOUNTINFO_ESCAPE_PATTERN = re.compile(r'\\([0-7]{3})')
+
+# 挂载源或 path= 选项中的盘符根目录：C: 或 C:\ 或 C:/
+DRIVE_ROOT_PATTERN = re.compile(r'^([a-zA-Z]):[/\\]?$')
+
+# 并行验证路径的线程数（drvfs/9p 上每次 stat 都是一次跨虚拟机的往返，时间主要花在等待上）
+VERIFY_WORKERS = 16
+
+# 同一目录下待验证的路径达到这个数量时，用一次 scandir 读取整个目录代替逐个 stat
+LISTING_MIN_SIBLINGS = 4
+
+# 目录列表缓存最多保留的目录数，超过后清空
+LISTING_CACHE_SIZE = 1024
+
+# 目录列表缓存中表示目录不存在的标记
+_MISSING_DIRECTORY = object()
+
+
+@lru_cache(maxsize=None)
 def is_wsl():
     """
-    检测是否运行在WSL环境中
+    检测是否运行在WSL环境中（结果在进程内缓存，只检测一次）
 
     返回:
         bool: True表示在WSL环境中，False表示不在
@@ -38,8 +82,8 @@ def is_wsl():
                 if 'microsoft' in osrelease:
                     return True
 
-        # 方法3：检查 /mnt/c 是否存在（WSL的Windows盘符挂载点）
-        if os.path.exists('/mnt/c'):
+        # 方法3：WSL为所有进程设置的环境变量（自定义内核时前两种方法可能失效）
+        if os.environ.get('WSL_DISTRO_NAME') or os.environ.get('WSL_INTEROP'):
             return True
 
         return False
@@ -67,33 +111,173 @@ def is_windows_path(path):
     if not path or not isinstance(path, str):
         return False
 
-    # 匹配盘符路径：C:\path 或 C: 或 C:/path
-    # 盘符必须是字母，后面跟冒号
-    pattern = r'^[a-zA-Z]:[/\\]?'
-    return bool(re.match(pattern, path))
+    return WINDOWS_PATH_PATTERN.match(path) is not None
 
 
-def convert_windows_path_to_wsl(path):
+def read_automount_root(path=WSL_CONF_PATH):
+    """
+    读取 /etc/wsl.conf 中 [automount] 的 root
+
+    参数:
+        path: wsl.conf 路径
+
+    返回:
+        str: 以 / 结尾的挂载根目录，未配置时为 /mnt/
+    """
+    import configparser
+
+    parser = configparser.ConfigParser(interpolation=None, strict=False, inline_comment_prefixes=('#', ';'))
+    try:
+        parser.read(path, encoding='utf-8')
+    except (configparser.Error, UnicodeDecodeError) as e:
+        print(f"[警告] 无法解析 {path}: {e}", file=sys.stderr)
+        return DEFAULT_AUTOMOUNT_ROOT
+
+    root = parser.get('automount', 'root', fallback='').strip().strip('"\'')
+    if not root:
+        return DEFAULT_AUTOMOUNT_ROOT
+    return root if root.endswith('/') else root + '/'
+
+
+def _unescape_mountinfo(field):
+    return MOUNTINFO_ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1), 8)), field)
+
+
+def parse_drive_mounts(mountinfo):
+    """
+    从 /proc/self/mountinfo 的内容中找出Windows盘符的挂载点
+
+    只取挂载了整个盘符的 drvfs/9p/virtiofs 条目（root 为 /），
+    盘符取自挂载源（如 C: 或 C:\\）或 path= 选项；同一盘符有多个挂载点时取最早的一个。
+
+    参数:
+        mountinfo: mountinfo 文件内容
+
+    返回:
+        dict: 小写盘符 -> 挂载点，如 {'c': '/mnt/c'}
+    """
+    drives = {}
+    for line in mountinfo.splitlines():
+        # 格式: ID 父ID 主:次 root 挂载点 选项 [可选字段...] - 类型 来源 超级块选项
+        fields, separator, rest = line.partition(' - ')
+        if not separator:
+            continue
+        fields, rest = fields.split(), rest.split()
+        if len(fields) < 5 or len(rest) < 2 or rest[0] not in DRVFS_TYPES:
+            continue
+        if _unescape_mountinfo(fields[3]) != '/':
+            continue
+
+        drive_match = DRIVE_ROOT_PATTERN.match(_unescape_mountinfo(rest[1]))
+        if not drive_match and len(rest) > 2:
+            for option in re.split(r'[,;]', _unescape_mountinfo(rest[2])):
+                if option.startswith('path='):
+                    drive_match = DRIVE_ROOT_PATTERN.match(option[len('path='):])
+                    break
+        if drive_match:
+            drives.setdefault(drive_match.group(1).lower(), _unescape_mountinfo(fields[4]))
+    return drives
+
+
+class DriveMap(dict):
+    """盘符 -> 挂载点；未挂载的盘符按 automount.root 推断（WSL自动挂载时会使用的位置）"""
+
+    def __init__(self, drives, automount_root):
+        super().__init__(drives)
+        self.automount_root = automount_root
+
+    def __missing__(self, drive):
+        return self.automount_root + drive
+
+
+class MountTable:
+    """
+    Windows盘符的挂载表
+
+    解析一次 /proc/self/mountinfo 和 /etc/wsl.conf 并缓存结果。保持 mountinfo 打开，
+    挂载发生变化时内核会对它报告 POLLPRI，此时才重新解析，因此每次查询只需一次非阻塞 poll。
+    """
+
+    def __init__(self, mountinfo_path=MOUNTINFO_PATH, wsl_conf_path=WSL_CONF_PATH):
+        """
+        参数:
+            mountinfo_path: mountinfo 文件路径
+            wsl_conf_path: wsl.conf 文件路径
+        """
+        self.mountinfo_path = mountinfo_path
+        self.automount_root = read_automount_root(wsl_conf_path)
+        self._file = None
+        self._poller = None
+        self._drives = None
+
+    def drives(self):
+        """
+        当前的盘符对照表
+
+        返回:
+            DriveMap: 小写盘符 -> 挂载点
+        """
+        if self._drives is None or self._changed():
+            self._drives = DriveMap(self._load(), self.automount_root)
+        return self._drives
+
+    def mountpoint(self, drive):
+        """盘符对应的挂载点"""
+        return self.drives()[drive.lower()]
+
+    def _changed(self):
+        return self._poller is not None and bool(self._poller.poll(0))
+
+    def _load(self):
+        try:
+            if self._file is None:
+                self._file = open(self.mountinfo_path, 'rb')
+                import select
+
+                if hasattr(select, 'poll'):
+                    self._poller = select.poll()
+                    self._poller.register(self._file, select.POLLPRI)
+            self._file.seek(0)
+            content = self._file.read()
+        except OSError:
+            # 不在Linux上或没有 /proc：全部按 automount.root 推断
+            return {}
+        return parse_drive_mounts(content.decode('utf-8', 'surrogateescape'))
+
+
+_mount_table = None
+
+
+def mount_table():
+    """进程内共享的挂载表（首次调用时创建）"""
+    global _mount_table
+    if _mount_table is None:
+        _mount_table = MountTable()
+    return _mount_table
+
+
+def convert_windows_path_to_wsl(path, drives=None):
     """
     转换Windows路径为WSL路径
 
-    转换规则:
+    盘符按实际挂载表转换（默认配置下为 /mnt/<盘符>），转换规则:
     - C:\\Users\\tan -> /mnt/c/Users/tan
     - C: -> /mnt/c
     - D:\\projects -> /mnt/d/projects
+    - /etc/wsl.conf 设置 automount.root = / 时：C:\\Users -> /c/Users
 
     参数:
         path: Windows路径字符串
+        drives: 盘符对照表（mount_table().drives() 的结果），批量转换时传入以免重复检查挂载表
 
     返回:
         str: 转换后的WSL路径
     """
-    if not is_windows_path(path):
+    if not path or not isinstance(path, str):
         return path
 
-    # 提取盘符和剩余路径
-    # 匹配: 盘符 + 冒号 + 可选的斜杠 + 剩余路径
-    drive_match = re.match(r'^([a-zA-Z]):[/\\]?(.*)$', path)
+    # 提取盘符和剩余路径（不是Windows路径时不匹配）
+    drive_match = DRIVE_PATH_PATTERN.match(path)
     if not drive_match:
         return path
 
@@ -107,18 +291,33 @@ def convert_windows_path_to_wsl(path):
     rest_path = rest_path.lstrip('/')
 
     # 构建WSL路径
+    if drives is None:
+        drives = mount_table().drives()
+    mountpoint = drives[drive]
     if rest_path:
-        wsl_path = f"/mnt/{drive}/{rest_path}"
+        wsl_path = f"{mountpoint.rstrip('/')}/{rest_path}"
     else:
-        wsl_path = f"/mnt/{drive}"
+        wsl_path = mountpoint
 
     return wsl_path
 
 
+def _describe_existing(is_file, is_dir):
+    """已存在的路径的验证结果"""
+    if is_file:
+        return True, "✓ 文件存在"
+    if is_dir:
+        return True, "✓ 目录存在"
+    return True, "✓ 路径存在（其他类型）"
+
+
 def verify_path_exists(path):
     """
     验证路径是否存在
 
+    只调用一次 os.stat，由返回的文件类型区分文件、目录和其他类型
+    （分别调用 exists/isfile/isdir 最多需要三次，在 /mnt/c 上每次都是一次跨虚拟机的往返）。
+
     参数:
         path: 要验证的路径
 
@@ -126,17 +325,115 @@ def verify_path_exists(path):
         tuple: (exists: bool, message: str)
     """
     try:
-        if os.path.exists(path):
-            if os.path.isfile(path):
-                return True, f"✓ 文件存在"
-            elif os.path.isdir(path):
-                return True, f"✓ 目录存在"
-            else:
-                return True, f"✓ 路径存在（其他类型）"
-        else:
-            return False, f"✗ 路径不存在"
-    except Exception as e:
+        mode = os.stat(path).st_mode
+    except (FileNotFoundError, NotADirectoryError):
+        return False, "✗ 路径不存在"
+    except (OSError, ValueError) as e:
         return False, f"✗ 验证失败: {e}"
+    return _describe_existing(stat.S_ISREG(mode), stat.S_ISDIR(mode))
+
+
+class DirectoryListingCache:
+    """
+    父目录 -> 目录项的缓存：同一目录下的多个路径共用一次 scandir
+
+    目录项自带文件类型（d_type），查到的路径不需要再 stat。
+    drvfs 默认不区分大小写，目录中找不到同名项时仍用一次 os.stat 确认，结果与 verify_path_exists 一致。
+    可以在多个线程中共用。
+    """
+
+    def __init__(self, max_dirs=LISTING_CACHE_SIZE):
+        self.max_dirs = max_dirs
+        self._listings = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, directory):
+        return directory in self._listings
+
+    def listing(self, directory):
+        """
+        返回目录中的 {名称: DirEntry}
+
+        返回:
+            dict: 目录项；目录不存在时为 _MISSING_DIRECTORY；无法读取（如没有权限）时为 None
+        """
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+
+        try:
+            with os.scandir(directory) as entries:
+                listing = {entry.name: entry for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            listing = _MISSING_DIRECTORY
+        except OSError:
+            listing = None
+
+        with self._lock:
+            if len(self._listings) >= self.max_dirs:
+                self._listings.clear()
+            self._listings[directory] = listing
+        return listing
+
+    def verify(self, path):
+        """与 verify_path_exists 相同，但优先从父目录的列表中查找"""
+        parent, name = os.path.split(path)
+        # 根目录、以斜杠结尾（要求是目录）、. 和 .. 直接 stat
+        if not parent or name in ('', '.', '..'):
+            return verify_path_exists(path)
+
+        listing = self.listing(parent)
+        if listing is _MISSING_DIRECTORY:
+            return False, "✗ 路径不存在"
+        entry = listing.get(name) if listing is not None else None
+        if entry is None or entry.is_symlink():
+            # 不区分大小写的目录、无法列出的目录、符号链接（需要检查目标）
+            return verify_path_exists(path)
+        try:
+            return _describe_existing(entry.is_file(), entry.is_dir())
+        except OSError:
+            return verify_path_exists(path)
+
+
+def verify_many(paths, workers=VERIFY_WORKERS, cache=None):
+    """
+    并行验证多个路径是否存在
+
+    路径按父目录分组，各组在线程池中并行验证（stat 和 scandir 会释放 GIL）；
+    同一目录下的路径达到 LISTING_MIN_SIBLINGS 个（或该目录已被读取过）时共用一次 scandir，否则逐个 stat。
+
+    参数:
+        paths: 路径列表
+        workers: 线程数
+        cache: DirectoryListingCache，多次调用之间共用（如流式验证的各批之间），默认每次新建
+
+    返回:
+        list: 与 paths 顺序一致的 [(exists, message), ...]
+    """
+    cache = cache if cache is not None else DirectoryListingCache()
+    groups = {}
+    for index, path in enumerate(paths):
+        groups.setdefault(os.path.dirname(path), []).append(index)
+
+    results = [None] * len(paths)
+
+    def verify_group(parent, indexes):
+        if parent in cache or len(indexes) >= LISTING_MIN_SIBLINGS:
+            verify = cache.verify
+        else:
+            verify = verify_path_exists
+        for index in indexes:
+            results[index] = verify(paths[index])
+
+    if workers <= 1 or len(groups) <= 1:
+        for parent, indexes in groups.items():
+            verify_group(parent, indexes)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            # list() 等待全部完成并抛出工作线程中的异常
+            list(pool.map(verify_group, groups.keys(), groups.values()))
+    return results
 
 
 def convert_path(path, verify=False, verbose=False):
@@ -183,6 +480,84 @@ def convert_path(path, verify=False, verbose=False):
     return result
 
 
+def convert_many(paths):
+    """
+    批量转换路径
+
+    WSL环境只检测一次，逐个产出结果，适合转换大量路径（如文件列表）。
+    与 convert_path 一致：不在WSL环境中或不是Windows路径时原样返回。
+
+    参数:
+        paths: 路径的可迭代对象
+
+    返回:
+        generator: 按输入顺序产出转换后的路径
+    """
+    if not is_wsl():
+        for path in paths:
+            yield path
+        return
+
+    convert = convert_windows_path_to_wsl
+    drives = mount_table().drives()
+    for path in paths:
+        yield convert(path, drives)
+
+
+def convert_stream(infile, outfile, null=False, verify=False):
+    """
+    转换输入流中的路径并逐批写出
+
+    每读到一块数据就转换其中完整的记录并立即写出，不必等输入结束；
+    按 UTF-8 处理，无法解码的字节原样保留。
+
+    参数:
+        infile: 二进制输入流（每行一个路径，或以NUL分隔）
+        outfile: 二进制输出流，分隔符与输入一致
+        null: 是否以NUL分隔（配合 find -print0 / xargs -0）
+        verify: 是否验证转换后的路径是否存在，不存在的路径输出到标准错误
+                （每批并行验证，各批之间共用目录列表缓存）
+
+    返回:
+        int: 验证不存在的路径数量
+    """
+    delimiter = b'\0' if null else b'\n'
+    separator = delimiter.decode()
+    read = getattr(infile, 'read1', infile.read)
+    missing = 0
+    listings = DirectoryListingCache() if verify else None
+
+    def convert_records(records):
+        nonlocal missing
+        paths = [record.decode('utf-8', 'surrogateescape') for record in records]
+        if not null:
+            # 兼容Windows工具输出的CRLF换行
+            paths = [path[:-1] if path.endswith('\r') else path for path in paths]
+        converted = list(convert_many(paths))
+        if verify:
+            checked = [path for original, path in zip(paths, converted) if path != original]
+            for path, (exists, _) in zip(checked, verify_many(checked, cache=listings)):
+                if not exists:
+                    missing += 1
+                    print(f"[警告] 路径不存在: {path}", file=sys.stderr)
+        outfile.write((separator.join(converted) + separator).encode('utf-8', 'surrogateescape'))
+        outfile.flush()
+
+    tail = b''
+    while True:
+        chunk = read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        records = (tail + chunk).split(delimiter)
+        # 最后一段可能是不完整的记录，留到下一块
+        tail = records.pop()
+        if records:
+            convert_records(records)
+    if tail:
+        convert_records([tail])
+    return missing
+
+
 def print_result(result, verbose=False):
     """打印转换结果"""
     if verbose:
@@ -227,6 +602,9 @@ def main():
 
   %(prog)s --check-env
     仅检查当前是否为WSL环境
+
+  find /path -print0 | %(prog)s --stdin -0
+    从标准输入流式转换大量路径
         """
     )
 
@@ -248,6 +626,18 @@ def main():
         help='显示详细的转换信息'
     )
 
+    parser.add_argument(
+        '--stdin',
+        action='store_true',
+        help='从标准输入读取路径（每行一个），边读边输出转换结果'
+    )
+
+    parser.add_argument(
+        '-0', '--null',
+        action='store_true',
+        help='--stdin 时输入和输出都以NUL分隔（配合 find -print0 / xargs -0）'
+    )
+
     parser.add_argument(
         '--check-env',
         action='store_true',
@@ -260,9 +650,13 @@ def main():
     if args.check_env:
         is_wsl_env = is_wsl()
         if is_wsl_env:
+            table = mount_table()
+            drives = table.drives()
             print("✓ 当前环境是WSL")
             print("  - 可以使用路径转换功能")
-            print("  - Windows盘符挂载在 /mnt/ 下")
+            print(f"  - Windows盘符的挂载根目录: {table.automount_root}")
+            for drive, mountpoint in sorted(drives.items()):
+                print(f"  - {drive.upper()}: -> {mountpoint}")
             return 0
         else:
             print("✗ 当前环境不是WSL")
@@ -270,6 +664,19 @@ def main():
             print("  - 如果你在Windows中，请使用WSL访问此工具")
             return 1
 
+    if args.null and not args.stdin:
+        parser.error('-0/--null 需要与 --stdin 一起使用')
+
+    # 从标准输入流式转换
+    if args.stdin:
+        if args.paths:
+            parser.error('--stdin 不能与路径参数同时使用')
+        if args.verbose:
+            parser.error('--stdin 不支持 --verbose')
+        sys.stdout.flush()
+        missing = convert_stream(sys.stdin.buffer, sys.stdout.buffer, null=args.null, verify=args.verify)
+        return 0 if missing == 0 else 1
+
     # 检查是否提供了路径
     if not args.paths:
         parser.print_help()
@@ -277,17 +684,31 @@ def main():
 
     # 处理每个路径
     all_success = True
+    results = []
     for path in args.paths:
         try:
-            result = convert_path(path, verify=args.verify, verbose=args.verbose)
-            print_result(result, verbose=args.verbose)
+            results.append(convert_path(path, verbose=args.verbose))
+        except Exception as e:
+            results.append(e)
+
+    # 多个路径一起并行验证
+    if args.verify:
+        converted = [result for result in results
+                     if isinstance(result, dict) and result['converted_successfully']]
+        for result, (exists, message) in zip(converted, verify_many([r['converted'] for r in converted])):
+            result['path_exists'] = exists
+            result['verification_message'] = message
+
+    for path, result in zip(args.paths, results):
+        if isinstance(result, Exception):
+            print(f"[错误] 处理路径 '{path}' 时出错: {result}", file=sys.stderr)
+            all_success = False
+            continue
 
-            # 如果启用了验证且路径不存在，标记为失败
-            if args.verify and result['path_exists'] is False:
-                all_success = False
+        print_result(result, verbose=args.verbose)
 
-        except Exception as e:
-            print(f"[错误] 处理路径 '{path}' 时出错: {e}", file=sys.stderr)
+        # 如果启用了验证且路径不存在，标记为失败
+        if args.verify and result['path_exists'] is False:
             all_success = False
 
     return 0 if all_success else 1
@@ -8,12 +8,119 @@
     python3 smart_converter.py "参考：C:\\var ， 文档：C:\\tools"
     python3 smart_converter.py "我需要读取 C:\\work\\project\\README.md 这个文件"
     echo "切换到 D:\\projects\\my-app 目录" | python3 smart_converter.py --stdin
+    python3 smart_converter.py --file build.log > build.wsl.log
+    python3 smart_converter.py --rewrite /mnt/c/work/project --include '*.md' --dry-run
 """
 
 import re
+import os
 import sys
+import mmap
+import stat
+import codecs
+import difflib
 import argparse
-from path_converter import is_wsl, convert_windows_path_to_wsl
+import tempfile
+from fnmatch import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from path_converter import is_wsl, convert_windows_path_to_wsl, mount_table
+
+# 策略：使用更严格的路径组件匹配
+# 路径组件只能包含：字母、数字、空白（换行除外）、点、下划线、连字符、括号
+# 不能包含：中文字符、中文标点、特殊符号、换行（路径不会跨行，配置文件中每行一个路径时不会连成一个）
+# 行内空白：\s 去掉换行类字符（\n \r \x1c-\x1f \x85 \u2028 \u2029）
+INLINE_SPACE = r' \t\f\v\xa0\u1680\u2000-\u200a\u202f\u205f\u3000'
+PATH_CHAR = r'[a-zA-Z0-9' + INLINE_SPACE + r'._\-()]'
+
+# 盘符字母 + 左边界：盘符前不能紧跟字母、数字或下划线（name: app、host:/path 中的 e:、t:/path 不是盘符）
+# 边界检查放在字母之后（向前看两个字符），模式仍以字符集开头，正则引擎可以快速跳过不可能匹配的位置
+DRIVE_LETTER = r'[a-zA-Z](?<![A-Za-z0-9_][a-zA-Z])'
+
+# 匹配完整路径：盘符 + 斜杠 + 路径组件（贪婪匹配确保捕获完整路径）
+# 写成 组件(斜杠 组件)* 而不是 (组件 斜杠)* 组件：每次重复都以路径字符不包含的斜杠开头，
+# 任何前缀只有一种匹配方式，失败时不会在嵌套的量词之间来回回溯，扫描时间与文本长度成线性关系
+PATH_PATTERN = re.compile(DRIVE_LETTER + r':[/\\]' + PATH_CHAR + r'+(?:[/\\]' + PATH_CHAR + r'+)*')
+
+# --rewrite 使用的严格模式：路径组件不含空白，"C:\\a.txt to D:\\b" 中是两个路径
+STRICT_PATH_PATTERN = re.compile(DRIVE_LETTER + r':[/\\][a-zA-Z0-9._\-()]+(?:[/\\][a-zA-Z0-9._\-()]+)*')
+
+# 可以括住含空白路径的引号
+QUOTE_CHARS = '"\'`'
+
+# 匹配单独的盘符（后面跟空白、标点或结束）
+BARE_DRIVE_PATTERN = re.compile(r'(' + DRIVE_LETTER + r':)(?=[\s，。、；：！？,;]|$)')
+
+# 路径末尾需要清理的空格、标点和斜杠
+TRAILING_CHARS = '.,;:!?/\\，。、；：！？ '
+
+# 流式转换每次读取的字节数
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# 找不到安全切分点时最多暂存的字符数，超过后改在路径之外的空白、斜杠等字符之后切分
+MAX_PENDING_CHARS = 64 * 1024
+
+# 匹配到最后一个不可能出现在路径中的字符（换行，以及路径字符、斜杠、冒号之外的任意字符）：
+# 任何路径匹配都不会跨过它，在它之后切分，两边分别转换的结果与整体转换完全一致
+LAST_BREAK_PATTERN = re.compile(r'.*[^a-zA-Z0-9' + INLINE_SPACE + r'._\-()/\\:]', re.DOTALL)
+
+# 匹配到最后一个不是字母、数字、下划线、冒号的字符：在路径之外的这类字符之后切分，
+# 盘符左边界和单独盘符的向前查看在切分点两侧的判断结果不变
+LAST_CUT_PATTERN = re.compile(r'.*[^A-Za-z0-9_:]', re.DOTALL)
+
+# 流式转换结束后最多列出的不同路径数
+MAX_LISTED_CONVERSIONS = 20
+
+# --rewrite 默认跳过的目录
+DEFAULT_EXCLUDES = ('.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv')
+
+# 判断二进制文件时读取的字节数（与 git 相同：开头包含 NUL 字节即视为二进制）
+BINARY_SNIFF_SIZE = 8000
+
+
+def _scan_windows_paths(text, bare_drives=True):
+    """
+    扫描文本中的完整路径和单独的盘符
+
+    参数:
+        text: 要扫描的文本
+        bare_drives: 是否扫描单独的盘符
+
+    返回:
+        tuple: (完整路径列表, 单独盘符列表)，元素均为 (start, end, path)，各自按位置排序
+    """
+    paths = []
+    for match in PATH_PATTERN.finditer(text):
+        # 清理路径末尾的空格、标点和斜杠
+        path = match.group(0).rstrip(TRAILING_CHARS)
+        if len(path) > 3:  # 至少 "C:\x"
+            paths.append((match.start(), match.start() + len(path), path))
+
+    if not bare_drives:
+        return paths, []
+    drives = [(match.start(1), match.end(1), match.group(1)) for match in BARE_DRIVE_PATTERN.finditer(text)]
+    return paths, drives
+
+
+def find_windows_paths(text, bare_drives=True):
+    """
+    查找文本中每一处Windows路径的位置
+
+    参数:
+        text: 要解析的文本
+        bare_drives: 是否包括单独的盘符（如 "C:"）
+
+    返回:
+        list: [(start, end, path), ...]，按位置排序且互不重叠；同一路径出现多次时每处各有一项
+    """
+    paths, drives = _scan_windows_paths(text, bare_drives)
+    spans = []
+    end = 0
+    # 两个列表各自有序，合并排序为线性时间；与已选区间重叠的（较短的）匹配被丢弃
+    for span in sorted(paths + drives):
+        if span[0] >= end:
+            spans.append(span)
+            end = span[1]
+    return spans
 
 
 def extract_windows_paths(text):
@@ -34,58 +141,97 @@ def extract_windows_paths(text):
     返回:
         list: 找到的所有Windows路径（去重后）
     """
-    found_paths = []
+    paths, drives = _scan_windows_paths(text)
 
-    # 策略：使用更严格的路径组件匹配
-    # 路径组件只能包含：字母、数字、空格、点、下划线、连字符、括号
-    # 不能包含：中文字符、中文标点、特殊符号
+    # dict 作为保持插入顺序的集合去重
+    found_paths = dict.fromkeys(path for _, _, path in paths)
 
-    # 定义合法的路径字符（不包含中文）
-    # 允许：字母、数字、空格、. _ - ( )
-    path_char = r'[a-zA-Z0-9\s._\-()]'
+    # 完整路径都以 "盘符:斜杠" 开头，已被更长路径包含的盘符不再单独列出
+    longer_drives = {path[:2] for path in found_paths}
+    for _, _, path in drives:
+        if path not in longer_drives:
+            found_paths.setdefault(path)
 
-    # 匹配完整路径：盘符 + 斜杠 + 路径组件
-    # 使用贪婪匹配确保捕获完整路径
-    pattern1 = r'[a-zA-Z]:[/\\](?:' + path_char + r'+[/\\])*' + path_char + r'+'
+    return list(found_paths)
 
-    matches = re.finditer(pattern1, text)
-    for match in matches:
-        path = match.group(0)
-        # 清理路径末尾的空格、标点和斜杠
-        path = path.rstrip('.,;:!?/\\，。、；：！？ ')
 
-        if path and len(path) > 3:  # 至少 "C:\x"
-            if path not in found_paths:
-                found_paths.append(path)
+def find_rewritable_paths(text):
+    """
+    按 --rewrite 的严格规则查找可以安全改写的完整路径（不含单独的盘符）
 
-    # 匹配单独的盘符（后面跟空白、标点或结束）
-    pattern2 = r'([a-zA-Z]:)(?=[\s，。、；：！？,;]|$)'
-    matches2 = re.finditer(pattern2, text)
-    for match in matches2:
-        path = match.group(1)
-        # 检查是否已经被包含在更长的路径中
-        is_part_of_longer = any(
-            existing.startswith(path + '/') or existing.startswith(path + '\\')
-            for existing in found_paths
-        )
-        if not is_part_of_longer and path not in found_paths:
-            found_paths.append(path)
+    路径组件默认不含空白。宽松规则（路径组件可以含空白）匹配到更长的路径时：
+    - 路径被引号括住：采用整个引号内的路径；
+    - 多出的部分不含斜杠：按严格规则转换，结果与转换整个宽松匹配相同（转换只改变盘符和斜杠）；
+    - 多出的部分含斜杠（如未加引号的 C:\\Program Files\\app）：无法确定路径在哪里结束，不转换。
 
-    return found_paths
+    参数:
+        text: 要扫描的文本
 
+    返回:
+        tuple: (可以改写的路径, 无法确定范围而跳过的路径)，元素均为 (start, end, path)，按位置排序
+    """
+    spans = []
+    ambiguous = []
+    for match in STRICT_PATH_PATTERN.finditer(text):
+        start = match.start()
+        strict = match.group(0).rstrip(TRAILING_CHARS)
+        loose = PATH_PATTERN.match(text, start).group(0).rstrip(TRAILING_CHARS)
+        if len(loose) > len(strict):
+            quote = text[start - 1:start]
+            if quote and quote in QUOTE_CHARS:
+                closing = text.find(quote, start)
+                if closing >= 0 and text[start:closing].rstrip(TRAILING_CHARS) == loose:
+                    spans.append((start, start + len(loose), loose))
+                    continue
+            rest = loose[len(strict):]
+            if '/' in rest or '\\' in rest:
+                ambiguous.append((start, start + len(loose), loose))
+                continue
+        if len(strict) > 3:  # 至少 "C:\x"
+            spans.append((start, start + len(strict), strict))
+    return spans, ambiguous
+
+
+def _convert_spans(text, spans):
+    """
+    按位置把 spans 中的路径替换为WSL路径
 
-def smart_convert_text(text, show_detection=True):
+    返回:
+        tuple: (converted_text, conversions)，conversions 为 [(original, converted), ...]，每处出现各一条
+    """
+    conversions = []
+    pieces = []
+    position = 0
+    drives = mount_table().drives()
+
+    for start, end, win_path in spans:
+        wsl_path = convert_windows_path_to_wsl(win_path, drives)
+        if wsl_path != win_path:
+            conversions.append((win_path, wsl_path))
+            pieces.append(text[position:start])
+            pieces.append(wsl_path)
+            position = end
+
+    pieces.append(text[position:])
+    return ''.join(pieces), conversions
+
+
+def smart_convert_text(text, show_detection=True, bare_drives=True):
     """
     智能转换文本中的所有Windows路径
 
+    按路径出现的位置从左到右一次拼接出结果：每处路径只转换一次，
+    不会把较短的路径替换进较长路径内部，也不会再次匹配已转换的文本。
+
     参数:
         text: 包含Windows路径的文本
         show_detection: 是否显示检测到的路径
+        bare_drives: 是否转换单独的盘符（如 "C:"）
 
     返回:
         tuple: (converted_text, conversions)
             - converted_text: 转换后的文本
-            - conversions: 转换记录列表 [(original, converted), ...]
+            - conversions: 转换记录列表 [(original, converted), ...]，每处出现各一条
     """
     # 检测WSL环境
     if not is_wsl():
@@ -93,30 +239,22 @@ def smart_convert_text(text, show_detection=True):
             print("[警告] 当前不在WSL环境中，路径不会被转换", file=sys.stderr)
         return text, []
 
-    # 提取所有Windows路径
-    windows_paths = extract_windows_paths(text)
+    # 查找每一处Windows路径
+    spans = find_windows_paths(text, bare_drives)
 
-    if not windows_paths:
+    if not spans:
         if show_detection:
             print("[信息] 未检测到Windows路径", file=sys.stderr)
         return text, []
 
-    # 转换路径并记录
-    conversions = []
-    converted_text = text
+    # 按位置拼接：路径之间的原文 + 转换后的路径
+    converted_text, conversions = _convert_spans(text, spans)
 
-    for win_path in windows_paths:
-        wsl_path = convert_windows_path_to_wsl(win_path)
-        if wsl_path != win_path:
-            conversions.append((win_path, wsl_path))
-            # 替换文本中的路径
-            # 使用 re.escape 确保特殊字符被正确处理
-            converted_text = converted_text.replace(win_path, wsl_path)
-
-    # 显示检测和转换信息
+    # 显示检测和转换信息（相同的路径只显示一次）
     if show_detection and conversions:
-        print(f"\n[检测到 {len(conversions)} 个Windows路径]", file=sys.stderr)
-        for original, converted in conversions:
+        unique_conversions = list(dict.fromkeys(conversions))
+        print(f"\n[检测到 {len(unique_conversions)} 个Windows路径]", file=sys.stderr)
+        for original, converted in unique_conversions:
             print(f"  {original}", file=sys.stderr)
             print(f"  → {converted}", file=sys.stderr)
         print("", file=sys.stderr)
@@ -124,6 +262,309 @@ def smart_convert_text(text, show_detection=True):
     return converted_text, conversions
 
 
+def _split_point(text):
+    """
+    返回文本中可以安全切分的位置：之前的部分可以单独转换，之后的部分留待与后续数据一起处理
+
+    返回 0 表示需要继续读入数据。
+    """
+    match = LAST_BREAK_PATTERN.match(text)
+    if match:
+        return match.end()
+    if len(text) <= MAX_PENDING_CHARS:
+        return 0
+    return _forced_split_point(text)
+
+
+def _forced_split_point(text):
+    """
+    超过 MAX_PENDING_CHARS 个字符仍没有换行等分隔字符时的切分位置
+
+    在所有路径匹配之外、最后一个空白或斜杠等字符之后切分，两边分别转换的结果与整体转换一致。
+    末尾可能随后续数据继续增长的匹配、以及最后三个字符（可能是不完整的 "C:\\"）留待下次处理；
+    整段文本都在一个超长路径之内时只能直接切分。
+    """
+    end = len(text)
+    upper = end - 3
+    gaps = []
+    previous = 0
+    for match in PATH_PATTERN.finditer(text):
+        start, stop = match.span()
+        gaps.append((previous, start))
+        previous = stop
+        # 匹配到达末尾（或之后只剩一个斜杠）时，后续数据可能让它继续延伸
+        if stop >= end - 1:
+            upper = min(upper, start)
+    gaps.append((previous, end))
+
+    for low, high in reversed(gaps):
+        low, high = max(low, 1), min(high, upper)
+        if low > high:
+            continue
+        match = LAST_CUT_PATTERN.match(text, low - 1, high)
+        if match:
+            return match.end()
+    return end
+
+
+def _read_chunks(infile, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    逐块读取二进制输入
+
+    普通文件通过 mmap 直接读取映射的页面，从当前读取位置开始；
+    管道、终端等其他输入用 read1 读取，有多少数据就返回多少，不必等满一整块。
+    """
+    try:
+        fd = infile.fileno()
+        info = os.fstat(fd)
+    except (AttributeError, OSError, ValueError):
+        info = None
+
+    if info is not None and stat.S_ISREG(info.st_mode) and info.st_size > 0:
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            can_advise = hasattr(mapped, 'madvise')
+            if can_advise:
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            released = 0
+            for offset in range(infile.tell(), len(mapped), chunk_size):
+                yield mapped[offset:offset + chunk_size]
+                if can_advise:
+                    # 已处理的页面从进程中解除映射，常驻内存不随文件大小增长
+                    done = (offset + chunk_size) // mmap.PAGESIZE * mmap.PAGESIZE
+                    if done > released:
+                        mapped.madvise(mmap.MADV_DONTNEED, released, min(done, len(mapped)) - released)
+                        released = done
+        return
+
+    read = getattr(infile, 'read1', infile.read)
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _stream_pieces(infile):
+    """
+    逐块解码二进制输入，产出可以各自独立转换的文本片段
+
+    每个片段都在 _split_point 给出的位置结束，任何路径都不会跨过片段边界。
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')('surrogateescape')
+    pending = ''
+    for chunk in _read_chunks(infile):
+        pending += decoder.decode(chunk)
+        cut = _split_point(pending)
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def convert_stream(infile, outfile, show_detection=True):
+    """
+    流式转换输入中的Windows路径并逐块写出
+
+    每次读取固定大小的一块，在最后一个不可能属于路径的字符之后切分：之前的部分立即转换并写出，
+    之后的尾部（通常只有几十个字符）与下一块拼接，跨越块边界的路径仍能被完整识别。
+    内存占用与输入大小无关。按 UTF-8 处理，无法解码的字节原样保留。
+
+    参数:
+        infile: 二进制输入流
+        outfile: 二进制输出流
+        show_detection: 是否在结束后把检测到的路径输出到标准错误
+
+    返回:
+        int: 转换的路径数（每处出现各计一次）
+    """
+    if not is_wsl():
+        if show_detection:
+            print("[警告] 当前不在WSL环境中，路径不会被转换", file=sys.stderr)
+
+    count = 0
+    listed = {}
+
+    def emit(text):
+        nonlocal count
+        converted_text, conversions = smart_convert_text(text, show_detection=False)
+        outfile.write(converted_text.encode('utf-8', 'surrogateescape'))
+        outfile.flush()
+        count += len(conversions)
+        for conversion in conversions:
+            if len(listed) >= MAX_LISTED_CONVERSIONS:
+                break
+            listed.setdefault(conversion)
+
+    for text in _stream_pieces(infile):
+        emit(text)
+
+    if show_detection and is_wsl():
+        if count:
+            print(f"\n[转换了 {count} 处Windows路径]", file=sys.stderr)
+            for original, converted in listed:
+                print(f"  {original}", file=sys.stderr)
+                print(f"  → {converted}", file=sys.stderr)
+            if len(listed) >= MAX_LISTED_CONVERSIONS:
+                print(f"  ...（只列出前 {MAX_LISTED_CONVERSIONS} 个不同的路径）", file=sys.stderr)
+        else:
+            print("[信息] 未检测到Windows路径", file=sys.stderr)
+
+    return count
+
+
+def _matches(relpath, patterns):
+    """相对路径或文件名是否匹配任一通配符"""
+    name = os.path.basename(relpath)
+    return any(fnmatch(relpath, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def discover_files(root, include=(), exclude=DEFAULT_EXCLUDES):
+    """
+    递归列出目录中需要处理的文件
+
+    使用 os.scandir 遍历（drvfs 上比 os.walk 的逐个 stat 少很多往返），不跟随符号链接，
+    也不返回指向文件的符号链接（改写会把链接替换为普通文件）。
+
+    参数:
+        root: 目录（也可以是单个文件）
+        include: 文件名或相对路径的通配符，为空表示全部文件
+        exclude: 要跳过的文件或目录的通配符
+
+    返回:
+        list: 按路径排序的文件路径
+    """
+    if not os.path.isdir(root):
+        return [root]
+
+    files = []
+    pending = ['']
+    while pending:
+        relative_dir = pending.pop()
+        with os.scandir(os.path.join(root, relative_dir)) as entries:
+            for entry in entries:
+                relpath = os.path.join(relative_dir, entry.name)
+                if entry.is_symlink() or _matches(relpath, exclude):
+                    continue
+                if entry.is_dir():
+                    pending.append(relpath)
+                elif entry.is_file() and (not include or _matches(relpath, include)):
+                    files.append(os.path.join(root, relpath))
+    return sorted(files)
+
+
+def _write_atomic(path, data, mode):
+    """写入同目录下的临时文件后重命名替换，中途失败不会留下写了一半的文件"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, stat.S_IMODE(mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _unified_diff(old_text, new_text, label):
+    """统一差异格式；与 git diff 一样标出末尾没有换行的行，保证输出可以被 patch/git apply 使用"""
+    lines = difflib.unified_diff(old_text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                                 fromfile=f'a/{label}', tofile=f'b/{label}')
+    return ''.join(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n' for line in lines)
+
+
+def rewrite_file(path, dry_run=False, label=None):
+    """
+    转换单个文件中的Windows路径并原地写回（在进程池中执行）
+
+    按 UTF-8 处理，无法解码的字节和换行符原样保留；开头包含 NUL 字节的文件视为二进制文件跳过。
+    只转换完整路径，不转换单独的盘符：配置文件中 "x: 1" 这样的单字母键与盘符无法区分。
+    路径按严格规则识别（见 find_rewritable_paths），正文中路径后面的文字不会被当成路径的一部分。
+
+    参数:
+        path: 文件路径
+        dry_run: 只生成差异，不写入
+        label: 差异中显示的文件名（通常是相对于 --rewrite 目录的路径），默认为 path
+
+    返回:
+        dict: path、status（changed/unchanged/binary/error）、conversions（转换的路径数，每处出现各计一次）、
+              unique（不同路径数）、ambiguous（含空白且未加引号、无法确定范围而跳过的不同路径）、
+              diff（dry_run 时的统一差异格式文本）、error
+              只返回计数而不是转换列表，减少进程间传输的数据量
+    """
+    result = {'path': path, 'status': 'unchanged', 'conversions': 0, 'unique': 0, 'ambiguous': [], 'diff': None,
+              'error': None}
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+            mode = os.fstat(f.fileno()).st_mode
+        if b'\0' in data[:BINARY_SNIFF_SIZE]:
+            result['status'] = 'binary'
+            return result
+
+        text = data.decode('utf-8', 'surrogateescape')
+        spans, ambiguous = find_rewritable_paths(text)
+        result['ambiguous'] = list(dict.fromkeys(path for _, _, path in ambiguous))
+        converted_text, conversions = _convert_spans(text, spans)
+        if not conversions:
+            return result
+
+        result['status'] = 'changed'
+        result['conversions'] = len(conversions)
+        result['unique'] = len(set(conversions))
+        if dry_run:
+            result['diff'] = _unified_diff(text, converted_text, label or path)
+        else:
+            _write_atomic(path, converted_text.encode('utf-8', 'surrogateescape'), mode)
+    except OSError as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    return result
+
+
+def _rewrite_files(files, dry_run, root):
+    """rewrite_file 在进程池中按批执行的包装（每批一次进程间往返）"""
+    return [rewrite_file(path, dry_run, os.path.relpath(path, root)) for path in files]
+
+
+def rewrite_tree(root, include=(), exclude=DEFAULT_EXCLUDES, dry_run=False, jobs=None):
+    """
+    并行改写目录中所有文本文件里的Windows路径
+
+    文件按批分配给进程池，每个进程只读取一次挂载表；结果按路径顺序逐个产出，
+    可以边处理边输出。
+
+    参数:
+        root: 目录
+        include: 文件名或相对路径的通配符，为空表示全部文件
+        exclude: 要跳过的文件或目录的通配符
+        dry_run: 只生成差异，不写入
+        jobs: 进程数，默认为CPU核数
+
+    返回:
+        generator: 每个文件的 rewrite_file 结果
+    """
+    files = discover_files(root, include, exclude)
+    # 差异中的文件名相对于目录；root 是单个文件时相对于它所在的目录
+    base = root if os.path.isdir(root) else os.path.dirname(root) or '.'
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        yield from _rewrite_files(files, dry_run, base)
+        return
+
+    # 每个进程约分到 8 批：批太小进程间通信的开销占主导，太大则负载不均
+    batch_size = max(1, min(256, len(files) // (jobs * 8)))
+    batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as pool:
+        for results in pool.map(_rewrite_files, batches, [dry_run] * len(batches), [base] * len(batches)):
+            yield from results
+
+
 def process_text(text, show_detection=True, output_only_result=False):
     """
     处理文本并输出结果
@@ -158,7 +599,13 @@ def main():
     在描述中检测路径
 
   echo "切换到 D:\\projects\\my-app 目录" | %(prog)s --stdin
-    从标准输入读取文本
+    从标准输入读取文本（流式转换，边读边输出）
+
+  %(prog)s --file build.log > build.wsl.log
+    流式转换文件，内存占用与文件大小无关
+
+  %(prog)s --rewrite /mnt/c/work/project --include '*.md' --include '*.sh' --dry-run
+    预览目录中所有匹配文件的改动（统一差异格式），去掉 --dry-run 即原地改写
 
   %(prog)s --quiet "C:\\path1 和 D:\\path2"
     只输出转换结果，不显示检测信息
@@ -177,7 +624,49 @@ def main():
     parser.add_argument(
         '--stdin',
         action='store_true',
-        help='从标准输入读取文本'
+        help='从标准输入读取文本（流式转换，边读边输出）'
+    )
+
+    parser.add_argument(
+        '--file', '-f',
+        metavar='PATH',
+        help='流式转换文件内容并输出到标准输出'
+    )
+
+    parser.add_argument(
+        '--rewrite',
+        metavar='DIR',
+        help='原地改写目录中所有文本文件里的Windows路径（跳过二进制文件和符号链接；'
+             '含空白的路径需要加引号）'
+    )
+
+    parser.add_argument(
+        '--include',
+        action='append',
+        default=[],
+        metavar='GLOB',
+        help='--rewrite 只处理匹配的文件（文件名或相对路径，可多次指定）'
+    )
+
+    parser.add_argument(
+        '--exclude',
+        action='append',
+        default=[],
+        metavar='GLOB',
+        help=f"--rewrite 跳过匹配的文件或目录（可多次指定，始终跳过 {' '.join(DEFAULT_EXCLUDES)}）"
+    )
+
+    parser.add_argument(
+        '--dry-run', '-n',
+        action='store_true',
+        help='--rewrite 时只输出差异，不修改文件'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        metavar='N',
+        help='--rewrite 的并行进程数 (默认: CPU核数)'
     )
 
     parser.add_argument(
@@ -220,10 +709,67 @@ def main():
 
         return 0
 
+    if (args.include or args.exclude or args.dry_run or args.jobs) and not args.rewrite:
+        parser.error('--include、--exclude、--dry-run 和 --jobs 需要与 --rewrite 一起使用')
+
+    # 改写模式：差异输出到标准输出；摘要在 --dry-run 时输出到标准错误，便于把差异重定向到文件
+    if args.rewrite:
+        if args.stdin or args.file or args.text:
+            parser.error('--rewrite 不能与 --stdin、--file 或文本参数同时使用')
+        if args.jobs is not None and args.jobs < 1:
+            parser.error('--jobs 必须大于 0')
+        if not os.path.exists(args.rewrite):
+            print(f"[错误] 目录不存在: {args.rewrite}", file=sys.stderr)
+            return 1
+        if not is_wsl():
+            print("[警告] 当前不在WSL环境中，路径不会被转换", file=sys.stderr)
+            return 1
+
+        summary = sys.stderr if args.dry_run else sys.stdout
+        totals = {'changed': 0, 'unchanged': 0, 'binary': 0, 'error': 0}
+        occurrences = 0
+        for result in rewrite_tree(args.rewrite, args.include, DEFAULT_EXCLUDES + tuple(args.exclude),
+                                   dry_run=args.dry_run, jobs=args.jobs):
+            totals[result['status']] += 1
+            occurrences += result['conversions']
+            for ambiguous_path in result['ambiguous']:
+                print(f"[跳过] {result['path']}: 路径含空白且未加引号，无法确定范围: {ambiguous_path}",
+                      file=sys.stderr)
+            if result['status'] == 'error':
+                print(f"[错误] {result['path']}: {result['error']}", file=sys.stderr)
+            elif result['status'] == 'changed':
+                if result['diff']:
+                    sys.stdout.write(result['diff'])
+                    sys.stdout.flush()
+                if not args.quiet:
+                    print(f"{result['path']}: {result['conversions']} 处路径（{result['unique']} 个不同）",
+                          file=summary, flush=True)
+
+        action = '需要修改' if args.dry_run else '已修改'
+        print(f"\n[共 {sum(totals.values())} 个文件，{action} {totals['changed']} 个，转换 {occurrences} 处路径；"
+              f"跳过二进制文件 {totals['binary']} 个，失败 {totals['error']} 个]", file=summary)
+        return 1 if totals['error'] else 0
+
+    # 流式模式：输出与输入逐字节对应（除转换的路径外），检测信息在结束后输出到标准错误
+    if args.stdin or args.file:
+        if sum(bool(source) for source in (args.stdin, args.file, args.text)) > 1:
+            parser.error('--stdin、--file 和文本参数只能使用一个')
+        show_detection = not args.quiet
+        sys.stdout.flush()
+        if args.file:
+            try:
+                infile = open(args.file, 'rb')
+            except OSError as e:
+                print(f"[错误] 无法读取文件: {e}", file=sys.stderr)
+                return 1
+            with infile:
+                convert_stream(infile, sys.stdout.buffer, show_detection=show_detection)
+        else:
+            convert_stream(sys.stdin.buffer, sys.stdout.buffer, show_detection=show_detection)
+        return 0
+
     # 获取输入文本
-    if args.stdin:
-        text = sys.stdin.read()
-    elif args.text:
+    if args.text:
         text = args.text
     else:
         parser.print_help()